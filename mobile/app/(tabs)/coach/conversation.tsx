@@ -5,6 +5,7 @@ import { Audio } from 'expo-av';
 import { SafeAreaView } from 'react-native-safe-area-context';
 import { useNavigation } from 'expo-router';
 import { Buffer } from 'buffer';
+import AsyncStorage from '@react-native-async-storage/async-storage';
 
 global.Buffer = global.Buffer || Buffer;
 
@@ -36,42 +37,59 @@ const ConversationScreen = () => {
 	useEffect(() => {
 		if (!currentConv) return;
 
-		const ws = new WebSocket(`ws://192.168.0.100:8000/ws/chat`);
+		let ws: WebSocket | null = null;
+		let cancelled = false;
 
-		ws.onopen = () => {
-			console.log('[WS] Connected');
-			if (currentConv?.id) {
-				ws.send(currentConv.id);
-			} else {
-				console.error(
-					'[WS] Cannot send: conversation ID is undefined.'
-				);
-			}
-		};
+		const connect = async () => {
+			// The server only opens conversations of an authenticated owner.
+			const token = await AsyncStorage.getItem('access_token');
+			if (cancelled) return;
+
+			const socket = new WebSocket(
+				`ws://192.168.0.100:8000/ws/chat?token=${encodeURIComponent(token ?? '')}`
+			);
+			ws = socket;
 
-		ws.onmessage = (event) => {
-			console.log('[WS] Bot:', event.data);
-			const botMessage: Message = {
-				id: Date.now().toString(),
-				source: 'BOT',
-				conversation_id: currentConv?.id ?? '',
-				content: event.data
+			socket.onopen = () => {
+				console.log('[WS] Connected');
+				if (currentConv?.id) {
+					socket.send(currentConv.id);
+				} else {
+					console.error(
+						'[WS] Cannot send: conversation ID is undefined.'
+					);
+				}
 			};
-			setMessages((prev) => [...prev, botMessage]);
 
-			Speech.speak(botMessage.content, {
-				language: 'en-US',
-				rate: 1.0,
-				pitch: 1.0
-			});
-		};
+			socket.onmessage = (event) => {
+				console.log('[WS] Bot:', event.data);
+				const botMessage: Message = {
+					id: Date.now().toString(),
+					source: 'BOT',
+					conversation_id: currentConv?.id ?? '',
+					content: event.data
+				};
+				setMessages((prev) => [...prev, botMessage]);
 
-		ws.onerror = (e: any) => console.error('[WS] Error:', e.message);
-		ws.onclose = () => console.log('[WS] Closed');
+				Speech.speak(botMessage.content, {
+					language: 'en-US',
+					rate: 1.0,
+					pitch: 1.0
+				});
+			};
+
+			socket.onerror = (e: any) => console.error('[WS] Error:', e.message);
+			socket.onclose = () => console.log('[WS] Closed');
 
-		wsRef.current = ws;
+			wsRef.current = socket;
+		};
 
-		return () => ws.close();
+		connect();
+
+		return () => {
+			cancelled = true;
+			ws?.close();
+		};
 	}, [currentConv]);
 
 	const startRecording = async () => {
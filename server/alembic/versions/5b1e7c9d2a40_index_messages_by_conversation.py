@@ -0,0 +1,41 @@
+"""index_messages_by_conversation
+
+Revision ID: 5b1e7c9d2a40
+Revises: 093a7214d33c
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c9d2a40'
+down_revision: Union[str, None] = '093a7214d33c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so the upgrade does not block writes to a live table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_conversation_id_sent_at',
+            'messages',
+            ['conversation_id', 'sent_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_messages_conversation_id_sent_at',
+            table_name='messages',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,42 @@
+"""index_conversations_by_user
+
+Revision ID: 8c4f2e6a1b37
+Revises: 5b1e7c9d2a40
+Create Date: 2026-10-18 11:45:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2e6a1b37'
+down_revision: Union[str, None] = '5b1e7c9d2a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so the upgrade does not block writes to a live table.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_conversations_user_id_updated_at',
+            'conversations',
+            ['user_id', sa.text('updated_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_conversations_user_id_updated_at',
+            table_name='conversations',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
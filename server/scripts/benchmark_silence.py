@@ -0,0 +1,80 @@
+"""
+Benchmarks the vectorized silence detector against `pydub.silence.detect_silence`.
+
+Usage:
+    uv run python -m scripts.benchmark_silence
+"""
+import timeit
+import numpy as np
+from pydub import silence
+
+from src.assistant.utils import SAMPLING_RATE, waveform_to_segment
+from src.assistant.silence import SilenceDetector, detect_silence
+
+SILENCE_THRESHOLD = -40
+MIN_SILENCE_LEN = 300
+
+def synthetic_speech(seconds: int, seed: int = 0) -> np.ndarray:
+    """
+    Generates noise bursts separated by pauses of random length.
+
+    Args:
+        seconds: Duration of the audio.
+        seed: Seed of the random generator.
+
+    Returns:
+        np.ndarray: 16kHz mono float32 waveform.
+    """
+    rng = np.random.default_rng(seed)
+    waveform = np.zeros(seconds * SAMPLING_RATE, dtype=np.float32)
+
+    position = 0
+    while position < len(waveform):
+        burst = int(rng.uniform(0.2, 1.5) * SAMPLING_RATE)
+        waveform[position:position + burst] = rng.normal(0, 0.2, len(waveform[position:position + burst]))
+        position += burst + int(rng.uniform(0.05, 0.8) * SAMPLING_RATE)
+
+    return waveform
+
+def streamed(waveform: np.ndarray) -> list[list[int]]:
+    """
+    Runs the stateful detector over one second chunks.
+
+    Args:
+        waveform: Audio to scan.
+
+    Returns:
+        list[list[int]]: Silent ranges reported across all chunks, merged by start.
+    """
+    detector = SilenceDetector(SILENCE_THRESHOLD, MIN_SILENCE_LEN)
+    ranges: dict[int, int] = {}
+    for start in range(0, len(waveform), SAMPLING_RATE):
+        for range_start, range_end in detector.feed(waveform[start:start + SAMPLING_RATE]):
+            ranges[range_start] = range_end
+    return [[start, end] for start, end in ranges.items()]
+
+def main() -> None:
+    print(f"{'input':>6} {'pydub (ms)':>12} {'numpy (ms)':>12} {'speedup':>8}  match")
+
+    for seconds in (1, 10, 60):
+        waveform = synthetic_speech(seconds)
+        segment = waveform_to_segment(waveform)
+
+        expected = silence.detect_silence(segment, MIN_SILENCE_LEN, SILENCE_THRESHOLD)
+        actual = detect_silence(waveform, SILENCE_THRESHOLD, MIN_SILENCE_LEN)
+        matches = expected == actual and expected == streamed(waveform)
+
+        runs = 3 if seconds > 10 else 10
+        pydub_ms = timeit.timeit(
+            lambda: silence.detect_silence(segment, MIN_SILENCE_LEN, SILENCE_THRESHOLD),
+            number=runs
+        ) / runs * 1000
+        numpy_ms = timeit.timeit(
+            lambda: detect_silence(waveform, SILENCE_THRESHOLD, MIN_SILENCE_LEN),
+            number=runs * 10
+        ) / (runs * 10) * 1000
+
+        print(f"{seconds:>5}s {pydub_ms:>12.2f} {numpy_ms:>12.3f} {pydub_ms / numpy_ms:>7.0f}x  {matches}")
+
+if __name__ == "__main__":
+    main()
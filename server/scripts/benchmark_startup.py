@@ -0,0 +1,111 @@
+"""
+Measures how long the server takes to import, to come up and to become ready.
+
+Each import is timed in a fresh interpreter. The server is then started with
+uvicorn on a free port and `/healthz` and `/readyz` are polled until they
+answer 200. `/readyz` needs the database at POSTGRES_URI and the whisper
+models, use `--skip-ready` to stop at `/healthz`.
+
+Usage:
+    uv run python -m scripts.benchmark_startup
+"""
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.error
+import urllib.request
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import src.server; print(time.perf_counter() - started)"
+
+def time_import() -> float:
+    """
+    Imports the application in a fresh interpreter.
+
+    Returns:
+        float: Seconds spent importing `src.server`.
+    """
+    result = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+def free_port() -> int:
+    """
+    Finds a port nothing listens on.
+
+    Returns:
+        int: Free TCP port on localhost.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(url: str, timeout: float) -> float | None:
+    """
+    Polls an endpoint until it answers 200.
+
+    Args:
+        url: Endpoint to poll.
+        timeout: Seconds to wait before giving up.
+
+    Returns:
+        float | None: `time.perf_counter()` of the first 200, `None` on timeout.
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(0.02)
+    return None
+
+def time_server(skip_ready: bool, timeout: float) -> tuple[float | None, float | None]:
+    """
+    Starts the server and waits for its probes.
+
+    Args:
+        skip_ready: Whether to stop once `/healthz` answers.
+        timeout: Seconds to wait for each probe.
+
+    Returns:
+        tuple[float | None, float | None]: Seconds until `/healthz` and `/readyz`
+            answered 200, `None` for a probe that did not.
+    """
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.server:api", "--port", str(port), "--log-level", "warning"]
+    )
+    try:
+        healthy = wait_for(f"http://127.0.0.1:{port}/healthz", timeout)
+        ready = None if skip_ready or healthy is None else wait_for(f"http://127.0.0.1:{port}/readyz", timeout)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return (
+        None if healthy is None else healthy - started,
+        None if ready is None else ready - started
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time the import in.")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds to wait for each probe.")
+    parser.add_argument("--skip-ready", action="store_true", help="Do not wait for /readyz.")
+    args = parser.parse_args()
+
+    imports = [time_import() for _ in range(args.runs)]
+    print(f"{'import src.server':<20} median {statistics.median(imports):.2f} s, min {min(imports):.2f} s over {args.runs} runs")
+
+    healthy, ready = time_server(args.skip_ready, args.timeout)
+    print(f"{'/healthz 200':<20} {'timed out' if healthy is None else f'{healthy:.2f} s'}")
+    if not args.skip_ready:
+        print(f"{'/readyz 200':<20} {'timed out' if ready is None else f'{ready:.2f} s'}")
+
+if __name__ == "__main__":
+    main()
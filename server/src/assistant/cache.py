@@ -0,0 +1,114 @@
+from src.core.cache import TTLCache
+from src.assistant.utils import tokenize_transcript
+
+def normalize_tail(transcript: str, tail_tokens: int = 6) -> str:
+    """
+    Reduces a transcript to the words that determine the next word suggestion.
+
+    The transcript is tokenized as in `tokenize_transcript` and only the
+    last tokens are kept.
+
+    Args:
+        transcript: Transcript of the current sentence.
+        tail_tokens: Number of trailing tokens kept.
+
+    Returns:
+        str: Normalized transcript tail, empty if nothing is left.
+    """
+    return " ".join(tokenize_transcript(transcript)[-tail_tokens:])
+
+class SuggestionCache:
+    """
+    Caches next word suggestions by normalized transcript tail.
+
+    A per-user tier remembers the phrases each user gets stuck on, and a
+    global tier shares common phrases between users. Lookups check the user
+    tier first.
+    """
+
+    def __init__(
+        self,
+        tail_tokens: int = 6,
+        ttl_seconds: float = 900,
+        global_size: int = 4096,
+        user_size: int = 64,
+        max_users: int = 1024
+    ) -> None:
+        """
+        Args:
+            tail_tokens: Number of trailing transcript tokens forming the key.
+            ttl_seconds: Lifetime of cached suggestions.
+            global_size: Entries kept in the global tier.
+            user_size: Entries kept per user.
+            max_users: Users whose tiers are kept before the least recent is evicted.
+        """
+        self.tail_tokens = tail_tokens
+        self.user_size = user_size
+        self.ttl_seconds = ttl_seconds
+        self.global_tier: TTLCache[str, list[str]] = TTLCache(global_size, ttl_seconds)
+        self.user_tiers: TTLCache[str, TTLCache[str, list[str]]] = TTLCache(max_users, ttl_seconds)
+        self.user_hits = 0
+        self.user_misses = 0
+
+    def get(self, transcript: str, user_id: str | None = None) -> list[str] | None:
+        """
+        Looks up suggestions for a transcript.
+
+        Args:
+            transcript: Transcript of the current sentence.
+            user_id: Id of the speaking user, if known.
+
+        Returns:
+            list[str] | None: Cached suggestions, or None on a miss.
+        """
+        key = normalize_tail(transcript, self.tail_tokens)
+        if not key:
+            return None
+
+        user_tier = self.user_tiers.get(user_id) if user_id else None
+        if user_tier is not None:
+            suggestions = user_tier.get(key)
+            if suggestions is not None:
+                self.user_hits += 1
+                return suggestions
+        if user_id:
+            self.user_misses += 1
+
+        return self.global_tier.get(key)
+
+    def set(self, transcript: str, suggestions: list[str], user_id: str | None = None) -> None:
+        """
+        Stores suggestions for a transcript in the global and user tiers.
+
+        Args:
+            transcript: Transcript of the current sentence.
+            suggestions: Suggestions produced for it.
+            user_id: Id of the speaking user, if known.
+        """
+        key = normalize_tail(transcript, self.tail_tokens)
+        if not key or not suggestions:
+            return
+
+        self.global_tier.set(key, suggestions)
+        if user_id:
+            user_tier = self.user_tiers.pop(user_id) or TTLCache(self.user_size, self.ttl_seconds)
+            user_tier.set(key, suggestions)
+            self.user_tiers.set(user_id, user_tier)
+
+    def stats(self) -> dict[str, dict[str, int | float]]:
+        """
+        Reports hit and miss counters of both tiers.
+
+        Returns:
+            dict[str, dict[str, int | float]]: Counters per tier.
+        """
+        lookups = self.user_hits + self.user_misses
+        return {
+            "user": {
+                "users": len(self.user_tiers),
+                "hits": self.user_hits,
+                "misses": self.user_misses,
+                "hit_rate": self.user_hits / lookups if lookups else 0.0
+            },
+            "global": self.global_tier.stats()
+        }
@@ -0,0 +1,224 @@
+import asyncio
+import numpy as np
+from uuid import UUID
+from pathlib import Path
+from typing import Callable, Iterable
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.core.logging import logger
+from src.assistant.utils import tokenize_transcript
+from src.coach.services import get_recent_user_message_texts
+
+DEFAULT_CORPUS_PATH = Path(__file__).with_name("corpus.txt")
+
+class NgramPredictor:
+    """
+    Next word predictor backed by n-gram counts stored in sorted NumPy arrays.
+
+    Each n-gram is encoded as a single integer in base `len(vocabulary)`, so
+    all continuations of a context form a contiguous range that is found
+    with two binary searches.
+    """
+
+    def __init__(self, vocabulary: list[str], keys: list[np.ndarray], counts: list[np.ndarray]) -> None:
+        """
+        Args:
+            vocabulary: Words, indexed by id.
+            keys: Sorted encoded n-grams, one array per order starting at bigrams.
+            counts: Occurrences of each encoded n-gram.
+        """
+        self.vocabulary = vocabulary
+        self.index = {word: i for i, word in enumerate(vocabulary)}
+        self.keys = keys
+        self.counts = counts
+
+    @property
+    def order(self) -> int:
+        """Longest n-gram length stored."""
+        return len(self.keys) + 1
+
+    @classmethod
+    def from_texts(cls, texts: Iterable[str], order: int = 3) -> "NgramPredictor":
+        """
+        Counts the n-grams of a corpus.
+
+        Args:
+            texts: Sentences or messages to learn from.
+            order: Longest n-gram length, 3 for trigrams.
+
+        Returns:
+            NgramPredictor: Predictor trained on the texts.
+        """
+        index: dict[str, int] = {}
+        sequences = []
+        for text in texts:
+            tokens = tokenize_transcript(text)
+            if len(tokens) > 1:
+                sequences.append(np.array([index.setdefault(t, len(index)) for t in tokens], dtype=np.int64))
+
+        size = max(len(index), 1)
+        keys, counts = [], []
+        for n in range(2, order + 1):
+            encoded = [
+                sum(sequence[i:len(sequence) - n + 1 + i] * size ** (n - 1 - i) for i in range(n))
+                for sequence in sequences
+                if len(sequence) >= n
+            ]
+            unique, occurrences = np.unique(
+                np.concatenate(encoded) if encoded else np.zeros(0, dtype=np.int64),
+                return_counts=True
+            )
+            keys.append(unique)
+            counts.append(occurrences.astype(np.int32))
+
+        return cls(list(index), keys, counts)
+
+    def predict(self, transcript: str, k: int = 4) -> list[str]:
+        """
+        Predicts the next words, backing off from the longest known context.
+
+        Args:
+            transcript: Transcript of the current sentence.
+            k: Number of words to return.
+
+        Returns:
+            list[str]: Up to `k` likely next words, most likely first.
+        """
+        ids = [self.index.get(token) for token in tokenize_transcript(transcript)]
+        size = max(len(self.vocabulary), 1)
+        predictions: list[str] = []
+
+        for n in range(self.order, 1, -1):
+            context = ids[-(n - 1):]
+            if len(context) < n - 1 or None in context:
+                continue
+
+            base = sum(word_id * size ** (n - 2 - i) for i, word_id in enumerate(context)) * size
+            keys, counts = self.keys[n - 2], self.counts[n - 2]
+            low, high = np.searchsorted(keys, [base, base + size])
+
+            for i in np.argsort(-counts[low:high], kind="stable"):
+                word = self.vocabulary[int(keys[low + i] % size)]
+                if word not in predictions:
+                    predictions.append(word)
+                if len(predictions) == k:
+                    return predictions
+
+        return predictions
+
+class PredictorStore:
+    """
+    Holds the general predictor and lazily built per-user predictors.
+
+    User predictors are trained on the messages the user spoke in coach
+    conversations and take precedence over the general corpus. Until a
+    user's predictor is built, predictions come from the general corpus.
+    """
+
+    def __init__(
+        self,
+        general: NgramPredictor,
+        session_factory: Callable[[], AsyncSession],
+        max_users: int = 256,
+        ttl_seconds: float = 3600
+    ) -> None:
+        """
+        Args:
+            general: Predictor trained on the general corpus.
+            session_factory: Creates database sessions to load user messages.
+            max_users: User predictors kept in memory.
+            ttl_seconds: Time after which a user predictor is rebuilt.
+        """
+        self.general = general
+        self.session_factory = session_factory
+        self._users: TTLCache[str, NgramPredictor] = TTLCache(max_users, ttl_seconds)
+        self._loading: dict[str, asyncio.Task[None]] = {}
+
+    @classmethod
+    def from_corpus(cls, path: str | Path, session_factory: Callable[[], AsyncSession]) -> "PredictorStore":
+        """
+        Builds the store with a general predictor trained on a text file.
+
+        Args:
+            path: Corpus with one sentence per line.
+            session_factory: Creates database sessions to load user messages.
+
+        Returns:
+            PredictorStore: Store with no user predictors loaded yet.
+        """
+        lines = Path(path).read_text(encoding="utf-8").splitlines()
+        return cls(NgramPredictor.from_texts(lines), session_factory)
+
+    async def load_user(self, user_id: str) -> None:
+        """
+        Trains the predictor of a user unless it is already loaded.
+
+        Args:
+            user_id: Id of the user.
+        """
+        if self._users.get(user_id) is not None:
+            return
+
+        async with self.session_factory() as session:
+            texts = await get_recent_user_message_texts(UUID(user_id), session)
+
+        predictor = await asyncio.to_thread(NgramPredictor.from_texts, texts)
+        self._users.set(user_id, predictor)
+        logger.debug(f"Built suggestion predictor for user {user_id} from {len(texts)} messages.")
+
+    def preload_user(self, user_id: str) -> asyncio.Task[None]:
+        """
+        Builds the predictor of a user in the background.
+
+        Sessions of the same user opened while it is being built share the task.
+
+        Args:
+            user_id: Id of the user.
+
+        Returns:
+            asyncio.Task[None]: Task building the predictor, failures are logged.
+        """
+        task = self._loading.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._load_user_logged(user_id))
+            self._loading[user_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(user_id, None))
+        return task
+
+    async def _load_user_logged(self, user_id: str) -> None:
+        """
+        Trains the predictor of a user, logging failures instead of raising them.
+
+        Args:
+            user_id: Id of the user.
+        """
+        try:
+            await self.load_user(user_id)
+        except Exception as e:
+            logger.warning(f"Could not load suggestion predictor for user {user_id}: {e}")
+
+    def predict(self, transcript: str, user_id: str | None = None, k: int = 4) -> list[str]:
+        """
+        Predicts the next words from the user's own speech first, then the general corpus.
+
+        Args:
+            transcript: Transcript of the current sentence.
+            user_id: Id of the speaking user, if known.
+            k: Number of words to return.
+
+        Returns:
+            list[str]: Up to `k` likely next words.
+        """
+        predictions = []
+        user_predictor = self._users.get(user_id) if user_id else None
+        if user_predictor is not None:
+            predictions = user_predictor.predict(transcript, k)
+
+        for word in self.general.predict(transcript, k):
+            if len(predictions) == k:
+                break
+            if word not in predictions:
+                predictions.append(word)
+
+        return predictions
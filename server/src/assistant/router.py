@@ -1,23 +1,39 @@
-import io
+import time
+import asyncio
 from fastapi import (
+    status,
     APIRouter, 
     WebSocket, 
     WebSocketDisconnect,
     Depends
 )
 from typing import Annotated
-from faster_whisper import WhisperModel
+from pydantic import ValidationError
 from langchain_core.language_models.chat_models import BaseChatModel
 
 from src.core.logging import logger
 from src.core.config import settings
 from src.core.metadata import ApiTags
-from src.assistant.utils import load_audio_segment
-from src.core.dependencies import get_groq_model, get_whisper_model
-from src.assistant.services import (
-    get_transcription, 
-    is_stuttering, 
-    get_next_word_suggestion
+from src.core.metrics import LatencyTracker
+from src.core.audio_buffer import AudioBuffer, AudioBufferOverflow
+from src.assistant.cache import SuggestionCache
+from src.assistant.silence import SilenceDetector
+from src.assistant.vad import VadBackend, VoiceActivityGate
+from src.assistant.streaming import StreamingTranscriber
+from src.assistant.utils import SAMPLING_RATE, load_waveform, pcm_to_waveform
+from src.assistant.predictor import PredictorStore
+from src.assistant.schemas import AudioFormat, BusyFrame, SuggestionFrame, SuggestionSource
+from src.assistant.services import is_stuttering, stream_next_word_suggestions
+from src.core.transcription import TranscriptionExecutor, TranscriptionQueueFull
+from src.core.scheduler import SchedulerBusy, SchedulerSession
+from src.health.services import reject_while_warming
+from src.core.dependencies import (
+    get_suggestion_model,
+    get_predictor_store,
+    get_suggestion_cache,
+    get_optional_ws_user_id,
+    get_scheduler_session,
+    get_assistant_transcription_executor
 )
 
 router = APIRouter(
@@ -25,44 +41,318 @@ router = APIRouter(
     prefix="/assistant"
 )
 
+time_to_first_suggestion = LatencyTracker("time_to_first_suggestion")
+
+async def send_words(
+    websocket: WebSocket,
+    words: list[str],
+    source: SuggestionSource,
+    framed: bool
+) -> None:
+    """
+    Sends a complete set of suggestions to the client.
+
+    Args:
+        websocket: Websocket object.
+        words: Suggestions to send.
+        source: Where the suggestions come from.
+        framed: Whether the client uses the JSON frame protocol.
+    """
+    if not framed:
+        await websocket.send_text(", ".join(words))
+        return
+
+    for word in words:
+        await websocket.send_text(SuggestionFrame(word=word, final=False, source=source).model_dump_json())
+
+async def send_busy(websocket: WebSocket, retry_after: float, framed: bool) -> None:
+    """
+    Tells the client that part of its audio was dropped because the server is overloaded.
+
+    Args:
+        websocket: Websocket object.
+        retry_after: Seconds after which the server expects to keep up again.
+        framed: Whether the client uses the JSON frame protocol.
+    """
+    if framed:
+        await websocket.send_text(BusyFrame(retry_after_ms=round(retry_after * 1000)).model_dump_json())
+    else:
+        await websocket.send_text("SERVER_BUSY")
+
+async def receive_audio(websocket: WebSocket, buffer: AudioBuffer, received: asyncio.Event) -> None:
+    """
+    Appends audio to the buffer as it arrives, while earlier audio is being processed.
+
+    Args:
+        websocket: Websocket object.
+        buffer: Buffer of audio not processed yet.
+        received: Set whenever audio is appended.
+
+    Raises:
+        WebSocketDisconnect: When the client disconnects.
+        AudioBufferOverflow: When the client sends more audio than the buffer holds.
+    """
+    while True:
+        buffer.append(await websocket.receive_bytes())
+        received.set()
+
+async def wait_for_audio(receiver: asyncio.Task, received: asyncio.Event) -> None:
+    """
+    Waits until more audio is received.
+
+    Args:
+        receiver: Task running `receive_audio`.
+        received: Event set by the receiver.
+
+    Raises:
+        WebSocketDisconnect: When the client disconnected.
+        AudioBufferOverflow: When the client sent more audio than the buffer holds.
+    """
+    received.clear()
+    waiter = asyncio.ensure_future(received.wait())
+    try:
+        await asyncio.wait({receiver, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+
+    if receiver.done():
+        receiver.result()
+
+async def send_suggestions(
+    websocket: WebSocket,
+    transcription: str,
+    suggestion_model: BaseChatModel,
+    suggestion_cache: SuggestionCache,
+    predictor_store: PredictorStore,
+    user_id: str | None,
+    scheduler_session: SchedulerSession,
+    framed: bool
+) -> None:
+    """
+    Sends next word suggestions to the client as soon as any are available.
+
+    Cached suggestions are sent right away without calling the model.
+    Otherwise the local n-gram predictor answers first and the model's
+    suggestions follow if they arrive within the deadline, streamed word by
+    word to framed clients. Framed clients receive an empty final frame once
+    no more suggestions will follow. Sessions over their rate only get the
+    cached or local suggestions.
+
+    Args:
+        websocket: Websocket object.
+        transcription: Transcript of the current sentence.
+        suggestion_model: Chat model generating the suggestions.
+        suggestion_cache: Cache of previous suggestions.
+        predictor_store: Local next word predictors.
+        user_id: Id of the speaking user, if known.
+        scheduler_session: Scheduler session charged for the model call.
+        framed: Whether the client uses the JSON frame protocol.
+    """
+    started = time.perf_counter()
+
+    def record_first_suggestion(source: SuggestionSource) -> None:
+        elapsed = time.perf_counter() - started
+        time_to_first_suggestion.record(elapsed)
+        logger.debug(f"Time to first suggestion ({source.value}): {elapsed * 1000:.1f} ms")
+
+    cached = suggestion_cache.get(transcription, user_id)
+    if cached is not None:
+        record_first_suggestion(SuggestionSource.CACHE)
+        await send_words(websocket, cached, SuggestionSource.CACHE, framed)
+        if framed:
+            await websocket.send_text(SuggestionFrame(word=None, final=True).model_dump_json())
+        return
+
+    local = predictor_store.predict(transcription, user_id)
+    if local:
+        record_first_suggestion(SuggestionSource.LOCAL)
+        await send_words(websocket, local, SuggestionSource.LOCAL, framed)
+
+    suggestions = []
+    completed = False
+    deadline = settings.SUGGESTION_LLM_DEADLINE_MS / 1000 if local else None
+    try:
+        scheduler_session.admit()
+        async with asyncio.timeout(deadline):
+            async for word in stream_next_word_suggestions(transcription, suggestion_model):
+                if framed:
+                    await websocket.send_text(SuggestionFrame(word=word, final=False).model_dump_json())
+                if not suggestions and not local:
+                    record_first_suggestion(SuggestionSource.LLM)
+                suggestions.append(word)
+        completed = True
+
+    except SchedulerBusy:
+        logger.debug("Session over its rate, skipping model suggestions.")
+
+    except TimeoutError:
+        logger.debug("Model suggestions missed the deadline, keeping local ones.")
+
+    except Exception as e:
+        logger.warning(f"Model suggestions failed: {e}")
+
+    logger.debug(f"Suggestion: {suggestions or local}")
+    if completed:
+        suggestion_cache.set(transcription, suggestions, user_id)
+
+    if framed:
+        await websocket.send_text(SuggestionFrame(word=None, final=True).model_dump_json())
+    elif completed and suggestions:
+        await websocket.send_text(", ".join(suggestions))
+
 @router.websocket("/ws/audio")
 async def audio_suggestion_stream(
     websocket: WebSocket,
-    whisper_model: Annotated[WhisperModel, Depends(get_whisper_model)],
-    groq_model: Annotated[BaseChatModel, Depends(get_groq_model)]  
+    transcription_executor: Annotated[TranscriptionExecutor | None, Depends(get_assistant_transcription_executor)],
+    suggestion_model: Annotated[BaseChatModel | None, Depends(get_suggestion_model)],
+    suggestion_cache: Annotated[SuggestionCache, Depends(get_suggestion_cache)],
+    predictor_store: Annotated[PredictorStore, Depends(get_predictor_store)],
+    user_id: Annotated[str | None, Depends(get_optional_ws_user_id)],
+    scheduler_session: Annotated[SchedulerSession, Depends(get_scheduler_session)]
 ):
     """
     Websocket endpoint where the client streams audio in chunks and server streams next word suggestions.
 
+    The client may open with a JSON text frame declaring raw PCM audio, e.g.
+    `{"encoding": "s16le", "sample_rate": 16000}`, and then receives suggestions
+    as `SuggestionFrame` JSON messages. Otherwise every binary frame is treated
+    as encoded audio and suggestions are sent as comma-separated text.
+
+    Audio keeps being received while earlier audio is decoded, and everything
+    received meanwhile is decoded at once. When the server falls behind by
+    more than the allowed backlog, or the scheduler sheds a decode, the
+    oldest audio is dropped and the client is sent a busy frame
+    (`SERVER_BUSY` for unframed clients).
+
+    Clients connecting while the models are still loading are sent a
+    `WarmingFrame` and the socket is closed with 1013 (try again later).
+
     Args:
         websocket: Websocket object.
     """
     await websocket.accept()
-    buffer = b""
+    if transcription_executor is None or suggestion_model is None or not await transcription_executor.ready():
+        await reject_while_warming(websocket)
+        return
+
+    buffer = AudioBuffer(settings.AUDIO_BUFFER_MAX_BYTES)
+    transcriber = StreamingTranscriber(
+        transcription_executor,
+        beam_size=transcription_executor.beam_size,
+        max_window_seconds=settings.STREAMING_MAX_WINDOW_SECONDS,
+        overlap_seconds=settings.STREAMING_OVERLAP_SECONDS
+    )
+    silence_detector = SilenceDetector(settings.SILENCE_THRESHOLD, settings.MIN_SILENCE_LEN)
+    vad_gate = VoiceActivityGate(
+        VadBackend(settings.VAD_BACKEND),
+        energy_thresh=settings.VAD_ENERGY_THRESHOLD,
+        hangover_chunks=settings.VAD_HANGOVER_CHUNKS
+    )
+
+    receiver = None
 
     try:
+        if user_id:
+            # Built in the background, suggestions use the general corpus until it is ready.
+            predictor_store.preload_user(user_id)
+
+        audio_format = None
+        first_msg = await websocket.receive()
+        if first_msg["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(first_msg.get("code", 1000))
+
+        if first_msg.get("text") is not None:
+            try:
+                audio_format = AudioFormat.model_validate_json(first_msg["text"])
+            except ValidationError as e:
+                logger.warning(f"Invalid audio format handshake: {e}")
+                await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+                return
+        else:
+            buffer.append(first_msg.get("bytes") or b"")
+
+        # approx. 1 second of audio
+        chunk_size = 16000 * (audio_format.bytes_per_sample if audio_format else 2)
+        max_backlog = int(settings.STREAMING_MAX_BACKLOG_SECONDS * SAMPLING_RATE)
+        framed = audio_format is not None
+
+        received = asyncio.Event()
+        receiver = asyncio.create_task(receive_audio(websocket, buffer, received))
+
         while True:
-            data = await websocket.receive_bytes()
-            buffer += data
-
-            if len(buffer) > 16000 * 2: # approx. 1 second of audio
-                logger.debug("Checking buffer.")
-                audio = io.BytesIO(buffer)
-                logger.debug("Converted to audio bytes.")
-                audio_wav = load_audio_segment(audio)
-                logger.debug("Converted to wav audio.")
-                transcription = get_transcription(audio, whisper_model, beam_size=1)
-                logger.debug(f"Transcription: {transcription}")
-
-                if is_stuttering(audio_wav, transcription, settings.SILENCE_THRESHOLD, settings.MIN_SILENCE_LEN):
-                    logger.debug("Stutter block detected.")
-                    suggestion = await get_next_word_suggestion(transcription, groq_model)
-                    logger.debug(f"Suggestion: {suggestion}")
-                    payload = ", ".join(suggestion) if isinstance(suggestion, list) else suggestion
-                    await websocket.send_text(payload)
-
-                buffer = b""
+            if len(buffer) <= chunk_size:
+                await wait_for_audio(receiver, received)
+                continue
+
+            logger.debug("Checking buffer.")
+            if audio_format:
+                usable = len(buffer) - len(buffer) % audio_format.bytes_per_sample
+                waveform = pcm_to_waveform(buffer.view(usable), audio_format.encoding)
+            else:
+                usable = len(buffer)
+                waveform = load_waveform(buffer.view())
+            logger.debug("Converted to waveform.")
+
+            # The waveform may view the buffer, so every consumer copies
+            # what it keeps before the bytes are released.
+            silences = silence_detector.feed(waveform)
+
+            stale = len(waveform) - max_backlog
+            if stale > 0:
+                logger.warning(f"Falling behind the client, dropping {stale / SAMPLING_RATE:.1f} s of stale audio.")
+                transcriber.skip_audio(waveform[:stale])
+                waveform = waveform[stale:]
+                await send_busy(websocket, stale / SAMPLING_RATE, framed)
+
+            has_speech = vad_gate.admit(waveform)
+            if has_speech:
+                transcriber.insert_audio(waveform)
+            else:
+                transcriber.skip_audio(waveform)
+            buffer.consume(usable)
+
+            if not has_speech:
+                logger.debug("No speech in chunk, skipping transcription.")
+                continue
+
+            try:
+                await scheduler_session.run(transcriber.process)
+            except SchedulerBusy as e:
+                # The audio stays in the window and is decoded with the next chunk.
+                logger.warning(f"Decode shed, deferring to next chunk: {e}")
+                await send_busy(websocket, e.retry_after, framed)
+                continue
+            except TranscriptionQueueFull:
+                logger.warning("Transcription queue full, deferring decode to next chunk.")
+                continue
+
+            transcription = transcriber.context
+            logger.debug(f"Transcription: {transcription}")
+
+            if is_stuttering(silences, transcription):
+                logger.debug("Stutter block detected.")
+                await send_suggestions(
+                    websocket,
+                    transcription,
+                    suggestion_model,
+                    suggestion_cache,
+                    predictor_store,
+                    user_id,
+                    scheduler_session,
+                    framed
+                )
+
+    except AudioBufferOverflow as e:
+        logger.warning(f"Closing websocket: {e}")
+        await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG)
 
     except WebSocketDisconnect:
         logger.info(f"Websocket connection closed.")
-  
\ No newline at end of file
+
+    finally:
+        if receiver is not None:
+            receiver.cancel()
+            # A disconnect seen by the receiver while audio was still being
+            # processed is handled by closing here.
+            if receiver.done() and not receiver.cancelled():
+                receiver.exception()
@@ -0,0 +1,34 @@
+from enum import Enum
+from typing import Literal
+from pydantic import BaseModel, ConfigDict
+
+class AudioEncoding(str, Enum):
+    S16LE = "s16le"
+    F32LE = "f32le"
+
+class AudioFormat(BaseModel):
+    encoding: AudioEncoding
+    sample_rate: Literal[16000] = 16000
+    channels: Literal[1] = 1
+
+    model_config = ConfigDict(extra="forbid")
+
+    @property
+    def bytes_per_sample(self) -> int:
+        """Size of a single sample in bytes."""
+        return 2 if self.encoding == AudioEncoding.S16LE else 4
+
+class SuggestionSource(str, Enum):
+    CACHE = "cache"
+    LOCAL = "local"
+    LLM = "llm"
+
+class SuggestionFrame(BaseModel):
+    type: Literal["suggestion"] = "suggestion"
+    word: str | None
+    final: bool
+    source: SuggestionSource = SuggestionSource.LLM
+
+class BusyFrame(BaseModel):
+    type: Literal["busy"] = "busy"
+    retry_after_ms: int
@@ -1,19 +1,27 @@
+import numpy as np
 from io import BytesIO
-from pydub import AudioSegment, silence
-from faster_whisper import WhisperModel
+from typing import TYPE_CHECKING, AsyncIterator
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.language_models.chat_models import BaseChatModel
 
+# faster_whisper is slow to import and only needed once models are loaded,
+# so it is imported where it is used.
+if TYPE_CHECKING:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.transcribe import Word
+
 def get_transcription(
-    audio: BytesIO | bytes, 
-    model: WhisperModel, 
+    audio: BytesIO | bytes | np.ndarray, 
+    model: "WhisperModel", 
     beam_size: int = 1
 ) -> str:
     """
     Get transcribes from audio.
 
     Args:
-        audio: Audio in buffer format.
+        audio: Audio in buffer format or as a 16kHz float32 waveform.
         beam_size: Beam size to use for decoding.
         whisper_model: Model to be used for transcription.
 
@@ -24,68 +32,402 @@ def get_transcription(
     transcript = " ".join([seg.text for seg in segments])
     return transcript
 
-def is_stuttering(
-    audio_seg: AudioSegment, 
-    transcript: str,
-    silence_thresh: int = -40,
-    min_silence_len: int = 300
-) -> bool:
+def get_word_transcription(
+    audio: np.ndarray,
+    model: "WhisperModel",
+    beam_size: int = 1,
+    initial_prompt: str | None = None
+) -> list["Word"]:
     """
-    Identifies whether the audio segment consists of blocks.
+    Transcribes audio into words with timestamps.
 
     Args:
-        audio_seg: Audio segment to check.
-        silence_thresh: Threshold for silent blocks of audio.
-        transcript: Transcribed audio file.
-        
+        audio: 16kHz float32 waveform.
+        model: Model to be used for transcription.
+        beam_size: Beam size to use for decoding.
+        initial_prompt: Previously transcribed text used as decoding context.
+
     Returns:
-        bool: True if the audio consists of stutter blocks.
+        list[Word]: Transcribed words, timed relative to the start of the audio.
+    """
+    segments, _ = model.transcribe(
+        audio,
+        beam_size=beam_size,
+        word_timestamps=True,
+        initial_prompt=encode_prompt(initial_prompt, model),
+        condition_on_previous_text=False
+    )
+    return [word for seg in segments for word in (seg.words or [])]
+
+# Decoding defaults of `WhisperModel.transcribe`, so a batched clip is decoded,
+# kept, dropped or retried exactly as the unbatched path would do it.
+NO_SPEECH_THRESHOLD = 0.6
+LOG_PROB_THRESHOLD = -1.0
+COMPRESSION_RATIO_THRESHOLD = 2.4
+MAX_INITIAL_TIMESTAMP = 1.0
+# CTranslate2 only batches prompts of the same length. Both paths cut prompts
+# to this many tokens, so streams with enough committed text share a batch.
+PROMPT_TOKENS = 32
+PREPEND_PUNCTUATIONS = "\"'“¿([{-"
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、"
+
+def encode_prompt(prompt: str | None, model: "WhisperModel") -> list[int]:
+    """
+    Encodes the text used as decoding context, as `transcribe` would, keeping its last tokens.
+
+    Args:
+        prompt: Previously transcribed text.
+        model: Model the prompt is for.
+
+    Returns:
+        list[int]: At most `PROMPT_TOKENS` tokens, none without a prompt.
+    """
+    if not prompt:
+        return []
+
+    return model.hf_tokenizer.encode(" " + prompt.strip(), add_special_tokens=False).ids[-PROMPT_TOKENS:]
+
+class PrecomputedAlignment:
+    """
+    Stands in for the model in `WhisperModel.add_word_timestamps`.
+
+    The alignment of a whole batch is computed in one pass, while the word
+    timing heuristics run per clip, starting from no previous speech as in
+    `transcribe`.
+    """
+
+    def __init__(self, model: "WhisperModel", alignment: list[dict]) -> None:
+        """
+        Args:
+            model: Model the alignment was computed with.
+            alignment: Aligned words of one clip.
+        """
+        self.frames_per_second = model.frames_per_second
+        self.alignment = alignment
+
+    def find_alignment(self, *args) -> list[list[dict]]:
+        """Returns the precomputed alignment, whatever was asked for."""
+        return [self.alignment]
+
+def decode_batch_segments(
+    waveforms: list[np.ndarray],
+    model: "WhisperModel",
+    beam_size: int,
+    initial_prompts: list[str | None] | None = None,
+    word_timestamps: bool = False
+) -> list[list[dict] | None]:
     """
-    silences = silence.detect_silence(
-        audio_seg, 
-        min_silence_len=min_silence_len, 
-        silence_thresh=silence_thresh
+    Decodes clips of at most 30 seconds with a single encoder and decoder pass.
+
+    Each clip is decoded like the first window of `WhisperModel.transcribe`:
+    with timestamps, the same suppressed tokens, its own prompt and its own
+    language, which comes from the model or is detected per clip for
+    multilingual models. Word timestamps come from a single alignment pass
+    per language. The batch is decoded at temperature 0 only, so a clip
+    whose decode would have needed temperature fallback, or a second window
+    because the model stopped before the end of the clip, has no segments
+    and must be transcribed one by one.
+
+    Args:
+        waveforms: 16kHz float32 waveforms, none longer than 30 seconds.
+        model: Model to be used for transcription.
+        beam_size: Beam size to use for decoding.
+        initial_prompts: Previously transcribed text used as decoding context, per
+            clip, all encoding to the same number of tokens.
+        word_timestamps: Whether to time each word of the segments.
+
+    Returns:
+        list[list[dict] | None]: Segments of each clip with their `text`,
+            `start`, `end`, `tokens` and, with word timestamps, `words`,
+            empty for silent clips, `None` for clips to transcribe one by one.
+    """
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.transcribe import get_compression_ratio, get_suppressed_tokens
+
+    feature_extractor = model.feature_extractor
+    features = [feature_extractor(waveform) for waveform in waveforms]
+    segment_sizes = [min(feature_extractor.nb_max_frames, feature.shape[-1] - 1) for feature in features]
+    encoder_output = model.encode(np.stack([
+        pad_or_trim(feature[:, :segment_size])
+        for feature, segment_size in zip(features, segment_sizes)
+    ]))
+
+    if model.model.is_multilingual:
+        languages = [
+            max(probabilities, key=lambda pair: pair[1])[0][2:-2]
+            for probabilities in model.model.detect_language(encoder_output)
+        ]
+    else:
+        languages = ["en"] * len(waveforms)
+
+    tokenizers = {
+        language: Tokenizer(model.hf_tokenizer, model.model.is_multilingual, task="transcribe", language=language)
+        for language in set(languages)
+    }
+    prompts = [
+        model.get_prompt(tokenizers[language], previous_tokens=encode_prompt(prompt, model))
+        for language, prompt in zip(languages, initial_prompts or [None] * len(waveforms))
+    ]
+
+    results = model.model.generate(
+        encoder_output,
+        prompts,
+        beam_size=beam_size,
+        patience=1,
+        length_penalty=1,
+        repetition_penalty=1,
+        no_repeat_ngram_size=0,
+        max_length=model.max_length,
+        return_scores=True,
+        return_no_speech_prob=True,
+        suppress_blank=True,
+        suppress_tokens=get_suppressed_tokens(tokenizers[languages[0]], [-1]),
+        max_initial_timestamp_index=int(round(MAX_INITIAL_TIMESTAMP / model.time_precision))
     )
-    return bool(silences) or (transcript and transcript.split()[-1].endswith(("-", "uh", "um", "aaaa")))
 
-async def get_next_word_suggestion(transcription: str, model: BaseChatModel) -> str | list[str]:
+    clips: list[list[dict] | None] = []
+    for language, segment_size, result in zip(languages, segment_sizes, results):
+        tokenizer = tokenizers[language]
+        tokens = result.sequences_ids[0]
+        avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+        silent = result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD
+        compression_ratio = get_compression_ratio(tokenizer.decode(tokens).strip())
+
+        # `transcribe` never retries silence, then skips the window if it has no speech.
+        if not silent and (avg_logprob < LOG_PROB_THRESHOLD or compression_ratio > COMPRESSION_RATIO_THRESHOLD):
+            clips.append(None)
+            continue
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob <= LOG_PROB_THRESHOLD:
+            clips.append([])
+            continue
+
+        # Splits the window into segments and tells where `transcribe` would decode next.
+        segments, seek, single_timestamp_ending = model._split_segments_by_timestamps(
+            tokenizer=tokenizer,
+            tokens=tokens,
+            time_offset=0.0,
+            segment_size=segment_size,
+            segment_duration=segment_size * feature_extractor.time_per_frame,
+            seek=0
+        )
+        # With word timestamps, `transcribe` resumes after the last word unless the window was finished.
+        if seek < segment_size or (word_timestamps and not single_timestamp_ending):
+            clips.append(None)
+            continue
+
+        clips.append(segments)
+
+    if word_timestamps:
+        add_batch_word_timestamps(clips, languages, tokenizers, encoder_output, segment_sizes, model)
+
+    for i, segments in enumerate(clips):
+        if segments is None:
+            continue
+        for segment in segments:
+            segment["text"] = tokenizers[languages[i]].decode(segment["tokens"])
+        clips[i] = [
+            segment for segment in segments
+            if segment["start"] != segment["end"] and segment["text"].strip()
+        ]
+
+    return clips
+
+def add_batch_word_timestamps(
+    clips: list[list[dict] | None],
+    languages: list[str],
+    tokenizers: dict[str, "Tokenizer"],
+    encoder_output: "ctranslate2.StorageView",
+    segment_sizes: list[int],
+    model: "WhisperModel"
+) -> None:
     """
-    Provides suggestions for next word based on context.
+    Times the words of each clip's segments, in place.
+
+    Args:
+        clips: Segments of each clip, `None` for clips left out.
+        languages: Language of each clip.
+        tokenizers: Tokenizer of each language.
+        encoder_output: Encoder output of the batch.
+        segment_sizes: Number of frames of each clip.
+        model: Model the batch was decoded with.
+    """
+    from faster_whisper import WhisperModel
+
+    for language, tokenizer in tokenizers.items():
+        # The alignment prompt depends on the language, clips of other languages align nothing.
+        text_tokens = [
+            [token for segment in segments for token in segment["tokens"] if token < tokenizer.eot]
+            if segments and clip_language == language else []
+            for segments, clip_language in zip(clips, languages)
+        ]
+        alignments = model.find_alignment(tokenizer, text_tokens, encoder_output, segment_sizes)
+
+        for segments, clip_language, alignment, segment_size in zip(clips, languages, alignments, segment_sizes):
+            if not segments or clip_language != language:
+                continue
+            WhisperModel.add_word_timestamps(
+                PrecomputedAlignment(model, alignment),
+                [segments],
+                tokenizer,
+                encoder_output,
+                segment_size,
+                PREPEND_PUNCTUATIONS,
+                APPEND_PUNCTUATIONS,
+                last_speech_timestamp=0.0
+            )
+
+def get_batch_transcription(
+    audios: list[BytesIO | bytes | np.ndarray],
+    model: "WhisperModel",
+    beam_size: int = 1
+) -> list[str]:
+    """
+    Transcribes several audio clips with a single encoder and decoder pass.
+
+    Returns what `get_transcription` returns for each clip. Clips that
+    `decode_batch_segments` cannot settle, and clips longer than the model's
+    30 second window, are transcribed one by one.
+
+    Args:
+        audios: Audio clips, either encoded buffers or 16kHz float32 waveforms.
+        model: Model to be used for transcription.
+        beam_size: Beam size to use for decoding.
+
+    Returns:
+        list[str]: Transcriptions, in the same order as the clips.
+    """
+    from faster_whisper.audio import decode_audio
+
+    sampling_rate = model.feature_extractor.sampling_rate
+    waveforms = [
+        audio if isinstance(audio, np.ndarray) else decode_audio(audio, sampling_rate=sampling_rate)
+        for audio in audios
+    ]
+
+    batchable = [i for i, waveform in enumerate(waveforms) if len(waveform) <= model.feature_extractor.n_samples]
+    clips: list[list[dict] | None] = [None] * len(waveforms)
+    if batchable:
+        for i, segments in zip(batchable, decode_batch_segments([waveforms[i] for i in batchable], model, beam_size)):
+            clips[i] = segments
+
+    return [
+        get_transcription(waveform, model, beam_size) if segments is None
+        else " ".join(segment["text"] for segment in segments)
+        for waveform, segments in zip(waveforms, clips)
+    ]
+
+def get_batch_word_transcription(
+    audios: list[np.ndarray],
+    model: "WhisperModel",
+    beam_size: int = 1,
+    initial_prompts: list[str | None] | None = None
+) -> list[list["Word"]]:
+    """
+    Transcribes several audio clips into timed words with a single encoder and decoder pass.
+
+    Returns what `get_word_transcription` returns for each clip. Clips whose
+    prompts have the same number of tokens are decoded together. Clips that
+    `decode_batch_segments` cannot settle, and clips longer than the model's
+    30 second window, are transcribed one by one.
+
+    Args:
+        audios: 16kHz float32 waveforms.
+        model: Model to be used for transcription.
+        beam_size: Beam size to use for decoding.
+        initial_prompts: Previously transcribed text used as decoding context, per clip.
 
     Returns:
-        str | list[str]: Next word suggestions.
+        list[list[Word]]: Transcribed words of each clip, timed relative to its start.
     """
-    system_prompt = """
-    ### Role:
-    You are a helpful and intelligent **speech assistant** designed to help users continue speaking fluently during real-time conversations.
+    from faster_whisper.transcribe import Word
 
-    ### Objective:
-    1. Analyze the provided transcript to detect signs of speech disfluency, such as stuttering, hesitations, or abrupt pauses — typically indicated by dashes (e.g., 'uh---'), repetitions, filler words or aberrations in text.
-    2. Use the full context of the transcript to suggest 1–4 appropriate next words that the speaker might naturally say next.
-    3. Respond only with a list of 1 to 4 contextually relevant and grammatically appropriate next words.
+    initial_prompts = initial_prompts or [None] * len(audios)
+    groups: dict[int, list[int]] = {}
+    for i, (audio, prompt) in enumerate(zip(audios, initial_prompts)):
+        if len(audio) <= model.feature_extractor.n_samples:
+            groups.setdefault(len(encode_prompt(prompt, model)), []).append(i)
 
-    ### Example:
-    **Transcript:**
-    Yes, I went to that party yesterday. I uh--
+    clips: list[list[dict] | None] = [None] * len(audios)
+    for group in groups.values():
+        decoded = decode_batch_segments(
+            [audios[i] for i in group],
+            model,
+            beam_size,
+            initial_prompts=[initial_prompts[i] for i in group],
+            word_timestamps=True
+        )
+        for i, segments in zip(group, decoded):
+            clips[i] = segments
 
-    **Next word suggestions:**
-    enjoyed, liked, hated, remembered
+    return [
+        get_word_transcription(audio, model, beam_size, prompt) if segments is None
+        else [Word(**word) for segment in segments for word in segment["words"]]
+        for audio, prompt, segments in zip(audios, initial_prompts, clips)
+    ]
 
-    ### Output Format:
-    Comma-separated list of 1 to 4 words. Do not include quotes, numbers, or explanations.
+def is_stuttering(silences: list[list[int]], transcript: str) -> bool:
+    """
+    Identifies whether the audio consists of blocks.
+
+    Args:
+        silences: Silent ranges detected in the audio.
+        transcript: Transcribed audio file.
+        
+    Returns:
+        bool: True if the audio consists of stutter blocks.
+    """
+    return bool(silences) or bool(transcript and transcript.split()[-1].endswith(("-", "uh", "um", "aaaa")))
+
+SUGGESTION_SYSTEM_PROMPT = """
+### Role:
+You are a helpful and intelligent **speech assistant** designed to help users continue speaking fluently during real-time conversations.
+
+### Objective:
+1. Analyze the provided transcript to detect signs of speech disfluency, such as stuttering, hesitations, or abrupt pauses — typically indicated by dashes (e.g., 'uh---'), repetitions, filler words or aberrations in text.
+2. Use the full context of the transcript to suggest 1–4 appropriate next words that the speaker might naturally say next.
+3. Respond only with a list of 1 to 4 contextually relevant and grammatically appropriate next words.
+
+### Example:
+**Transcript:**
+Yes, I went to that party yesterday. I uh--
+
+**Next word suggestions:**
+enjoyed, liked, hated, remembered
+
+### Output Format:
+Comma-separated list of 1 to 4 words. Do not include quotes, numbers, or explanations.
+
+### Important Guidelines:
+- Never suggest profanities, slang, or inappropriate content.
+- Always consider the intent and tone of the sentence.
+- Your suggestions should be helpful and aligned with what the user is likely trying to say.
+"""
+SUGGESTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SUGGESTION_SYSTEM_PROMPT),
+    ("human", "{transcript}")
+])
+
+async def stream_next_word_suggestions(transcription: str, model: BaseChatModel) -> AsyncIterator[str]:
+    """
+    Streams suggestions for next word, yielding each one as soon as it is complete.
+
+    Args:
+        transcription: Transcript of the current sentence.
+        model: Chat model generating the suggestions.
 
-    ### Important Guidelines:
-    - Never suggest profanities, slang, or inappropriate content.
-    - Always consider the intent and tone of the sentence.
-    - Your suggestions should be helpful and aligned with what the user is likely trying to say.
+    Yields:
+        str: Next word suggestion.
     """
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        ("human", "{transcript}")
-    ])
+    suggestion_chain = SUGGESTION_PROMPT | model
 
-    suggestion_chain = prompt | model
+    pending = ""
+    async for chunk in suggestion_chain.astream({"transcript": transcription}):
+        pending += chunk.content if hasattr(chunk, "content") else str(chunk)
+        *words, pending = pending.split(",")
+        for word in words:
+            if word.strip():
+                yield word.strip()
 
-    response = await suggestion_chain.ainvoke({"transcript": transcription})
-    raw = response.content if hasattr(response, "content") else str(response)
-    return [w.strip() for w in raw.split(",") if w.strip()]
\ No newline at end of file
+    if pending.strip():
+        yield pending.strip()
@@ -0,0 +1,137 @@
+import numpy as np
+
+from src.assistant.utils import SAMPLING_RATE
+
+SAMPLES_PER_MS = SAMPLING_RATE // 1000
+# Full scale of 16-bit audio, which pydub measures dBFS against.
+MAX_AMPLITUDE = 2 ** 15
+
+def silent_window_starts(
+    waveform: np.ndarray,
+    silence_thresh: int = -40,
+    min_silence_len: int = 300
+) -> np.ndarray:
+    """
+    Finds every millisecond at which a window of `min_silence_len` ms is silent.
+
+    Mirrors the per-millisecond scan of `pydub.silence.detect_silence`, using a
+    cumulative sum of per-millisecond energy so each window costs O(1).
+
+    Args:
+        waveform: 16kHz mono float32 waveform.
+        silence_thresh: Loudness in dBFS below which a window is silent.
+        min_silence_len: Window length in milliseconds.
+
+    Returns:
+        np.ndarray: Start of each silent window, in milliseconds.
+    """
+    total_ms = len(waveform) // SAMPLES_PER_MS
+    if total_ms < min_silence_len:
+        return np.zeros(0, dtype=np.int64)
+
+    # The 16-bit samples and integer RMS of pydub, so windows at the threshold agree too.
+    samples = (np.clip(waveform[:total_ms * SAMPLES_PER_MS], -1.0, 1.0) * 32767).astype(np.int16)
+    energy = np.square(samples.astype(np.int64)).reshape(total_ms, SAMPLES_PER_MS).sum(axis=1)
+    cumulative = np.concatenate(([0], np.cumsum(energy)))
+
+    window_energy = cumulative[min_silence_len:] - cumulative[:-min_silence_len]
+    rms = np.floor(np.sqrt(window_energy / (min_silence_len * SAMPLES_PER_MS)))
+    threshold = 10 ** (silence_thresh / 20) * MAX_AMPLITUDE
+
+    return np.flatnonzero(rms <= threshold)
+
+def merge_silent_windows(starts: np.ndarray, min_silence_len: int) -> list[list[int]]:
+    """
+    Merges overlapping silent windows into ranges the way pydub does.
+
+    Args:
+        starts: Sorted start of each silent window, in milliseconds.
+        min_silence_len: Window length in milliseconds.
+
+    Returns:
+        list[list[int]]: Silent ranges as `[start, end]` in milliseconds.
+    """
+    if not len(starts):
+        return []
+
+    breaks = np.flatnonzero(np.diff(starts) > min_silence_len)
+    range_starts = np.concatenate(([starts[0]], starts[breaks + 1]))
+    range_ends = np.concatenate((starts[breaks], [starts[-1]])) + min_silence_len
+
+    return [[int(start), int(end)] for start, end in zip(range_starts, range_ends)]
+
+def detect_silence(
+    waveform: np.ndarray,
+    silence_thresh: int = -40,
+    min_silence_len: int = 300
+) -> list[list[int]]:
+    """
+    Vectorized drop-in for `pydub.silence.detect_silence` on a raw waveform.
+
+    Args:
+        waveform: 16kHz mono float32 waveform.
+        silence_thresh: Loudness in dBFS below which audio is silent.
+        min_silence_len: Shortest silence to report, in milliseconds.
+
+    Returns:
+        list[list[int]]: Silent ranges as `[start, end]` in milliseconds.
+    """
+    starts = silent_window_starts(waveform, silence_thresh, min_silence_len)
+    return merge_silent_windows(starts, min_silence_len)
+
+class SilenceDetector:
+    """
+    Detects silences in a live stream, including those spanning chunk boundaries.
+
+    Audio whose windows cannot be evaluated yet is carried over to the next
+    chunk, and the last silent range is kept open so it can keep growing.
+    """
+
+    def __init__(self, silence_thresh: int = -40, min_silence_len: int = 300) -> None:
+        """
+        Args:
+            silence_thresh: Loudness in dBFS below which audio is silent.
+            min_silence_len: Shortest silence to report, in milliseconds.
+        """
+        self.silence_thresh = silence_thresh
+        self.min_silence_len = min_silence_len
+
+        self.carry = np.zeros(0, dtype=np.float32)
+        self.offset_ms = 0
+        self.range_start: int | None = None
+        self.last_silent_start: int | None = None
+
+    def feed(self, waveform: np.ndarray) -> list[list[int]]:
+        """
+        Adds audio to the stream and reports the silences it takes part in.
+
+        Args:
+            waveform: 16kHz mono float32 waveform.
+
+        Returns:
+            list[list[int]]: Silent ranges as `[start, end]` in stream milliseconds.
+        """
+        audio = np.concatenate((self.carry, waveform)) if len(self.carry) else waveform
+        starts = silent_window_starts(audio, self.silence_thresh, self.min_silence_len)
+
+        total_ms = len(audio) // SAMPLES_PER_MS
+        evaluated = max(total_ms - self.min_silence_len + 1, 0)
+        self.carry = audio[evaluated * SAMPLES_PER_MS:].copy()
+
+        starts = starts + self.offset_ms
+        self.offset_ms += evaluated
+
+        if not len(starts):
+            return []
+
+        ranges = merge_silent_windows(starts, self.min_silence_len)
+        continues = (
+            self.last_silent_start is not None
+            and starts[0] - self.last_silent_start <= self.min_silence_len
+        )
+        if continues:
+            ranges[0][0] = self.range_start
+
+        self.range_start = ranges[-1][0]
+        self.last_silent_start = int(starts[-1])
+        return ranges
@@ -0,0 +1,209 @@
+import re
+import numpy as np
+from dataclasses import dataclass
+
+from src.assistant.utils import SAMPLING_RATE
+from src.core.transcription import TranscriptionExecutor
+
+SENTENCE_END = (".", "?", "!")
+
+@dataclass
+class StreamedWord:
+    """Word of the stream, timed in seconds from the start of the session."""
+    start: float
+    end: float
+    text: str
+
+    @property
+    def key(self) -> str:
+        """Normalized form used to compare hypotheses."""
+        return re.sub(r"[^\w']", "", self.text.lower())
+
+class StreamingTranscriber:
+    """
+    Incrementally transcribes a live audio stream using the LocalAgreement policy.
+
+    Audio is kept in a rolling window that is re-decoded as it grows. A word is
+    committed once two consecutive hypotheses agree on it, and the window is then
+    trimmed up to the last committed word, keeping a short overlap. Each decode
+    therefore only covers the unstable tail, while the committed text is passed
+    to whisper as a prompt so the tail is still decoded in context.
+    """
+
+    def __init__(
+        self,
+        executor: TranscriptionExecutor,
+        beam_size: int = 1,
+        max_window_seconds: float = 15.0,
+        overlap_seconds: float = 1.0,
+        prompt_chars: int = 200,
+        max_committed_words: int = 200
+    ) -> None:
+        """
+        Args:
+            executor: Executor running the transcription.
+            beam_size: Beam size to use for decoding.
+            max_window_seconds: Longest audio window before it is trimmed regardless of agreement.
+            overlap_seconds: Audio kept before the last committed word when trimming.
+            prompt_chars: Length of the committed text tail passed as prompt.
+            max_committed_words: Number of committed words remembered for context.
+        """
+        self.executor = executor
+        self.beam_size = beam_size
+        self.max_window_seconds = max_window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.prompt_chars = prompt_chars
+        self.max_committed_words = max_committed_words
+
+        self.audio = np.zeros(0, dtype=np.float32)
+        self.offset = 0.0
+        self.committed: list[StreamedWord] = []
+        self.hypothesis: list[StreamedWord] = []
+
+    @property
+    def window_seconds(self) -> float:
+        """Duration of the audio window that the next decode covers."""
+        return len(self.audio) / SAMPLING_RATE
+
+    @property
+    def committed_end(self) -> float:
+        """Stream time at which the last committed word ends."""
+        return self.committed[-1].end if self.committed else 0.0
+
+    @property
+    def context(self) -> str:
+        """
+        Text of the sentence currently being spoken.
+
+        Returns:
+            str: Committed words since the last sentence end followed by the unstable tail.
+        """
+        start = 0
+        for i, word in enumerate(self.committed):
+            if word.text.endswith(SENTENCE_END):
+                start = i + 1
+
+        words = self.committed[start:] + self.hypothesis
+        return " ".join(word.text for word in words)
+
+    def insert_audio(self, waveform: np.ndarray) -> None:
+        """
+        Appends audio to the window.
+
+        Args:
+            waveform: 16kHz float32 waveform.
+        """
+        self.audio = np.concatenate([self.audio, waveform.astype(np.float32, copy=False)])
+
+    async def process(self) -> list[StreamedWord]:
+        """
+        Decodes the current window and commits the words both hypotheses agree on.
+
+        Returns:
+            list[StreamedWord]: Newly committed words.
+
+        Raises:
+            TranscriptionQueueFull: When the executor cannot accept the request.
+        """
+        prompt = " ".join(word.text for word in self.committed)[-self.prompt_chars:]
+        words = await self.executor.transcribe_words_async(
+            self.audio,
+            beam_size=self.beam_size,
+            initial_prompt=prompt or None
+        )
+
+        hypothesis = [
+            StreamedWord(word.start + self.offset, word.end + self.offset, word.word.strip())
+            for word in words
+            if word.word.strip()
+        ]
+        hypothesis = self._skip_committed(hypothesis)
+
+        agreed = 0
+        for previous, current in zip(self.hypothesis, hypothesis):
+            if previous.key != current.key:
+                break
+            agreed += 1
+
+        newly_committed = hypothesis[:agreed]
+        self.committed.extend(newly_committed)
+        self.hypothesis = hypothesis[agreed:]
+
+        if self.window_seconds > self.max_window_seconds:
+            # Nothing stabilised for a full window, accept the hypothesis as is.
+            newly_committed.extend(self.hypothesis)
+            self.committed.extend(self.hypothesis)
+            self.hypothesis = []
+            self._trim(self.offset + self.window_seconds - self.overlap_seconds)
+        elif newly_committed:
+            self._trim(self.committed_end - self.overlap_seconds)
+
+        del self.committed[:-self.max_committed_words]
+        return newly_committed
+
+    def flush(self) -> list[StreamedWord]:
+        """
+        Commits the unstable tail, used when the stream ends.
+
+        Returns:
+            list[StreamedWord]: Words committed by the flush.
+        """
+        flushed = self.hypothesis
+        self.committed.extend(flushed)
+        self.hypothesis = []
+        return flushed
+
+    def skip_audio(self, waveform: np.ndarray) -> list[StreamedWord]:
+        """
+        Advances the stream past audio that will not be transcribed.
+
+        The utterance in the window has ended, so its unstable tail is
+        committed and the window is emptied.
+
+        Args:
+            waveform: 16kHz float32 waveform being skipped.
+
+        Returns:
+            list[StreamedWord]: Words committed by the flush.
+        """
+        flushed = self.flush()
+        self.offset += self.window_seconds + len(waveform) / SAMPLING_RATE
+        self.audio = np.zeros(0, dtype=np.float32)
+        return flushed
+
+    def _skip_committed(self, hypothesis: list[StreamedWord]) -> list[StreamedWord]:
+        """
+        Removes words of the hypothesis that fall inside already committed audio.
+
+        The overlap kept while trimming makes whisper transcribe the last
+        committed words again, so both timing and repeated n-grams are checked.
+
+        Args:
+            hypothesis: Words of the latest decode.
+
+        Returns:
+            list[StreamedWord]: Words following the committed text.
+        """
+        hypothesis = [word for word in hypothesis if word.start > self.committed_end - 0.1]
+
+        for n in range(min(5, len(self.committed), len(hypothesis)), 0, -1):
+            tail = [word.key for word in self.committed[-n:]]
+            head = [word.key for word in hypothesis[:n]]
+            if tail == head:
+                return hypothesis[n:]
+
+        return hypothesis
+
+    def _trim(self, until: float) -> None:
+        """
+        Drops window audio before the given stream time.
+
+        Args:
+            until: Stream time in seconds.
+        """
+        samples = int((until - self.offset) * SAMPLING_RATE)
+        if samples <= 0:
+            return
+
+        self.audio = self.audio[samples:]
+        self.offset += samples / SAMPLING_RATE
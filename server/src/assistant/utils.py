@@ -1,14 +1,87 @@
 import io
-from pydub import AudioSegment
+import re
+import numpy as np
+from typing import TYPE_CHECKING
 
-def load_audio_segment(audio_chunk: bytes) -> AudioSegment: 
+from src.assistant.schemas import AudioEncoding
+
+# pydub and faster_whisper pull in av and ffmpeg bindings, they are
+# imported on first use to keep startup fast.
+if TYPE_CHECKING:
+    from pydub import AudioSegment
+
+SAMPLING_RATE = 16000
+FILLERS = {"uh", "um", "uhm", "er", "erm", "ah", "hmm", "mm"}
+
+def tokenize_transcript(transcript: str) -> list[str]:
+    """
+    Splits a transcript into the words the speaker meant to say.
+
+    Text is lowercased, dashes and punctuation are stripped, and fillers and
+    stuttered repetitions are dropped.
+
+    Args:
+        transcript: Transcribed text.
+
+    Returns:
+        list[str]: Normalized tokens.
+    """
+    tokens = []
+    for token in re.sub(r"[^\w'\s]", " ", transcript.lower()).split():
+        if token in FILLERS or (tokens and tokens[-1] == token):
+            continue
+        tokens.append(token)
+
+    return tokens
+
+def load_waveform(audio_chunk: bytes | memoryview) -> np.ndarray:
+    """
+    Decodes the provided encoded audio into a waveform whisper can consume directly.
+
+    Args:
+        audio_chunk: Audio to decode.
+
+    Returns:
+        np.ndarray: 16kHz mono float32 waveform.
+    """
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(io.BytesIO(audio_chunk), sampling_rate=SAMPLING_RATE)
+
+def pcm_to_waveform(pcm: bytes | memoryview, encoding: AudioEncoding) -> np.ndarray:
     """
-    Converts the provided audio into python mutable form.
+    Views raw 16kHz mono PCM as a float32 waveform without decoding it.
+
+    Float samples are viewed in place, integer samples are scaled in a single pass.
 
     Args:
-        audio_chunk: Audio to convert.
+        pcm: Raw little-endian samples, a whole number of them.
+        encoding: Sample format of the audio.
+
+    Returns:
+        np.ndarray: 16kHz mono float32 waveform.
+    """
+    if encoding == AudioEncoding.F32LE:
+        return np.frombuffer(pcm, dtype="<f4")
+
+    return np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+
+def waveform_to_segment(waveform: np.ndarray) -> "AudioSegment":
+    """
+    Wraps a waveform in a pydub segment without going through ffmpeg.
+
+    Args:
+        waveform: 16kHz mono float32 waveform.
 
     Returns:
         AudioSegment: Python mutable audio.
     """
-    return AudioSegment.from_file_using_temporary_files(io.BytesIO(audio_chunk))
\ No newline at end of file
+    from pydub import AudioSegment
+
+    samples = (np.clip(waveform, -1.0, 1.0) * 32767).astype("<i2")
+    return AudioSegment(
+        data=samples.tobytes(),
+        sample_width=2,
+        frame_rate=SAMPLING_RATE,
+        channels=1
+    )
@@ -0,0 +1,116 @@
+import numpy as np
+from enum import Enum
+
+from src.assistant.utils import SAMPLING_RATE
+
+FRAME_SAMPLES = SAMPLING_RATE * 30 // 1000
+
+class VadBackend(str, Enum):
+    OFF = "off"
+    ENERGY = "energy"
+    SILERO = "silero"
+
+def count_speech_frames(
+    waveform: np.ndarray,
+    energy_thresh: int = -45,
+    max_zero_crossing_rate: float = 0.35
+) -> int:
+    """
+    Counts 30 ms frames that look like speech from their energy and zero-crossing rate.
+
+    Frames must be louder than the threshold, and broadband noise is rejected
+    by its high zero-crossing rate.
+
+    Args:
+        waveform: 16kHz mono float32 waveform.
+        energy_thresh: Loudness in dBFS above which a frame may be speech.
+        max_zero_crossing_rate: Share of sign changes above which a frame is noise.
+
+    Returns:
+        int: Number of speech frames.
+    """
+    total_frames = len(waveform) // FRAME_SAMPLES
+    if not total_frames:
+        return 0
+
+    frames = waveform[:total_frames * FRAME_SAMPLES].reshape(total_frames, FRAME_SAMPLES)
+    energy_db = 10 * np.log10(np.mean(np.square(frames, dtype=np.float64), axis=1) + 1e-12)
+    signs = np.signbit(frames)
+    zero_crossing_rate = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+    return int(np.count_nonzero((energy_db > energy_thresh) & (zero_crossing_rate < max_zero_crossing_rate)))
+
+class VoiceActivityGate:
+    """
+    Pipeline stage deciding which chunks are worth transcribing.
+
+    Chunks without speech are held back from whisper and the LLM, except for
+    a few trailing chunks after speech ends so a block following a word is
+    still transcribed and checked.
+    """
+
+    def __init__(
+        self,
+        backend: VadBackend = VadBackend.ENERGY,
+        energy_thresh: int = -45,
+        min_speech_ms: int = 90,
+        hangover_chunks: int = 1
+    ) -> None:
+        """
+        Args:
+            backend: Detector used to find speech, `off` admits every chunk.
+            energy_thresh: Loudness in dBFS above which a frame may be speech.
+            min_speech_ms: Speech needed within a chunk to open the gate.
+            hangover_chunks: Chunks admitted after the last one containing speech.
+        """
+        self.backend = backend
+        self.energy_thresh = energy_thresh
+        self.min_speech_ms = min_speech_ms
+        self.hangover_chunks = hangover_chunks
+        self.remaining_hangover = 0
+
+    def has_speech(self, waveform: np.ndarray) -> bool:
+        """
+        Checks a chunk for speech with the configured backend.
+
+        Args:
+            waveform: 16kHz mono float32 waveform.
+
+        Returns:
+            bool: True if the chunk contains at least `min_speech_ms` of speech.
+        """
+        if self.backend == VadBackend.OFF:
+            return True
+
+        if self.backend == VadBackend.SILERO:
+            # Deferred, importing faster_whisper is slow and most deployments use the energy backend.
+            from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+            speech = get_speech_timestamps(
+                waveform,
+                VadOptions(min_speech_duration_ms=self.min_speech_ms)
+            )
+            return bool(speech)
+
+        min_frames = max(self.min_speech_ms * SAMPLING_RATE // 1000 // FRAME_SAMPLES, 1)
+        return count_speech_frames(waveform, self.energy_thresh) >= min_frames
+
+    def admit(self, waveform: np.ndarray) -> bool:
+        """
+        Decides whether a chunk should be transcribed.
+
+        Args:
+            waveform: 16kHz mono float32 waveform.
+
+        Returns:
+            bool: True if the chunk contains speech or trails a chunk that did.
+        """
+        if self.has_speech(waveform):
+            self.remaining_hangover = self.hangover_chunks
+            return True
+
+        if self.remaining_hangover > 0:
+            self.remaining_hangover -= 1
+            return True
+
+        return False
@@ -0,0 +1,124 @@
+import time
+from dataclasses import dataclass
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.user.schemas import UserDto
+
+@dataclass(frozen=True)
+class VerifiedToken:
+    """Claims of a token whose signature and expiry were already checked."""
+    token: str
+    token_type: str
+    sub: str
+    expires_at: float
+
+class AuthCache:
+    """
+    Caches verified tokens and authenticated users between requests.
+
+    Tokens are keyed on their signature and never outlive their `exp` claim.
+    Users expire after a short time, so a change made through another worker
+    is picked up quickly, and are dropped as soon as they are updated or
+    deleted through this one.
+    """
+
+    def __init__(
+        self,
+        token_size: int = 4096,
+        token_ttl_seconds: float = 300,
+        user_size: int = 2048,
+        user_ttl_seconds: float = 30
+    ) -> None:
+        """
+        Args:
+            token_size: Verified tokens kept.
+            token_ttl_seconds: Time after which a token is verified again.
+            user_size: Users kept.
+            user_ttl_seconds: Time after which a user is loaded again.
+        """
+        self.tokens: TTLCache[str, VerifiedToken] = TTLCache(token_size, token_ttl_seconds)
+        self.users: TTLCache[str, UserDto] = TTLCache(user_size, user_ttl_seconds)
+
+    def get_token(self, token: str) -> VerifiedToken | None:
+        """
+        Looks up a previously verified token.
+
+        Args:
+            token: Encoded JWT.
+
+        Returns:
+            VerifiedToken | None: Claims of the token, or None if it must be verified.
+        """
+        signature = token.rpartition(".")[2]
+        verified = self.tokens.get(signature)
+        if verified is None or verified.token != token:
+            return None
+
+        if verified.expires_at <= time.time():
+            self.tokens.pop(signature)
+            return None
+
+        return verified
+
+    def set_token(self, token: str, token_type: str, sub: str, expires_at: float) -> None:
+        """
+        Remembers a token that passed verification.
+
+        Args:
+            token: Encoded JWT.
+            token_type: Type claim of the token.
+            sub: Subject claim of the token.
+            expires_at: Expiry claim of the token, as a Unix timestamp.
+        """
+        signature = token.rpartition(".")[2]
+        self.tokens.set(signature, VerifiedToken(token, token_type, sub, expires_at))
+
+    def get_user(self, user_id: str) -> UserDto | None:
+        """
+        Looks up an authenticated user.
+
+        Args:
+            user_id: Id of the user.
+
+        Returns:
+            UserDto | None: Cached user, or None if it must be loaded.
+        """
+        return self.users.get(user_id)
+
+    def set_user(self, user: UserDto) -> None:
+        """
+        Remembers a user loaded from the database.
+
+        Args:
+            user: User to cache.
+        """
+        self.users.set(str(user.id), user)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """
+        Drops a user after it was changed.
+
+        Args:
+            user_id: Id of the user.
+        """
+        self.users.pop(user_id)
+
+    def stats(self) -> dict[str, dict[str, int | float]]:
+        """
+        Reports hit rates of both caches.
+
+        Returns:
+            dict[str, dict[str, int | float]]: Usage of the token and user caches.
+        """
+        return {
+            "tokens": self.tokens.stats(),
+            "users": self.users.stats()
+        }
+
+auth_cache = AuthCache(
+    token_size=settings.AUTH_TOKEN_CACHE_SIZE,
+    token_ttl_seconds=settings.AUTH_TOKEN_CACHE_TTL_SECONDS,
+    user_size=settings.AUTH_USER_CACHE_SIZE,
+    user_ttl_seconds=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
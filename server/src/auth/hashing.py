@@ -0,0 +1,103 @@
+import asyncio
+import multiprocessing
+from contextlib import contextmanager
+from typing import Any, Callable, TypeVar
+from concurrent.futures import ProcessPoolExecutor
+
+from src.auth.utils import get_password_hash, verify_and_update_password
+
+R = TypeVar("R")
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hasher cannot accept more work."""
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a bounded process pool.
+
+    Each call costs hundreds of milliseconds of CPU and holds the GIL, so it
+    runs in separate processes to keep the event loop and the audio
+    websockets responsive during login bursts. Requests beyond the pool and
+    its queue are rejected instead of piling up.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue_size: int = 16) -> None:
+        """
+        Args:
+            max_workers: Number of processes hashing concurrently.
+            max_queue_size: Number of requests allowed to wait for a free process.
+        """
+        self.capacity = max_workers + max_queue_size
+        self.pending = 0
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @contextmanager
+    def _admission(self):
+        """
+        Holds a slot in the hasher for the duration of a request.
+
+        Raises:
+            PasswordHasherBusy: When all processes are busy and the queue is full.
+        """
+        if self.pending >= self.capacity:
+            raise PasswordHasherBusy(f"{self.pending} password hashes already pending.")
+
+        self.pending += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def _run(self, fn: Callable[..., R], *args: Any) -> R:
+        """
+        Runs a function on the process pool once admitted.
+
+        Args:
+            fn: Function to run.
+            args: Arguments for the function.
+
+        Returns:
+            R: Result of the function.
+        """
+        with self._admission():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        """
+        Hashes a password.
+
+        Args:
+            password: Password to hash.
+
+        Returns:
+            str: Hashed password.
+
+        Raises:
+            PasswordHasherBusy: When the hasher is saturated.
+        """
+        return await self._run(get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Verifies a password and rehashes it when its hash uses outdated settings.
+
+        Args:
+            password: Plain password to verify.
+            hashed_password: Stored hash.
+
+        Returns:
+            tuple[bool, str | None]: Whether the password matches, and the
+                replacement hash if the stored one needs an update.
+
+        Raises:
+            PasswordHasherBusy: When the hasher is saturated.
+        """
+        return await self._run(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stops the worker processes."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,6 @@
 from typing import Annotated
 from sqlalchemy import select, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, HTTPException, Depends, status
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 
@@ -8,7 +8,8 @@ from src.user.models import User
 from src.core.logging import logger
 from src.core.metadata import ApiTags
 from src.user.schemas import UserCreateDto
-from src.core.dependencies import get_db_session
+from src.core.dependencies import get_db_session, get_password_hasher
+from src.auth.hashing import PasswordHasher, PasswordHasherBusy
 from src.auth.schemas import (
     AuthResponseData, 
     AuthSuccessResponse, 
@@ -33,7 +34,8 @@ router = APIRouter(
 @router.post("/register", status_code=status.HTTP_201_CREATED, response_model=AuthSuccessResponse)
 async def register_user(
     user_data: UserCreateDto, 
-    session: Annotated[Session, Depends(get_db_session)]
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)]
 ) -> AuthSuccessResponse:
     """
     Endpoint to register users.
@@ -41,6 +43,7 @@ async def register_user(
     Args:
         create_data: Data used for creating user.
         session: Database session.
+        password_hasher: Process pool hashing passwords.
 
     Returns:
         AuthSuccessResponse: Response containing created user and access tokens.
@@ -53,7 +56,7 @@ async def register_user(
             ) 
         )
 
-        existing_user = session.scalars(existing_user_query).first()
+        existing_user = (await session.scalars(existing_user_query)).first()
 
         if existing_user:
             raise HTTPException(
@@ -61,7 +64,7 @@ async def register_user(
                 detail="Username or email already exists."
             )
         
-        user = await create_user(user_data, session)
+        user = await create_user(user_data, session, password_hasher)
 
         token_data = TokenData(sub=str(user.id))
         response = AuthResponseData(
@@ -74,7 +77,18 @@ async def register_user(
             message="Registration successful.",
             data=response
         )
-    
+
+    except PasswordHasherBusy as e:
+        logger.warning(f"Rejecting registration: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.exception(f"Error while registering user {user_data.username}: {e}")
         raise HTTPException(
@@ -85,7 +99,8 @@ async def register_user(
 @router.post("/login", status_code=status.HTTP_200_OK, response_model=AuthSuccessResponse)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    session: Annotated[Session, Depends(get_db_session)]    
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)]
 ) -> AuthSuccessResponse:
     """
     Endpoint to login users.
@@ -93,12 +108,13 @@ async def login_for_access_token(
     Args:
         form_data: Data containing username and password.
         session: Database session.
+        password_hasher: Process pool verifying passwords.
         
     Returns:
         AuthSuccessResponse: Response containing access token.
     """
     try:
-        user = await authenticate_user(form_data.username, form_data.password, session)
+        user = await authenticate_user(form_data.username, form_data.password, session, password_hasher)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -116,7 +132,18 @@ async def login_for_access_token(
             message="Login successful.",
             data=response
         )
-    
+
+    except PasswordHasherBusy as e:
+        logger.warning(f"Rejecting login: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, retry shortly.",
+            headers={"Retry-After": "1"}
+        )
+
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.exception(f"Error while logging user {form_data.username}: {e}")
         raise HTTPException(
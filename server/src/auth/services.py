@@ -2,15 +2,17 @@ from typing import Any
 from jwt import PyJWTError
 from sqlalchemy import select
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from fastapi.security.oauth2 import OAuth2PasswordBearer
 
 from src.user.models import User
 from src.core.config import settings
+from src.auth.cache import auth_cache
 from src.auth.schemas import TokenType, TokenData
 from src.user.schemas import UserDto, UserCreateDto
-from src.auth.utils import encode_jwt, decode_jwt, get_password_hash, verify_password
+from src.auth.hashing import PasswordHasher
+from src.auth.utils import encode_jwt, decode_jwt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
@@ -52,7 +54,8 @@ async def create_refresh_token(data: dict[str, Any]) -> str:
 
 async def create_user(
     user_data: UserCreateDto,
-    session: Session
+    session: AsyncSession,
+    password_hasher: PasswordHasher
 ) -> UserDto:
     """
     Creates user with the given data.
@@ -60,11 +63,12 @@ async def create_user(
     Args:
         user_data: Data for creating user.
         session: Database session.
+        password_hasher: Process pool hashing the password.
 
     Returns:
         UserDto: Created user.
     """
-    password_hash = get_password_hash(user_data.password)
+    password_hash = await password_hasher.hash(user_data.password)
 
     user = User(
         username=user_data.username,
@@ -77,22 +81,28 @@ async def create_user(
     )
 
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
 
     return UserDto.model_validate(user)
 
 async def authenticate_user(
     username_or_email: str, 
     password: str, 
-    session: Session
+    session: AsyncSession,
+    password_hasher: PasswordHasher
 ) -> UserDto | None:
     """
     Authenticates user using credentials.
 
+    A password hash made with outdated settings is replaced after a
+    successful login, so the bcrypt cost can be raised without a reset.
+
     Args:
         username_or_email: Identifier used for authentication.
         password: Password to be validated.
+        session: Database session.
+        password_hasher: Process pool verifying the password.
 
     Returns:
         UserDto | None: User is returned if authenticated succeeds else None.
@@ -102,12 +112,17 @@ async def authenticate_user(
     else:
         query = select(User).where(User.username == username_or_email)
 
-    user = session.scalars(query).first()
+    user = (await session.scalars(query)).first()
     if not user:
         return None
     
-    if not verify_password(password, user.password_hash):
+    verified, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not verified:
         return None
+
+    if new_hash:
+        user.password_hash = new_hash
+        await session.commit()
     
     return UserDto.model_validate(user)
 
@@ -118,6 +133,9 @@ async def verify_token(
     """
     Verifies given token and returns encoded payload if valid.
 
+    Tokens verified before are answered from the auth cache without
+    checking the signature again.
+
     Args:
         token: Token to verify.
         expected_token_type: Type of the token.
@@ -125,6 +143,12 @@ async def verify_token(
     Returns:
         TokenData | None: Data is returned if valid else None.
     """
+    cached = auth_cache.get_token(token)
+    if cached is not None:
+        if cached.token_type != expected_token_type.value:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token type mismatch.")
+        return TokenData(sub=cached.sub)
+
     try:
         payload = decode_jwt(
             token, 
@@ -140,6 +164,7 @@ async def verify_token(
         if not user_id:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token payload missing user ID.")
 
+        auth_cache.set_token(token, token_type, user_id, payload["exp"])
         return TokenData(sub=user_id)
 
     except (PyJWTError, KeyError):
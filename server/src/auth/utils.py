@@ -4,9 +4,18 @@ from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from datetime import UTC, datetime, timedelta
 
+from src.core.config import settings
 from src.auth.schemas import TokenType
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes with any other number of rounds than configured, fewer or more,
+# are flagged by `needs_update` and replaced on the next successful login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_HASH_ROUNDS
+)
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """
@@ -22,6 +31,20 @@ def verify_password(password: str, hashed_password: str) -> bool:
     """ 
     return  pwd_context.verify(password, hashed_password)
 
+def verify_and_update_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifies a password and rehashes it if its hash is outdated.
+
+    Args:
+        password: Plain password to verify.
+        hashed_password: Hashed password to verify against.
+
+    Returns:
+        tuple[bool, str | None]: True if password matches with hash, and
+            the new hash when the old one needs an update.
+    """
+    return pwd_context.verify_and_update(password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     """
     Hashes a password.
@@ -0,0 +1,123 @@
+import asyncio
+import hashlib
+from typing import Callable
+from dataclasses import dataclass
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import logger
+from src.coach.schemas import ScenarioResponse
+from src.coach.services import get_all_scenarios
+from src.core.invalidation import InvalidationBackend
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Serialized scenario list with the entity tag identifying its content."""
+    body: bytes
+    etag: str
+
+class ScenarioCatalog:
+    """
+    In-process cache of the serialized scenario list.
+
+    The response body is built once per change and served as bytes. Writes
+    to scenarios invalidate it through a backend that reaches every worker.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession], backend: InvalidationBackend) -> None:
+        """
+        Args:
+            session_factory: Creates database sessions to load scenarios.
+            backend: Broadcasts invalidations between workers.
+        """
+        self.session_factory = session_factory
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._snapshot: CatalogSnapshot | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Starts receiving invalidations from other workers."""
+        await self.backend.start(self._clear)
+
+    async def stop(self) -> None:
+        """Stops receiving invalidations."""
+        await self.backend.stop()
+
+    async def _clear(self) -> None:
+        """Drops the cached snapshot."""
+        self._generation += 1
+        self._snapshot = None
+
+    async def invalidate(self) -> None:
+        """Drops the cached snapshot in every worker, to be called after scenarios change."""
+        await self.backend.publish()
+
+    async def get(self) -> CatalogSnapshot:
+        """
+        Returns the current snapshot, loading it when the cache is empty.
+
+        Concurrent misses share a single load.
+
+        Returns:
+            CatalogSnapshot: Serialized scenarios and their entity tag.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+
+        async with self._lock:
+            if self._snapshot is not None:
+                self.hits += 1
+                return self._snapshot
+
+            self.misses += 1
+            generation = self._generation
+            async with self.session_factory() as session:
+                scenarios = await get_all_scenarios(session)
+
+            body = ScenarioResponse(
+                message="Scenarios fetched successfully.",
+                data=scenarios
+            ).model_dump_json().encode()
+            snapshot = CatalogSnapshot(body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+            # An invalidation during the load may describe a change the load missed.
+            if generation == self._generation:
+                self._snapshot = snapshot
+            logger.debug(f"Loaded scenario catalog {snapshot.etag} with {len(scenarios)} scenarios.")
+
+            return snapshot
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Reports cache usage.
+
+        Returns:
+            dict[str, int | float]: Hits, misses and hit rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Checks an If-None-Match header against an entity tag, using weak comparison.
+
+    Args:
+        if_none_match: Header value sent by the client.
+        etag: Current entity tag.
+
+    Returns:
+        bool: True when the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
@@ -0,0 +1,192 @@
+import asyncio
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
+
+from src.core.logging import logger
+from src.coach.models import MessageSource
+from src.coach.schemas import MessageDto
+from src.coach.services import summarize_messages
+
+MESSAGE_OVERHEAD_TOKENS = 4
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the token count of a text without running a tokenizer.
+
+    English averages about four characters per token for the tokenizers of
+    common chat models, which is close enough to budget a prompt.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        int: Estimated number of tokens.
+    """
+    return (len(text) + 3) // 4
+
+def estimate_message_tokens(message: BaseMessage) -> int:
+    """
+    Estimates the tokens a message takes in a prompt, including role markers.
+
+    Args:
+        message: Chat message.
+
+    Returns:
+        int: Estimated number of tokens.
+    """
+    return estimate_tokens(str(message.content)) + MESSAGE_OVERHEAD_TOKENS
+
+def to_chat_message(message: MessageDto) -> BaseMessage:
+    """
+    Converts a stored message into a chat message for the model.
+
+    Args:
+        message: Stored message.
+
+    Returns:
+        BaseMessage: Human message for the user, AI message for the coach.
+    """
+    if message.source == MessageSource.USER:
+        return HumanMessage(content=message.content)
+    return AIMessage(content=message.content)
+
+class ConversationContext:
+    """
+    Bounded context of a coach conversation.
+
+    The prompt sent to the model is the system prompt, a running summary of
+    older turns and the most recent turns, trimmed to a token budget. Turns
+    leaving the recent window are folded into the summary by a background
+    task and stay in the prompt until the summary includes them, so the
+    prompt size and the reply latency stay flat however long the session runs.
+    """
+
+    def __init__(
+        self,
+        model: BaseChatModel,
+        system_prompt: str,
+        token_budget: int = 3000,
+        recent_turns: int = 6,
+        summary_max_words: int = 150
+    ) -> None:
+        """
+        Args:
+            model: Model writing the summary.
+            system_prompt: Instructions and scenario of the conversation.
+            token_budget: Largest estimated prompt size.
+            recent_turns: User and coach message pairs kept verbatim.
+            summary_max_words: Length limit of the summary.
+        """
+        self.model = model
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.recent_size = 2 * recent_turns
+        self.summary_max_words = summary_max_words
+
+        self.summary = ""
+        self.recent: list[BaseMessage] = []
+        self._unsummarized: list[BaseMessage] = []
+        self._summarizer: asyncio.Task | None = None
+
+    def add_user_message(self, content: str) -> None:
+        """
+        Adds a message spoken by the user.
+
+        Args:
+            content: Transcribed message.
+        """
+        self._add(HumanMessage(content=content))
+
+    def add_ai_message(self, content: str) -> None:
+        """
+        Adds a reply of the coach.
+
+        Args:
+            content: Reply text.
+        """
+        self._add(AIMessage(content=content))
+
+    def load(self, messages: list[BaseMessage], summary: str = "") -> None:
+        """
+        Restores the context of a resumed conversation.
+
+        Args:
+            messages: Latest messages of the conversation, oldest first.
+            summary: Summary of the messages before them, if known.
+        """
+        self.summary = summary
+        for message in messages:
+            self._add(message)
+
+    def _add(self, message: BaseMessage) -> None:
+        """
+        Appends a message and hands the turns leaving the recent window to the summarizer.
+
+        Args:
+            message: Message to add.
+        """
+        self.recent.append(message)
+        if len(self.recent) <= self.recent_size:
+            return
+
+        overflow = len(self.recent) - self.recent_size
+        self._unsummarized.extend(self.recent[:overflow])
+        del self.recent[:overflow]
+
+        if self._summarizer is None or self._summarizer.done():
+            self._summarizer = asyncio.create_task(self._summarize())
+
+    async def _summarize(self) -> None:
+        """Folds the unsummarized messages into the summary until none are left."""
+        while self._unsummarized:
+            folded = list(self._unsummarized)
+            try:
+                self.summary = await summarize_messages(
+                    self.summary,
+                    folded,
+                    self.model,
+                    self.summary_max_words
+                )
+            except Exception as e:
+                logger.error(f"Error while summarizing conversation, keeping {len(folded)} turns verbatim: {e}")
+                return
+
+            del self._unsummarized[:len(folded)]
+
+    def build(self, user_message: str | None = None) -> list[BaseMessage]:
+        """
+        Assembles the prompt for the next reply.
+
+        The oldest messages are dropped first when the budget is exceeded,
+        the latest message is always kept.
+
+        Args:
+            user_message: Message to reply to that is not added yet, so a
+                reply that fails leaves no unanswered turn behind.
+
+        Returns:
+            list[BaseMessage]: System message followed by the conversation.
+        """
+        system_content = self.system_prompt
+        if self.summary:
+            system_content += f"\n\n### Conversation so far:\n{self.summary}"
+        system = SystemMessage(content=system_content)
+
+        conversation = self._unsummarized + self.recent
+        if user_message is not None:
+            conversation.append(HumanMessage(content=user_message))
+        sizes = [estimate_message_tokens(message) for message in conversation]
+        total = estimate_message_tokens(system) + sum(sizes)
+
+        start = 0
+        while total > self.token_budget and start < len(conversation) - 1:
+            total -= sizes[start]
+            start += 1
+
+        return [system, *conversation[start:]]
+
+    def close(self) -> None:
+        """Stops a pending summary update."""
+        if self._summarizer is not None:
+            self._summarizer.cancel()
+            self._summarizer = None
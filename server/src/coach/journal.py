@@ -0,0 +1,368 @@
+import os
+import json
+import fcntl
+import asyncio
+from uuid import uuid4
+from pathlib import Path
+from typing import Callable, TextIO
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import logger
+from src.core.database import is_transient_error
+from src.coach.services import save_messages
+from src.coach.schemas import MessageCreateDto
+
+JOURNAL_SUFFIX = ".journal"
+
+class MessageJournal:
+    """
+    Append-only file recording coach messages until they are saved in Postgres.
+
+    Every worker owns one journal and holds an exclusive lock on it, so a
+    journal whose lock can be taken belongs to a worker that died. Appends
+    are buffered and made durable by a single fsync shared by all messages
+    written within the sync interval. Saved messages are acknowledged, and
+    the file is truncated whenever everything in it has been saved. While
+    some messages stay unsaved, the file is compacted once the saved part
+    outgrows a threshold: the unsaved messages are copied to a new journal
+    and the old one is removed.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        sync_interval_ms: int = 20,
+        compact_bytes: int = 4 * 1024 * 1024
+    ) -> None:
+        """
+        Args:
+            directory: Directory holding the journals of all workers.
+            sync_interval_ms: Time appends wait to share an fsync.
+            compact_bytes: Size of saved messages and acknowledgements that triggers a compaction.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sync_interval = sync_interval_ms / 1000
+        self.compact_bytes = compact_bytes
+        self.path, self._file = self._create()
+
+        self.last_seq = 0
+        self.acked_seq = 0
+        self.compactions = 0
+        self._size = 0
+        # Size of the line of every message not saved yet, by sequence number.
+        self._unacked: dict[int, int] = {}
+        self._unacked_size = 0
+        self._compact_at = compact_bytes
+        self._synced: asyncio.Future[None] | None = None
+
+    def _create(self) -> tuple[Path, TextIO]:
+        """
+        Creates a journal file and locks it.
+
+        Returns:
+            tuple[Path, TextIO]: Path of the file and the file opened for appends.
+        """
+        # Journals kept for a later replay must not be reopened by a worker reusing the pid.
+        path = self.directory / f"{os.getpid()}-{uuid4().hex[:8]}{JOURNAL_SUFFIX}"
+        file = open(path, "a", encoding="utf-8")
+        fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return path, file
+
+    async def append(self, create_dto: MessageCreateDto) -> int:
+        """
+        Writes a message to the journal and waits until it is on disk.
+
+        Args:
+            create_dto: Message to record, with its id set.
+
+        Returns:
+            int: Sequence number to acknowledge once the message is saved.
+
+        Raises:
+            OSError: The message could not be written or synced, the journal
+                no longer waits for it to be acknowledged.
+        """
+        seq = self.last_seq + 1
+        line = json.dumps({"seq": seq, "message": create_dto.model_dump(mode="json")}) + "\n"
+        self._file.write(line)
+        self.last_seq = seq
+        self._size += len(line)
+        self._unacked[seq] = len(line)
+        self._unacked_size += len(line)
+
+        if self._synced is None:
+            self._synced = asyncio.get_running_loop().create_future()
+            asyncio.create_task(self._sync(self._synced))
+
+        try:
+            await asyncio.shield(self._synced)
+        except OSError:
+            self.acknowledge([seq])
+            raise
+
+        return seq
+
+    async def _sync(self, synced: asyncio.Future[None]) -> None:
+        """
+        Flushes every append made within the sync interval with one fsync.
+
+        Args:
+            synced: Future the waiting appends are resolved through.
+        """
+        await asyncio.sleep(self.sync_interval)
+        self._synced = None
+
+        try:
+            self._file.flush()
+            await asyncio.to_thread(os.fsync, self._file.fileno())
+            synced.set_result(None)
+        except Exception as e:
+            logger.error(f"Error while syncing message journal {self.path}: {e}")
+            synced.set_exception(e)
+
+    def acknowledge(self, seqs: list[int]) -> None:
+        """
+        Marks messages as saved.
+
+        Only the contiguous prefix of saved messages is recorded, so a message
+        that was saved out of order never hides an earlier unsaved one.
+        Acknowledgements are not synced, losing one only means the messages
+        are saved again on replay, which skips rows that already exist.
+
+        Args:
+            seqs: Sequence numbers of the saved messages.
+        """
+        for seq in seqs:
+            self._unacked_size -= self._unacked.pop(seq, 0)
+        while self.acked_seq < self.last_seq and self.acked_seq + 1 not in self._unacked:
+            self.acked_seq += 1
+
+        if not self._unacked:
+            self._file.truncate(0)
+            self._size = 0
+        elif self._size - self._unacked_size >= self._compact_at:
+            self._compact()
+        else:
+            line = json.dumps({"ack": self.acked_seq}) + "\n"
+            self._file.write(line)
+            self._size += len(line)
+
+    def _compact(self) -> None:
+        """
+        Copies the unsaved messages to a new journal and removes the old one.
+
+        A crash in between leaves both journals, which are replayed without
+        saving a message twice. Runs synchronously so no append lands in the
+        old journal once it is copied.
+        """
+        self._file.flush()
+        path, file = self._create()
+        size = 0
+        try:
+            with open(self.path, encoding="utf-8") as old:
+                for line in old:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("seq") in self._unacked:
+                        file.write(line)
+                        size += len(line)
+
+            file.flush()
+            os.fsync(file.fileno())
+        except OSError as e:
+            logger.error(f"Error while compacting message journal {self.path}, keeping it: {e}")
+            file.close()
+            path.unlink(missing_ok=True)
+            # Not retried on every acknowledgement while the disk is failing.
+            self._compact_at = 2 * (self._size - self._unacked_size)
+            return
+
+        self.path.unlink(missing_ok=True)
+        self._file.close()
+        self.path, self._file, self._size = path, file, size
+        self._compact_at = self.compact_bytes
+        self.compactions += 1
+
+    def read(self, seqs: list[int]) -> dict[int, MessageCreateDto]:
+        """
+        Reads messages back from the journal.
+
+        Reads synchronously so no append or acknowledgement lands mid-read,
+        the journal is kept small by acknowledgements.
+
+        Args:
+            seqs: Sequence numbers of the messages.
+
+        Returns:
+            dict[int, MessageCreateDto]: Messages found in the journal, by sequence number.
+        """
+        wanted = set(seqs)
+        messages: dict[int, MessageCreateDto] = {}
+        self._file.flush()
+
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if record.get("seq") in wanted:
+                    messages[record["seq"]] = MessageCreateDto.model_validate(record["message"])
+
+        return messages
+
+    def close(self) -> None:
+        """Closes the journal, removing it when everything in it was saved."""
+        self._file.flush()
+        if not self._unacked:
+            self.path.unlink(missing_ok=True)
+        self._file.close()
+
+def read_unsaved_messages(path: Path) -> list[MessageCreateDto]:
+    """
+    Parses a journal and returns the messages that were never acknowledged.
+
+    A torn last line left by a crash mid-write is ignored.
+
+    Args:
+        path: Journal file.
+
+    Returns:
+        list[MessageCreateDto]: Unsaved messages in the order they were sent.
+    """
+    entries: dict[int, dict] = {}
+    acked_seq = 0
+
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping corrupt line in message journal {path}.")
+                continue
+
+            if "ack" in record:
+                acked_seq = max(acked_seq, record["ack"])
+            else:
+                entries[record["seq"]] = record["message"]
+
+    return [
+        MessageCreateDto.model_validate(message)
+        for seq, message in sorted(entries.items())
+        if seq > acked_seq
+    ]
+
+async def save_replayed_messages(
+    messages: list[MessageCreateDto],
+    session_factory: Callable[[], AsyncSession]
+) -> int:
+    """
+    Saves the messages of a journal, dropping those the database rejects.
+
+    Args:
+        messages: Unsaved messages of one journal.
+        session_factory: Creates database sessions to save messages.
+
+    Returns:
+        int: Number of saved messages.
+
+    Raises:
+        Exception: A transient database error, the journal should be kept.
+    """
+    try:
+        async with session_factory() as session:
+            return await save_messages(messages, session)
+    except Exception as e:
+        if is_transient_error(e):
+            raise
+        if len(messages) == 1:
+            logger.error(
+                f"Dropping journaled message {messages[0].id} of conversation "
+                f"{messages[0].conversation_id} rejected by the database: {e}"
+            )
+            return 0
+
+    saved = 0
+    for message in messages:
+        saved += await save_replayed_messages([message], session_factory)
+    return saved
+
+async def replay_journals(
+    directory: str | Path,
+    session_factory: Callable[[], AsyncSession]
+) -> int:
+    """
+    Saves the unsaved messages of journals left behind by dead workers.
+
+    Journals still locked by a running worker are skipped. A replayed
+    journal is removed once its messages are saved, messages the database
+    rejects are dropped. A journal that cannot be read is kept and logged.
+
+    Args:
+        directory: Directory holding the journals.
+        session_factory: Creates database sessions to save messages.
+
+    Returns:
+        int: Number of messages replayed.
+
+    Raises:
+        Exception: A transient database error. Journals not replayed yet are
+            kept for the next attempt.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return 0
+
+    replayed = 0
+    for path in sorted(directory.glob(f"*{JOURNAL_SUFFIX}")):
+        with open(path, "a", encoding="utf-8") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+
+            try:
+                messages = await asyncio.to_thread(read_unsaved_messages, path)
+                replayed += await save_replayed_messages(messages, session_factory)
+            except Exception as e:
+                if is_transient_error(e):
+                    raise
+                logger.error(f"Keeping message journal {path.name} that could not be replayed: {e}")
+                continue
+
+            path.unlink()
+
+        if messages:
+            logger.info(f"Replayed {len(messages)} unsaved messages from {path.name}.")
+
+    return replayed
+
+async def replay_journals_until_done(
+    directory: str | Path,
+    session_factory: Callable[[], AsyncSession],
+    retry_delay_seconds: float = 30.0
+) -> None:
+    """
+    Replays journals left behind by dead workers, retrying while the database is unavailable.
+
+    Meant to run as a background task so startup does not wait on the database.
+
+    Args:
+        directory: Directory holding the journals.
+        session_factory: Creates database sessions to save messages.
+        retry_delay_seconds: Pause before retrying after a failed replay.
+    """
+    while True:
+        try:
+            replayed = await replay_journals(directory, session_factory)
+        except Exception as e:
+            logger.error(f"Replaying coach message journals failed, retrying in {retry_delay_seconds:.0f} s: {e}")
+            await asyncio.sleep(retry_delay_seconds)
+            continue
+
+        logger.info(f"Replayed {replayed} unsaved coach messages from journals.")
+        return
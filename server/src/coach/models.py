@@ -1,7 +1,7 @@
 from enum import Enum
 from uuid import UUID, uuid4
 from datetime import datetime
-from sqlalchemy import Enum as SQLEnum, func, ForeignKey
+from sqlalchemy import Enum as SQLEnum, func, ForeignKey, Index, desc
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PGUUID, TIMESTAMP, TEXT
 
@@ -37,6 +37,10 @@ class Message(Base):
 
     conversation: Mapped["Conversation"] = relationship(back_populates="messages")
 
+    __table_args__ = (
+        Index("ix_messages_conversation_id_sent_at", "conversation_id", "sent_at"),
+    )
+
 class Conversation(Base):
     __tablename__ = "conversations"
 
@@ -57,3 +61,7 @@ class Conversation(Base):
         back_populates="conversation",
         cascade="all, delete-orphan"
     )
+
+    __table_args__ = (
+        Index("ix_conversations_user_id_updated_at", "user_id", desc("updated_at")),
+    )
@@ -0,0 +1,260 @@
+import asyncio
+from uuid import uuid4
+from typing import Callable
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import logger
+from src.core.database import is_transient_error
+from src.coach.services import save_messages
+from src.coach.journal import MessageJournal
+from src.coach.schemas import MessageCreateDto
+
+class MessageWriter:
+    """
+    Write-behind queue persisting coach messages as they are sent.
+
+    Sessions enqueue each turn without waiting for the database, and a
+    background task saves whatever has accumulated in bulk. With a journal,
+    each message is on local disk before `submit` returns and survives a
+    crash of the worker, otherwise at most one flush interval is lost.
+
+    Transient errors are retried a few times with an exponential backoff.
+    A batch that still fails is left in the journal, when there is one, and
+    read back once the queue has drained, otherwise it is dropped. A message
+    already in the journal is left there as well when the queue is full, so
+    `submit` only blocks when the journal is off. Messages the database
+    rejects, for instance because their conversation is gone, are logged
+    and dropped so they cannot hold up the queue.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        journal: MessageJournal | None = None,
+        max_queue_size: int = 10000,
+        max_batch_size: int = 200,
+        flush_interval_ms: int = 500,
+        max_retries: int = 5,
+        retry_delay_seconds: float = 1.0,
+        max_retry_delay_seconds: float = 30.0
+    ) -> None:
+        """
+        Args:
+            session_factory: Creates database sessions to save messages.
+            journal: Journal recording messages until they are saved.
+            max_queue_size: Messages held in memory before `submit` leaves them
+                in the journal, or blocks without one.
+            max_batch_size: Largest number of messages saved in one statement.
+            flush_interval_ms: Time to wait for more messages after the first one of a batch.
+            max_retries: Retries of a batch after transient errors before giving up on it.
+            retry_delay_seconds: Pause before the first retry, doubled after every failure.
+            max_retry_delay_seconds: Longest pause between retries.
+        """
+        self.session_factory = session_factory
+        self.journal = journal
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay_seconds
+        self.max_retry_delay = max_retry_delay_seconds
+        self.saved = 0
+        self.dropped = 0
+        self.unjournaled = 0
+        self._queue: asyncio.Queue[tuple[MessageCreateDto, int]] = asyncio.Queue(max_queue_size)
+        # Journaled messages that are not in the queue, read back from the journal once it drains.
+        self._spilled: set[int] = set()
+        # Transient failures in a row, shared by batches so an outage is not hammered by each of them.
+        self._failures = 0
+        self._drainer: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        """Messages waiting to be saved."""
+        return self._queue.qsize() + len(self._spilled)
+
+    def start(self) -> None:
+        """Starts the background drain, must be called from within the event loop."""
+        if self._drainer is None:
+            self._drainer = asyncio.create_task(self._drain())
+
+    async def submit(self, create_dto: MessageCreateDto) -> None:
+        """
+        Queues a message to be saved, waiting for the journal.
+
+        The message is given an id so replaying the journal cannot save it
+        twice. When the queue is full, a journaled message is only kept in
+        the journal, a message without one waits for room in the queue. A
+        message the journal fails to write is kept in memory only, so a
+        failing disk does not end the session.
+
+        Args:
+            create_dto: Data to create the message.
+        """
+        if create_dto.id is None:
+            create_dto = create_dto.model_copy(update={"id": uuid4()})
+
+        seq = 0
+        if self.journal:
+            try:
+                seq = await self.journal.append(create_dto)
+            except OSError as e:
+                self.unjournaled += 1
+                logger.error(f"Error while journaling message {create_dto.id}, keeping it in memory only: {e}")
+
+        if seq and self._queue.full():
+            self._spilled.add(seq)
+            return
+
+        await self._queue.put((create_dto, seq))
+
+    def _requeue_spilled(self) -> None:
+        """Reads messages left in the journal back into the queue, as many as fit."""
+        room = self._queue.maxsize - self._queue.qsize() if self._queue.maxsize else len(self._spilled)
+        seqs = sorted(self._spilled)[:room]
+        try:
+            messages = self.journal.read(seqs)
+        except OSError as e:
+            logger.error(f"Error while reading messages back from journal {self.journal.path}: {e}")
+            return
+        self._spilled.difference_update(seqs)
+
+        for seq in seqs:
+            if seq in messages:
+                self._queue.put_nowait((messages[seq], seq))
+            else:
+                self.dropped += 1
+                logger.error(f"Dropping message {seq} that could not be read back from journal {self.journal.path}.")
+
+    def _retry_delay(self) -> float:
+        """Pause before the next retry, doubling with every failure in a row."""
+        return min(self.retry_delay * 2 ** min(self._failures - 1, 16), self.max_retry_delay)
+
+    def _give_up(self, batch: list[tuple[MessageCreateDto, int]], error: Exception) -> None:
+        """
+        Stops retrying a batch, leaving journaled messages for later and dropping the others.
+
+        Args:
+            batch: Messages that could not be saved with their journal sequence numbers.
+            error: Last transient error.
+        """
+        journaled = [seq for _, seq in batch if seq]
+        self._spilled.update(journaled)
+        self.dropped += len(batch) - len(journaled)
+
+        if journaled:
+            logger.error(
+                f"Giving up on saving {len(batch)} messages after {self.max_retries} retries, "
+                f"{len(journaled)} are left in the journal: {error}"
+            )
+        else:
+            logger.error(f"Dropping {len(batch)} messages not saved after {self.max_retries} retries: {error}")
+
+    async def _next_batch(self) -> list[tuple[MessageCreateDto, int]]:
+        """
+        Waits for a message, then collects those arriving within the flush interval.
+
+        Returns:
+            list[tuple[MessageCreateDto, int]]: Messages with their journal
+                sequence numbers, in the order they were submitted.
+        """
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _save(self, batch: list[tuple[MessageCreateDto, int]]) -> None:
+        """
+        Saves a batch and acknowledges it in the journal.
+
+        Transient errors are retried up to `max_retries` times. When the
+        batch is rejected, its messages are saved one by one so a single
+        bad message does not take the others down with it.
+
+        Args:
+            batch: Messages to save with their journal sequence numbers.
+        """
+        retries = 0
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    self.saved += await save_messages([dto for dto, _ in batch], session)
+                self._failures = 0
+                break
+
+            except Exception as e:
+                if is_transient_error(e):
+                    self._failures += 1
+                    if retries == self.max_retries:
+                        self._give_up(batch, e)
+                        return
+
+                    retries += 1
+                    delay = self._retry_delay()
+                    logger.error(f"Error while saving {len(batch)} messages, retrying in {delay:.1f} s: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+
+                if len(batch) > 1:
+                    for item in batch:
+                        await self._save([item])
+                    return
+
+                dto, _ = batch[0]
+                self.dropped += 1
+                logger.error(
+                    f"Dropping message {dto.id} of conversation {dto.conversation_id} rejected by the database: {e}"
+                )
+                break
+
+        seqs = [seq for _, seq in batch if seq]
+        if seqs:
+            self.journal.acknowledge(seqs)
+
+    async def _drain(self) -> None:
+        """Saves queued messages in batches until cancelled."""
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._save(batch)
+            finally:
+                # Before the batch is done, so `flush` cannot return while messages are left in the journal.
+                if self._spilled and self._queue.empty():
+                    self._requeue_spilled()
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def flush(self) -> None:
+        """Waits until every message submitted so far is saved."""
+        await self._queue.join()
+
+    async def shutdown(self, timeout_seconds: float = 10.0) -> None:
+        """
+        Saves the remaining messages and stops the background drain.
+
+        Args:
+            timeout_seconds: Time given to the final flush before pending messages are dropped.
+        """
+        if self._drainer is None:
+            return
+
+        try:
+            await asyncio.wait_for(self.flush(), timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.error(f"{self.pending} messages were not saved before shutdown.")
+
+        self._drainer.cancel()
+        await asyncio.gather(self._drainer, return_exceptions=True)
+        self._drainer = None
+
+        if self.journal:
+            self.journal.close()
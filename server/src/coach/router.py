@@ -1,10 +1,8 @@
 import io
 from uuid import UUID
+from datetime import datetime, timezone
 from typing import Annotated
-from sqlalchemy.orm import Session
-from faster_whisper import WhisperModel
-from langchain.memory import ConversationBufferMemory
-from langchain_core.messages import HumanMessage, AIMessage
+from sqlalchemy.ext.asyncio import AsyncSession
 from langchain_core.language_models.chat_models import BaseChatModel
 from fastapi import (
     status,
@@ -12,30 +10,57 @@ from fastapi import (
     WebSocket, 
     WebSocketDisconnect,
     HTTPException,
-    Depends
+    Depends,
+    Query,
+    Header,
+    Response
 )
 
 from src.core.logging import logger
+from src.core.database import AsyncSessionLocal
+from src.core.config import settings
 from src.core.metadata import ApiTags
+from src.core.pagination import encode_cursor, decode_cursor
+from src.core.audio_buffer import AudioBuffer, AudioBufferOverflow
 from src.coach.models import MessageSource
-from src.assistant.services import get_transcription
-from src.core.dependencies import get_db_session, get_groq_model, get_whisper_model
+from src.coach.persistence import MessageWriter
+from src.coach.context import ConversationContext, to_chat_message
+from src.coach.catalog import ScenarioCatalog, etag_matches
+from src.core.transcription import TranscriptionExecutor, TranscriptionQueueFull
+from src.core.scheduler import SchedulerBusy, SchedulerSession
+from src.health.services import reject_while_warming
+from src.core.dependencies import (
+    get_db_session,
+    get_coach_model,
+    get_summary_model,
+    get_coach_transcription_executor,
+    get_message_writer,
+    get_optional_ws_user_id,
+    get_scenario_catalog,
+    get_scheduler_session
+)
 from src.coach.services import (
-    get_all_conversations_for_user,
+    get_conversations_page,
     create_conversation, 
-    get_all_scenarios,
     create_scenario, 
     update_scenario,
     generate_reply,
-    save_message  
+    save_messages,
+    get_conversation,
+    get_conversation_scenario,
+    build_coach_system_prompt,
+    get_messages_page
 )
 from src.coach.schemas import (
     ConversationCreateDto,
     ConversationResponse,
+    ConversationPageResponse,
     ScenarioCreateDto, 
     ScenarioUpdateDto,
     ScenarioResponse,
-    MessageCreateDto
+    MessageDto,
+    MessageCreateDto,
+    MessagePageResponse
 )
 
 router = APIRouter(
@@ -43,26 +68,40 @@ router = APIRouter(
     prefix="/coach"
 )
 
-@router.get("/conversation/user/{user_id}", status_code=status.HTTP_200_OK, response_model=ConversationResponse)
+@router.get("/conversation/user/{user_id}", status_code=status.HTTP_200_OK, response_model=ConversationPageResponse)
 async def fetch_all_conversations_for_user(
     user_id: UUID,
-    session: Annotated[Session, Depends(get_db_session)]
-) -> ConversationResponse: 
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    before: str | None = None,
+    include_stats: bool = False
+) -> ConversationPageResponse: 
     """
-    Fetches all conversations for a user.
+    Fetches a page of conversations for a user, most recently updated first.
 
     Args:
         user_id: Id of the user.
         session: Database session.
+        limit: Maximum number of conversations.
+        before: Cursor returned with the previous page, None for the latest conversations.
+        include_stats: Whether to add message count and last message preview.
 
     Returns:
-        ConversationResponse: Message and fetched conversations.
+        ConversationPageResponse: Message, fetched conversations and the cursor of the next page.
     """
+    position = decode_cursor(before) if before else None
+
     try:
-        conversations = await get_all_conversations_for_user(user_id, session)
-        return ConversationResponse(
-            message="Conversation created successfully.",
-            data=conversations
+        conversations = await get_conversations_page(user_id, session, limit + 1, position, include_stats)
+        next_cursor = None
+        if len(conversations) > limit:
+            conversations = conversations[:limit]
+            next_cursor = encode_cursor(conversations[-1].updated_at, conversations[-1].id)
+
+        return ConversationPageResponse(
+            message="Conversations fetched successfully.",
+            data=conversations,
+            next_cursor=next_cursor
         )
     
     except Exception as e:
@@ -75,7 +114,7 @@ async def fetch_all_conversations_for_user(
 @router.post("/conversation", status_code=status.HTTP_201_CREATED, response_model=ConversationResponse)
 async def create_conversation_endpoint(
     create_dto: ConversationCreateDto, 
-    session: Annotated[Session, Depends(get_db_session)]
+    session: Annotated[AsyncSession, Depends(get_db_session)]
 ) -> ConversationResponse:
     """
     Endpoint to create a conversation.
@@ -100,23 +139,71 @@ async def create_conversation_endpoint(
             detail="Internal Server Error."
         )
 
+@router.get(
+    "/conversation/{conversation_id}/messages",
+    status_code=status.HTTP_200_OK,
+    response_model=MessagePageResponse
+)
+async def fetch_conversation_messages(
+    conversation_id: UUID,
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    limit: Annotated[int, Query(ge=1, le=200)] = 50,
+    before: str | None = None
+) -> MessagePageResponse:
+    """
+    Fetches a page of messages of a conversation, newest first.
+
+    Args:
+        conversation_id: Id of the conversation.
+        session: Database session.
+        limit: Maximum number of messages.
+        before: Cursor returned with the previous page, None for the latest messages.
+
+    Returns:
+        MessagePageResponse: Message, fetched messages and the cursor of the next page.
+    """
+    position = decode_cursor(before) if before else None
+
+    try:
+        messages = await get_messages_page(conversation_id, session, limit + 1, position)
+        next_cursor = None
+        if len(messages) > limit:
+            messages = messages[:limit]
+            next_cursor = encode_cursor(messages[-1].sent_at, messages[-1].id)
+
+        return MessagePageResponse(
+            message="Messages fetched successfully.",
+            data=messages,
+            next_cursor=next_cursor
+        )
+
+    except Exception as e:
+        logger.error(f"Error while fetching messages for conversation {conversation_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error."
+        )
+
 @router.get("/scenario", status_code=status.HTTP_200_OK, response_model=ScenarioResponse)
-async def fetch_all_scenarios(session: Annotated[Session, Depends(get_db_session)]) -> ScenarioResponse:
+async def fetch_all_scenarios(
+    scenario_catalog: Annotated[ScenarioCatalog, Depends(get_scenario_catalog)],
+    if_none_match: Annotated[str | None, Header()] = None
+) -> Response:
     """
     Endpoint to fetch all scenarios.
 
+    Served from the scenario catalog cache. Clients revalidate with
+    If-None-Match and get 304 while the scenarios are unchanged.
+
     Args:   
-        session: Database session.
+        scenario_catalog: Cached scenario list.
+        if_none_match: Entity tag of the client's copy.
 
     Returns:
-        ScenarioResponse: Message and fetched scenarios.
+        Response: Serialized scenarios, or 304 when the client's copy is current.
     """
     try:
-        scenarios =  await get_all_scenarios(session)
-        return ScenarioResponse(
-            message="Scenarios fetched successfully.",
-            data=scenarios
-        )
+        snapshot = await scenario_catalog.get()
 
     except Exception as e:
         logger.error(f"Error while fetching scenarios: {e}")
@@ -125,10 +212,20 @@ async def fetch_all_scenarios(session: Annotated[Session, Depends(get_db_session
             detail="Internal Server Error."
         )
 
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": f"public, max-age={settings.SCENARIO_CACHE_MAX_AGE_SECONDS}"
+    }
+    if etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
 @router.post("/scenario", status_code=status.HTTP_201_CREATED, response_model=ScenarioResponse)
 async def create_scenario_endpoint(
     create_dto: ScenarioCreateDto,
-    session: Annotated[Session, Depends(get_db_session)]    
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    scenario_catalog: Annotated[ScenarioCatalog, Depends(get_scenario_catalog)]
 ) -> ScenarioResponse:
     """
     Endpoint to create a scenario.
@@ -141,6 +238,7 @@ async def create_scenario_endpoint(
     """
     try:
         scenario = await create_scenario(create_dto, session)
+        await scenario_catalog.invalidate()
         return ScenarioResponse(
             message="Scenario created successfully.",
             data=scenario
@@ -157,7 +255,8 @@ async def create_scenario_endpoint(
 async def update_scenario_endpoint(
     scenario_id: UUID, 
     update_dto: ScenarioUpdateDto,
-    session: Annotated[Session, Depends(get_db_session)]  
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+    scenario_catalog: Annotated[ScenarioCatalog, Depends(get_scenario_catalog)]
 ) -> ScenarioResponse: 
     """
     Endpoint to update scenario.
@@ -172,6 +271,7 @@ async def update_scenario_endpoint(
     """
     try:
         updated_scenario = await update_scenario(scenario_id, update_dto, session)
+        await scenario_catalog.invalidate()
         return ScenarioResponse(
             message="Scenario updated succesfully.",
             data=updated_scenario
@@ -188,54 +288,147 @@ async def update_scenario_endpoint(
 @router.websocket("/ws/chat")
 async def conversation_coach_chat(
     websocket: WebSocket,
-    whisper_model: Annotated[WhisperModel, Depends(get_whisper_model)],
-    groq_model: Annotated[BaseChatModel, Depends(get_groq_model)],
-    session: Annotated[Session, Depends(get_db_session)]
+    transcription_executor: Annotated[TranscriptionExecutor | None, Depends(get_coach_transcription_executor)],
+    coach_model: Annotated[BaseChatModel | None, Depends(get_coach_model)],
+    summary_model: Annotated[BaseChatModel | None, Depends(get_summary_model)],
+    message_writer: Annotated[MessageWriter | None, Depends(get_message_writer)],
+    user_id: Annotated[str | None, Depends(get_optional_ws_user_id)],
+    scheduler_session: Annotated[SchedulerSession, Depends(get_scheduler_session)]
 ):
     """
     Websocket endpoint for audio chat.
 
+    The socket does not hold a database connection while it is open: the
+    conversation is read in one short session when it starts, and saving
+    uses its own sessions.
+
+    The client authenticates with the `token` query parameter and opens
+    with the id of its conversation. Anonymous clients, unknown ids and
+    conversations of another user close the socket with 1008 (policy
+    violation) before any history is read. A resumed conversation starts from
+    its latest turns only. Turns are handed to the write-behind queue as
+    they happen when it is enabled, otherwise the whole conversation is
+    saved in bulk on disconnect.
+    Transcriptions share the fair scheduler with the assistant, and the
+    client is sent `SERVER_BUSY` when its utterance is shed. Clients
+    connecting while the models are still loading are sent a
+    `WarmingFrame` and the socket is closed with 1013 (try again later).
+
     Args:
         websocket: Websocket object.
     """
     await websocket.accept()
+    if (
+        transcription_executor is None
+        or coach_model is None
+        or summary_model is None
+        or not await transcription_executor.ready()
+    ):
+        await reject_while_warming(websocket)
+        return
 
     first_msg = await websocket.receive_text()
-    conversation_id = UUID(first_msg)
-
-    memory = ConversationBufferMemory(return_messages=True)
-
-    buffer = b""
+    try:
+        conversation_id = UUID(first_msg)
+    except ValueError:
+        conversation_id = None
+
+    allowed = False
+    scenario = None
+    history: list[MessageDto] = []
+    if conversation_id is not None and user_id is not None:
+        # One short session for every startup read, released before the first audio frame.
+        async with AsyncSessionLocal() as session:
+            conversation = await get_conversation(conversation_id, session)
+            allowed = conversation is not None and str(conversation.user_id) == user_id
+            if allowed:
+                scenario = await get_conversation_scenario(conversation_id, session)
+                # A turn is one user and one bot message.
+                history = await get_messages_page(conversation_id, session, 2 * settings.COACH_CONTEXT_RECENT_TURNS)
+
+    if not allowed:
+        logger.warning(f"Closing websocket: conversation {first_msg!r} is unknown or not owned by user {user_id}.")
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    context = ConversationContext(
+        summary_model,
+        build_coach_system_prompt(scenario),
+        token_budget=settings.COACH_CONTEXT_TOKEN_BUDGET,
+        recent_turns=settings.COACH_CONTEXT_RECENT_TURNS,
+        summary_max_words=settings.COACH_SUMMARY_MAX_WORDS
+    )
+    context.load([to_chat_message(message) for message in reversed(history)])
+
+    buffer = AudioBuffer(settings.AUDIO_BUFFER_MAX_BYTES)
+    unsaved: list[MessageCreateDto] = []
+
+    async def record(source: MessageSource, content: str, sent_at: datetime | None = None) -> None:
+        create_dto = MessageCreateDto(
+            source=source,
+            conversation_id=conversation_id,
+            content=content,
+            sent_at=sent_at or datetime.now(timezone.utc)
+        )
+        if message_writer is not None:
+            await message_writer.submit(create_dto)
+        else:
+            unsaved.append(create_dto)
 
     try:
         while True:
             message = await websocket.receive()
 
-            if "bytes" in message:
-                buffer += message["bytes"]
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
 
-            elif message.get("text") == "END_AUDIO":
-                audio = io.BytesIO(buffer)
+            if message.get("bytes") is not None:
+                buffer.append(message["bytes"])
 
-                user_text = get_transcription(audio, whisper_model, beam_size=1)
-                memory.chat_memory.add_user_message(user_text)
-
-                bot_text = await generate_reply(memory.chat_memory.messages, groq_model)
-                memory.chat_memory.add_ai_message(bot_text)
+            elif message.get("text") == "END_AUDIO":
+                spoken_at = datetime.now(timezone.utc)
+                audio = io.BytesIO(buffer.view())
+                buffer.clear()
+
+                try:
+                    user_text = await scheduler_session.run(
+                        lambda: transcription_executor.transcribe_async(audio)
+                    )
+                except (SchedulerBusy, TranscriptionQueueFull) as e:
+                    logger.warning(f"Transcription shed, asking client to retry: {e}")
+                    await websocket.send_text("SERVER_BUSY")
+                    continue
+
+                try:
+                    bot_text = await generate_reply(context.build(user_text), coach_model)
+                except TimeoutError:
+                    # Neither kept nor saved, the client sends the turn again.
+                    logger.warning("Coach reply missed its deadline, asking client to retry.")
+                    await websocket.send_text("SERVER_BUSY")
+                    continue
+
+                context.add_user_message(user_text)
+                await record(MessageSource.USER, user_text, spoken_at)
+                context.add_ai_message(bot_text)
+                await record(MessageSource.BOT, bot_text)
 
                 await websocket.send_text(bot_text)
 
-                buffer = b""
+    except AudioBufferOverflow as e:
+        logger.warning(f"Closing websocket: {e}")
+        await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG)
 
     except WebSocketDisconnect: 
         logger.info(f"Websocket connection closed.")
+        await websocket.close()
 
-        for msg in memory.chat_memory.messages:
-            create_dto = MessageCreateDto(
-                source=MessageSource.USER if isinstance(msg, HumanMessage) else MessageSource.BOT,
-                conversation_id=conversation_id,
-                content=msg.content
-            )
-            _ = await save_message(create_dto, session)
+    finally:
+        context.close()
 
-        await websocket.close()
+        # Saved however the session ended, an overflow or an error loses no turn.
+        if unsaved:
+            try:
+                async with AsyncSessionLocal() as session:
+                    await save_messages(unsaved, session)
+            except Exception as e:
+                logger.error(f"Error while saving {len(unsaved)} messages of conversation {conversation_id}: {e}")
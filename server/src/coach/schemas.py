@@ -20,10 +20,19 @@ class ConversationCreateDto(BaseModel):
     user_id: UUID
     scenario_id: UUID | None = None
 
+class ConversationSummaryDto(ConversationDto):
+    message_count: int | None = None
+    last_message: str | None = None
+
 class ConversationResponse(BaseModel):
     message: str
     data: ConversationDto | list[ConversationDto]
 
+class ConversationPageResponse(BaseModel):
+    message: str
+    data: list[ConversationSummaryDto]
+    next_cursor: str | None = None
+
 class ScenarioDto(BaseModel):
     id: UUID
     title: str
@@ -59,10 +68,17 @@ class MessageDto(BaseModel):
     )
 
 class MessageCreateDto(BaseModel):
+    id: UUID | None = None
     source: MessageSource
     conversation_id: UUID
     content: str
+    sent_at: datetime | None = None
 
 class MessageResponse(BaseModel):
     message: str
-    data: MessageDto | list[MessageDto]
\ No newline at end of file
+    data: MessageDto | list[MessageDto]
+
+class MessagePageResponse(BaseModel):
+    message: str
+    data: list[MessageDto]
+    next_cursor: str | None = None
\ No newline at end of file
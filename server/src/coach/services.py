@@ -1,15 +1,18 @@
-from uuid import UUID
-from sqlalchemy import select
-from sqlalchemy.orm import Session
-from langchain_core.messages import HumanMessage, AIMessage
-from langchain_core.chat_history import BaseChatMessageHistory
+from uuid import UUID, uuid4
+from datetime import datetime
+from sqlalchemy import Select, select, update, func, tuple_, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 
 from src.core.database import get_by_id_or_404
-from src.coach.models import Conversation, Scenario, Message
+from src.coach.models import Conversation, Scenario, Message, MessageSource
 from src.coach.schemas import (
     ConversationCreateDto, 
     ConversationDto,
+    ConversationSummaryDto,
     ScenarioCreateDto,
     ScenarioUpdateDto,
     ScenarioDto,
@@ -17,24 +20,92 @@ from src.coach.schemas import (
     MessageDto
 )
 
-async def get_all_conversations_for_user(user_id: UUID, session: Session) -> list[ConversationDto]:
+LAST_MESSAGE_PREVIEW_CHARS = 120
+
+def conversations_page_query(
+    user_id: UUID,
+    limit: int = 20,
+    before: tuple[datetime, UUID] | None = None,
+    include_stats: bool = False
+) -> Select:
+    """
+    Builds the statement of `get_conversations_page`.
+
+    Only the listed columns are selected. With stats, the message count and
+    a preview of the last message are joined laterally onto the page in the
+    same query, so they are computed for the returned rows only.
+
+    Args:
+        user_id: Id of the user.
+        limit: Maximum number of conversations.
+        before: `(updated_at, id)` of the last conversation already fetched, None for the latest.
+        include_stats: Whether to add message count and last message preview.
+
+    Returns:
+        Select: Statement returning the page, most recently updated first.
+    """
+    page = select(
+        Conversation.id,
+        Conversation.user_id,
+        Conversation.scenario_id,
+        Conversation.created_at,
+        Conversation.updated_at
+    ).where(Conversation.user_id == user_id)
+    if before is not None:
+        page = page.where(tuple_(Conversation.updated_at, Conversation.id) < before)
+    page = page.order_by(Conversation.updated_at.desc(), Conversation.id.desc()).limit(limit)
+
+    if not include_stats:
+        return page
+
+    page = page.subquery()
+    message_count = (
+        select(func.count().label("message_count"))
+        .where(Message.conversation_id == page.c.id)
+        .lateral()
+    )
+    last_message = (
+        select(func.left(Message.content, LAST_MESSAGE_PREVIEW_CHARS).label("last_message"))
+        .where(Message.conversation_id == page.c.id)
+        .order_by(Message.sent_at.desc())
+        .limit(1)
+        .lateral()
+    )
+    return (
+        select(page, message_count.c.message_count, last_message.c.last_message)
+        .select_from(page)
+        .join(message_count, true())
+        .outerjoin(last_message, true())
+        .order_by(page.c.updated_at.desc(), page.c.id.desc())
+    )
+
+async def get_conversations_page(
+    user_id: UUID,
+    session: AsyncSession,
+    limit: int = 20,
+    before: tuple[datetime, UUID] | None = None,
+    include_stats: bool = False
+) -> list[ConversationSummaryDto]:
     """
-    Fetches all conversations for an user.
+    Fetches the most recently updated conversations of a user before a keyset position.
 
     Args:
         user_id: Id of the user.
         session: Database session.
+        limit: Maximum number of conversations.
+        before: `(updated_at, id)` of the last conversation already fetched, None for the latest.
+        include_stats: Whether to add message count and last message preview.
 
     Returns:
-        list[Conversation]: List of conversations.
+        list[ConversationSummaryDto]: Conversations, most recently updated first.
     """
-    query = select(Conversation).where(Conversation.user_id == user_id)
-    conversations = session.execute(query).scalars().all()
-    return [ConversationDto.model_validate(conv) for conv in conversations]
+    query = conversations_page_query(user_id, limit, before, include_stats)
+    rows = (await session.execute(query)).mappings().all()
+    return [ConversationSummaryDto.model_validate(dict(row)) for row in rows]
 
 async def create_conversation(
     create_dto: ConversationCreateDto,
-    session: Session
+    session: AsyncSession
 ) -> ConversationDto:
     """
     Creates a conversation and stores it in database.
@@ -51,12 +122,12 @@ async def create_conversation(
         scenario_id=create_dto.scenario_id
     )
     session.add(conversation)
-    session.commit()
-    session.refresh(conversation)
+    await session.commit()
+    await session.refresh(conversation)
 
     return ConversationDto.model_validate(conversation)
 
-async def get_all_scenarios(session: Session) -> list[ScenarioDto]:
+async def get_all_scenarios(session: AsyncSession) -> list[ScenarioDto]:
     """
     Fetches all scenarios.
 
@@ -67,12 +138,12 @@ async def get_all_scenarios(session: Session) -> list[ScenarioDto]:
         list[ScenarioDto]: List of scenarios.
     """
     query = select(Scenario)
-    scenarios = session.execute(query).scalars().all()
+    scenarios = (await session.scalars(query)).all()
     return [ScenarioDto.model_validate(s) for s in scenarios]
 
 async def create_scenario(
     create_dto: ScenarioCreateDto, 
-    session: Session
+    session: AsyncSession
 ) -> ScenarioDto:
     """
     Creates a scenario and stores it in database.
@@ -90,15 +161,15 @@ async def create_scenario(
     )
 
     session.add(scenario)
-    session.commit()
-    session.refresh(scenario)
+    await session.commit()
+    await session.refresh(scenario)
 
     return ScenarioDto.model_validate(scenario)
 
 async def update_scenario(
     scenario_id: UUID,
     update_dto: ScenarioUpdateDto,
-    session: Session
+    session: AsyncSession
 ) -> ScenarioDto:
     """
     Updates a scenario.
@@ -111,20 +182,20 @@ async def update_scenario(
     Returns:
         ScenarioDto: Updated scenario.
     """
-    scenario_to_update = get_by_id_or_404(Scenario, scenario_id, session)
+    scenario_to_update = await get_by_id_or_404(Scenario, scenario_id, session)
 
     update_dict = update_dto.model_dump(exclude_unset=True)
     for field, value in update_dict.items():
         setattr(scenario_to_update, field, value)
 
-    session.commit()
-    session.refresh(scenario_to_update)
+    await session.commit()
+    await session.refresh(scenario_to_update)
 
     return ScenarioDto.model_validate(scenario_to_update)
 
 async def save_message(
     create_dto: MessageCreateDto, 
-    session: Session
+    session: AsyncSession
 ) -> MessageDto:
     """
     Saves message in database.
@@ -137,26 +208,261 @@ async def save_message(
         MessageDto: Created message.
     """
     message = Message(
+        id=create_dto.id or uuid4(),
         source=create_dto.source,
         conversation_id=create_dto.conversation_id,
         content=create_dto.content
     )
+    if create_dto.sent_at is not None:
+        message.sent_at = create_dto.sent_at
     
     session.add(message)
-    session.commit()
-    session.refresh(message)
+    await session.commit()
+    await session.refresh(message)
 
     return MessageDto.model_validate(message)
 
+async def save_messages(
+    create_dtos: list[MessageCreateDto],
+    session: AsyncSession
+) -> int:
+    """
+    Saves many messages in a single insert statement and transaction.
+
+    Messages without `sent_at` are stamped with the transaction time. Messages
+    whose id already exists are skipped, so saving the same batch twice is safe.
+    The conversations are marked as updated, keeping them ordered by activity.
+
+    Args:
+        create_dtos: Data to create messages, in the order they were sent.
+        session: Database session.
+
+    Returns:
+        int: Number of saved messages.
+    """
+    if not create_dtos:
+        return 0
+
+    query = insert(Message).values([
+        {
+            "id": dto.id or uuid4(),
+            "source": dto.source,
+            "conversation_id": dto.conversation_id,
+            "content": dto.content,
+            "sent_at": dto.sent_at if dto.sent_at is not None else func.now()
+        }
+        for dto in create_dtos
+    ]).on_conflict_do_nothing(index_elements=[Message.id])
+    touch = (
+        update(Conversation)
+        .where(Conversation.id.in_({dto.conversation_id for dto in create_dtos}))
+        .values(updated_at=func.now())
+    )
+
+    await session.execute(query)
+    await session.execute(touch)
+    await session.commit()
+
+    return len(create_dtos)
+
+def messages_page_query(
+    conversation_id: UUID,
+    limit: int = 50,
+    before: tuple[datetime, UUID] | None = None
+) -> Select:
+    """
+    Builds the statement of `get_messages_page`.
+
+    Uses the `(conversation_id, sent_at)` index, so the cost of a page does
+    not depend on how long the conversation is.
+
+    Args:
+        conversation_id: Id of the conversation.
+        limit: Maximum number of messages.
+        before: `(sent_at, id)` of the oldest message already fetched, None for the latest.
+
+    Returns:
+        Select: Statement returning the page, newest first.
+    """
+    query = select(Message).where(Message.conversation_id == conversation_id)
+    if before is not None:
+        query = query.where(tuple_(Message.sent_at, Message.id) < before)
+
+    return query.order_by(Message.sent_at.desc(), Message.id.desc()).limit(limit)
+
+async def get_messages_page(
+    conversation_id: UUID,
+    session: AsyncSession,
+    limit: int = 50,
+    before: tuple[datetime, UUID] | None = None
+) -> list[MessageDto]:
+    """
+    Fetches the latest messages of a conversation sent before a keyset position.
+
+    Args:
+        conversation_id: Id of the conversation.
+        session: Database session.
+        limit: Maximum number of messages.
+        before: `(sent_at, id)` of the oldest message already fetched, None for the latest.
+
+    Returns:
+        list[MessageDto]: Messages, newest first.
+    """
+    messages = (await session.scalars(messages_page_query(conversation_id, limit, before))).all()
+    return [MessageDto.model_validate(message) for message in messages]
+
+def recent_user_messages_query(user_id: UUID, limit: int = 2000) -> Select:
+    """
+    Builds the statement of `get_recent_user_message_texts`.
+
+    Args:
+        user_id: Id of the user.
+        limit: Maximum number of messages.
+
+    Returns:
+        Select: Statement returning message contents, newest first.
+    """
+    return (
+        select(Message.content)
+        .join(Conversation, Message.conversation_id == Conversation.id)
+        .where(Conversation.user_id == user_id, Message.source == MessageSource.USER)
+        .order_by(Message.sent_at.desc())
+        .limit(limit)
+    )
+
+async def get_recent_user_message_texts(
+    user_id: UUID,
+    session: AsyncSession,
+    limit: int = 2000
+) -> list[str]:
+    """
+    Fetches the latest messages a user has spoken across all conversations.
+
+    Args:
+        user_id: Id of the user.
+        session: Database session.
+        limit: Maximum number of messages.
+
+    Returns:
+        list[str]: Message contents, newest first.
+    """
+    return list((await session.scalars(recent_user_messages_query(user_id, limit))).all())
+
+async def get_conversation(conversation_id: UUID, session: AsyncSession) -> ConversationDto | None:
+    """
+    Fetches a conversation by id.
+
+    Args:
+        conversation_id: Id of the conversation.
+        session: Database session.
+
+    Returns:
+        ConversationDto | None: Conversation, or None when it does not exist.
+    """
+    conversation = await session.get(Conversation, conversation_id)
+    return ConversationDto.model_validate(conversation) if conversation else None
+
+async def get_conversation_scenario(conversation_id: UUID, session: AsyncSession) -> ScenarioDto | None:
+    """
+    Fetches the scenario a conversation practices.
+
+    Args:
+        conversation_id: Id of the conversation.
+        session: Database session.
+
+    Returns:
+        ScenarioDto | None: Scenario, or None for free conversations.
+    """
+    query = (
+        select(Scenario)
+        .join(Conversation, Conversation.scenario_id == Scenario.id)
+        .where(Conversation.id == conversation_id)
+    )
+    scenario = await session.scalar(query)
+    return ScenarioDto.model_validate(scenario) if scenario else None
+
+COACH_SYSTEM_PROMPT = """
+### Role:
+You are a patient and encouraging **conversation partner** helping a person who stutters practice speaking.
+
+### Guidelines:
+- Keep replies short and natural, one to three sentences, so the user does most of the talking.
+- Never comment on or correct disfluencies, repetitions or filler words in the user's speech.
+- Ask open questions that keep the conversation going.
+"""
+
+def build_coach_system_prompt(scenario: ScenarioDto | None) -> str:
+    """
+    Builds the system prompt of a coach conversation.
+
+    Args:
+        scenario: Scenario being practiced, if any.
+
+    Returns:
+        str: System prompt, including the scenario to role-play.
+    """
+    if scenario is None:
+        return COACH_SYSTEM_PROMPT
+
+    return (
+        f"{COACH_SYSTEM_PROMPT}\n### Scenario:\n"
+        f"Play your part in the following scenario: {scenario.title}.\n"
+        f"{scenario.description or ''}"
+    ).strip()
+
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        "You maintain a running summary of a practice conversation between a user and a coach. "
+        "Update the summary with the new lines, keeping names, facts and open questions. "
+        "Respond only with the updated summary, in at most {max_words} words."
+    ),
+    ("human", "Current summary:\n{summary}\n\nNew lines:\n{lines}")
+])
+
+async def summarize_messages(
+    summary: str,
+    messages: list[BaseMessage],
+    model: BaseChatModel,
+    max_words: int = 150
+) -> str:
+    """
+    Folds messages into a running conversation summary.
+
+    Only the new messages are sent along with the previous summary, so the
+    cost of an update does not grow with the length of the conversation.
+
+    Args:
+        summary: Summary of the conversation so far, empty at first.
+        messages: Messages to add to the summary.
+        model: Model writing the summary.
+        max_words: Length limit of the summary.
+
+    Returns:
+        str: Updated summary.
+    """
+    lines = "\n".join(
+        f"{'User' if isinstance(message, HumanMessage) else 'Coach'}: {message.content}"
+        for message in messages
+    )
+
+    summary_chain = SUMMARY_PROMPT | model
+    response = await summary_chain.ainvoke({
+        "summary": summary or "(empty)",
+        "lines": lines,
+        "max_words": max_words
+    })
+    return response.content.strip()
+
 async def generate_reply(
-    message_history: BaseChatMessageHistory, 
+    message_history: list[BaseMessage], 
     model: BaseChatModel
 ) -> str:
     """
     Generates reply for the latest message in the message history.
     
     Args:
-        message_history: Entire history of the conversation.
+        message_history: Context of the conversation, ending with the user's message.
 
     Returns:
         str: Reply generated by the model.
@@ -0,0 +1,79 @@
+class AudioBufferOverflow(Exception):
+    """Raised when appending to an audio buffer would exceed its size limit."""
+
+class AudioBuffer:
+    """
+    Growable byte buffer for audio received over websockets.
+
+    Storage is preallocated and doubled when full, so appends are amortized
+    O(1) instead of copying the whole buffer like `bytes` concatenation.
+    """
+
+    def __init__(self, max_size: int, initial_capacity: int = 64 * 1024) -> None:
+        """
+        Args:
+            max_size: Largest number of bytes the buffer may hold.
+            initial_capacity: Bytes preallocated up front.
+        """
+        self.max_size = max_size
+        self._data = bytearray(min(initial_capacity, max_size))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, chunk: bytes) -> None:
+        """
+        Copies a chunk at the end of the buffer.
+
+        Args:
+            chunk: Bytes to append.
+
+        Raises:
+            AudioBufferOverflow: When the buffer would grow past `max_size`.
+        """
+        end = self._size + len(chunk)
+        if end > self.max_size:
+            raise AudioBufferOverflow(f"Audio buffer limit of {self.max_size} bytes exceeded.")
+
+        if end > len(self._data):
+            # A new array is allocated rather than resized in place, so views
+            # handed out earlier stay valid.
+            capacity = min(max(end, len(self._data) * 2), self.max_size)
+            grown = bytearray(capacity)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+        self._data[self._size:end] = chunk
+        self._size = end
+
+    def view(self, end: int | None = None) -> memoryview:
+        """
+        Exposes the buffered bytes without copying them.
+
+        The view is only valid until the buffer is next modified.
+
+        Args:
+            end: Number of bytes to expose, all of them by default.
+
+        Returns:
+            memoryview: View over the buffered bytes.
+        """
+        end = self._size if end is None else min(end, self._size)
+        return memoryview(self._data)[:end]
+
+    def consume(self, count: int) -> None:
+        """
+        Drops bytes from the front of the buffer, keeping the rest.
+
+        Args:
+            count: Number of bytes to drop.
+        """
+        count = min(count, self._size)
+        remaining = self._size - count
+        self._data[:remaining] = self._data[count:self._size]
+        self._size = remaining
+
+    def clear(self) -> None:
+        """Empties the buffer, keeping its storage for reuse."""
+        self._size = 0
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class TTLCache(Generic[K, V]):
+    """
+    Size-bounded LRU cache whose entries also expire after a fixed time.
+
+    Not thread-safe, meant to be used from the event loop.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        """
+        Args:
+            max_size: Number of entries kept before the least recently used is evicted.
+            ttl_seconds: Lifetime of an entry.
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """
+        Looks up an entry, counting the hit or miss.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            V | None: Cached value, or None when missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Stores an entry, evicting the least recently used ones if full.
+
+        Args:
+            key: Key of the entry.
+            value: Value to cache.
+        """
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """
+        Removes an entry.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            V | None: Removed value, or None if it was not cached.
+        """
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        """Removes every entry."""
+        self._entries.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Reports cache usage.
+
+        Returns:
+            dict[str, int | float]: Size, hits, misses and hit rate.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate
+        }
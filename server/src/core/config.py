@@ -1,6 +1,15 @@
-from pydantic import SecretStr, Field
+from typing import Literal
+from pydantic import BaseModel, SecretStr, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+class WhisperProfile(BaseModel):
+    """Whisper model and decoding settings used by a route."""
+    model_size: str = "base.en"
+    compute_type: str = "int8"
+    cpu_threads: int = 0
+    num_workers: int = 2
+    beam_size: int = 1
+
 class Settings(BaseSettings):
     """Parses type-safe environment variables."""
     LOG_LEVEL: str
@@ -9,19 +18,113 @@ class Settings(BaseSettings):
     MIN_SILENCE_LEN: int
     SILENCE_THRESHOLD: int
 
+    TRANSCRIPTION_WORKERS: int = 2
+    TRANSCRIPTION_QUEUE_SIZE: int = 8
+    TRANSCRIPTION_BATCH_WINDOW_MS: int = 10
+    TRANSCRIPTION_MAX_BATCH_SIZE: int = 8
+    TRANSCRIPTION_BACKEND: Literal["local", "remote"] = "local"
+    TRANSCRIPTION_WORKER_SOCKET_DIR: str = "run/transcription"
+    TRANSCRIPTION_WORKER_PROCESSES: int = 1
+    TRANSCRIPTION_REMOTE_MAX_PENDING: int = 32
+    TRANSCRIPTION_REMOTE_TIMEOUT_SECONDS: float = 30.0
+
+    WHISPER_PROFILES: dict[str, WhisperProfile] = Field(default_factory=lambda: {
+        "fast": WhisperProfile(model_size="base.en", cpu_threads=2, beam_size=1),
+        "accurate": WhisperProfile(model_size="small.en", cpu_threads=4, beam_size=5)
+    })
+    ASSISTANT_WHISPER_PROFILE: str = "fast"
+    COACH_WHISPER_PROFILE: str = "accurate"
+
+    SCHEDULER_MAX_CONCURRENCY: int = 4
+    SCHEDULER_QUEUE_SIZE: int = 32
+    SCHEDULER_MAX_WAIT_MS: int = 1500
+    SCHEDULER_SESSION_RATE: float = 3.0
+    SCHEDULER_SESSION_BURST: int = 6
+    SCHEDULER_ANONYMOUS_WEIGHT: float = 0.5
+
+    AUDIO_BUFFER_MAX_BYTES: int = 8 * 1024 * 1024
+
+    STREAMING_MAX_WINDOW_SECONDS: float = 15.0
+    STREAMING_OVERLAP_SECONDS: float = 1.0
+    STREAMING_MAX_BACKLOG_SECONDS: float = 3.0
+
+    VAD_BACKEND: Literal["off", "energy", "silero"] = "energy"
+    VAD_ENERGY_THRESHOLD: int = -45
+    VAD_HANGOVER_CHUNKS: int = 1
+
     GROQ_API_KEY: str
     GROQ_MODEL_NAME: str
 
+    LLM_MAX_CONCURRENCY: int = 32
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_MAX_RETRIES: int = 1
+    LLM_SUGGESTION_DEADLINE_MS: int = 2000
+    LLM_COACH_DEADLINE_MS: int = 15000
+    LLM_HEDGE_PERCENTILE: float = 95
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+
+    SUGGESTION_CACHE_TAIL_TOKENS: int = 6
+    SUGGESTION_CACHE_TTL_SECONDS: int = 900
+    SUGGESTION_CACHE_GLOBAL_SIZE: int = 4096
+    SUGGESTION_CACHE_USER_SIZE: int = 64
+    SUGGESTION_CORPUS_PATH: str | None = None
+    SUGGESTION_LLM_DEADLINE_MS: int = 800
+
+    COACH_CONTEXT_TOKEN_BUDGET: int = 3000
+    COACH_CONTEXT_RECENT_TURNS: int = 6
+    COACH_SUMMARY_MAX_WORDS: int = 150
+
+    SCENARIO_CACHE_MAX_AGE_SECONDS: int = 60
+    SCENARIO_CACHE_INVALIDATION: Literal["local", "file", "postgres"] = "local"
+    SCENARIO_CACHE_VERSION_FILE: str = "cache/scenarios.version"
+    SCENARIO_CACHE_POLL_INTERVAL_SECONDS: float = 2.0
+
     POSTGRES_URI: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    COACH_WRITE_BEHIND: bool = True
+    COACH_WRITE_QUEUE_SIZE: int = 10000
+    COACH_WRITE_BATCH_SIZE: int = 200
+    COACH_WRITE_FLUSH_INTERVAL_MS: int = 500
+    COACH_WRITE_MAX_RETRIES: int = 5
+    COACH_WRITE_MAX_RETRY_DELAY_SECONDS: float = 30.0
+    COACH_JOURNAL_DIR: str | None = "journal"
+    COACH_JOURNAL_SYNC_INTERVAL_MS: int = 20
+    COACH_JOURNAL_COMPACT_BYTES: int = 4 * 1024 * 1024
 
     ALGORITHM: str
     SECRET_KEY: SecretStr
     REFRESH_TOKEN_EXPIRES_DAYS: int
     ACCESS_TOKEN_EXPIRES_MINUTES: int
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    PASSWORD_HASH_ROUNDS: int = 12
+    AUTH_TOKEN_CACHE_SIZE: int = 4096
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = 300
+    AUTH_USER_CACHE_SIZE: int = 2048
+    AUTH_USER_CACHE_TTL_SECONDS: int = 30
     ALLOWED_ORIGINS: list[str] = Field(default_factory=list)
 
     model_config = SettingsConfigDict(
         env_file=(".env", ".env.local", ".env.production")
     )
 
+    @model_validator(mode="after")
+    def check_whisper_profiles(self) -> "Settings":
+        """Ensures every route selects a defined whisper profile."""
+        for profile in (self.ASSISTANT_WHISPER_PROFILE, self.COACH_WHISPER_PROFILE):
+            if profile not in self.WHISPER_PROFILES:
+                raise ValueError(f"Whisper profile {profile!r} is not defined in WHISPER_PROFILES.")
+        return self
+
+    @property
+    def whisper_profile_names(self) -> list[str]:
+        """Names of the whisper profiles selected by at least one route."""
+        return sorted({self.ASSISTANT_WHISPER_PROFILE, self.COACH_WHISPER_PROFILE})
+
 settings = Settings()
\ No newline at end of file
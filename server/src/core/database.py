@@ -1,26 +1,36 @@
 from uuid import UUID
 from typing import TypeVar, Type
+from sqlalchemy import select, make_url
 from fastapi import HTTPException, status
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
 from src.core.config import settings
 
 # Database globals for the entire application
-engine = create_engine(settings.POSTGRES_URI)
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+engine = create_async_engine(
+    make_url(settings.POSTGRES_URI).set(drivername="postgresql+asyncpg"),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING
+)
+AsyncSessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 # Helper function to create all tables
-def create_tables() -> None:
+async def create_tables() -> None:
     """Creates all the tables present in the Base metadata."""
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
 
 # Generic database operations
 T = TypeVar("T")  # Generic type for ORM models
 
-def get_by_id_or_404(model: Type[T], id: UUID, session: Session) -> T:
+async def get_by_id_or_404(model: Type[T], id: UUID, session: AsyncSession) -> T:
     """
     Generic function to fetch an entity by ID or raise 404.
 
@@ -35,7 +45,7 @@ def get_by_id_or_404(model: Type[T], id: UUID, session: Session) -> T:
     Raises:
         HTTPException: 404 if not found.
     """
-    instance = session.scalar(select(model).where(model.id == id))
+    instance = await session.scalar(select(model).where(model.id == id))
     if not instance:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{model.__name__} not found.")
     return instance
@@ -56,4 +66,18 @@ def assert_entity_identity_match(entity: T, actor: T) -> None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"{label} identity mismatch."
-        )
\ No newline at end of file
+        )
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Tells whether a database error may go away by itself, such as a lost connection.
+
+    Args:
+        error: Error raised by a statement.
+
+    Returns:
+        bool: Whether retrying the same statement later can succeed.
+    """
+    if isinstance(error, (OperationalError, InterfaceError, OSError, TimeoutError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
@@ -1,15 +1,24 @@
 from sqlalchemy import select
-from sqlalchemy.orm import Session
-from faster_whisper import WhisperModel
-from typing import Generator, Annotated
-from fastapi import Depends, HTTPException, WebSocket, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncGenerator, Annotated
+from fastapi import Depends, HTTPException, WebSocket, Request, status
+from fastapi.requests import HTTPConnection
 from langchain_core.language_models.chat_models import BaseChatModel
 
 from src.user.models import User
 from src.user.schemas import UserDto
 from src.auth.schemas import TokenType
-from src.core.database import SessionLocal
+from src.auth.cache import auth_cache
+from src.auth.hashing import PasswordHasher
+from src.core.database import AsyncSessionLocal
 from src.core.config import Settings, settings
+from src.assistant.cache import SuggestionCache
+from src.coach.catalog import ScenarioCatalog
+from src.coach.persistence import MessageWriter
+from src.assistant.predictor import PredictorStore
+from src.core.loader import ModelLoader
+from src.core.transcription import TranscriptionExecutor
+from src.core.scheduler import FairScheduler, SchedulerSession
 from src.auth.services import oauth2_scheme, verify_token
 
 def get_settings() -> Settings:
@@ -21,45 +30,138 @@ def get_settings() -> Settings:
     """
     return settings
 
-def get_db_session() -> Generator[Session, None, None]:
+async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency injector for database session.
 
     Yields:
-        Session: SQLAlchemy database session. 
+        AsyncSession: SQLAlchemy database session. 
     """
-    db = SessionLocal()
-
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-def get_whisper_model(ws: WebSocket) -> WhisperModel:
+def get_assistant_transcription_executor(ws: WebSocket) -> TranscriptionExecutor | None:
+    """
+    Dependency injector for the transcription executor of the speech assistant.
+
+    Returns:
+        TranscriptionExecutor | None: Executor of the assistant's whisper profile,
+            `None` while it is still loading.
+    """
+    return ws.app.state.models.transcription_executors.get(settings.ASSISTANT_WHISPER_PROFILE)
+
+def get_coach_transcription_executor(ws: WebSocket) -> TranscriptionExecutor | None:
     """
-    Dependency injector for whisper model.
+    Dependency injector for the transcription executor of the conversation coach.
 
     Returns:
-        WhisperModel: Instantiated model.
+        TranscriptionExecutor | None: Executor of the coach's whisper profile,
+            `None` while it is still loading.
     """
-    return ws.app.state.whisper_model
+    return ws.app.state.models.transcription_executors.get(settings.COACH_WHISPER_PROFILE)
 
-def get_groq_model(ws: WebSocket) -> BaseChatModel:
+def get_model_loader(request: Request) -> ModelLoader:
     """
-    Dependency injector for groq model.
+    Dependency injector for the background model loader.
 
     Returns:
-        BaseChatModel: Instantiated groq model.
+        ModelLoader: Loader holding every model of the application.
+    """
+    return request.app.state.models
+
+def get_scheduler(request: Request) -> FairScheduler:
     """
-    return ws.app.state.groq_model
+    Dependency injector for the scheduler of model calls.
+
+    Returns:
+        FairScheduler: Scheduler shared by all sessions.
+    """
+    return request.app.state.scheduler
+
+def get_suggestion_cache(conn: HTTPConnection) -> SuggestionCache:
+    """
+    Dependency injector for next word suggestion cache, for websockets and requests alike.
+
+    Returns:
+        SuggestionCache: Cache shared by all assistant sessions.
+    """
+    return conn.app.state.suggestion_cache
+
+def get_predictor_store(ws: WebSocket) -> PredictorStore:
+    """
+    Dependency injector for local next word predictors.
+
+    Returns:
+        PredictorStore: Predictors shared by all assistant sessions.
+    """
+    return ws.app.state.predictor_store
+
+def get_message_writer(ws: WebSocket) -> MessageWriter | None:
+    """
+    Dependency injector for the coach message write-behind queue.
+
+    Returns:
+        MessageWriter | None: Shared writer, or None when messages are saved on disconnect.
+    """
+    return ws.app.state.message_writer
+
+def get_password_hasher(request: Request) -> PasswordHasher:
+    """
+    Dependency injector for the password hashing pool.
+
+    Returns:
+        PasswordHasher: Process pool running bcrypt.
+    """
+    return request.app.state.password_hasher
+
+def get_scenario_catalog(request: Request) -> ScenarioCatalog:
+    """
+    Dependency injector for the scenario catalog cache.
+
+    Returns:
+        ScenarioCatalog: Cache of the serialized scenario list.
+    """
+    return request.app.state.scenario_catalog
+
+def get_suggestion_model(ws: WebSocket) -> BaseChatModel | None:
+    """
+    Dependency injector for the chat model generating word suggestions.
+
+    Returns:
+        BaseChatModel | None: Chat model bound to the suggestion deadline, `None`
+            while it is still loading.
+    """
+    return ws.app.state.models.suggestion_model
+
+def get_coach_model(ws: WebSocket) -> BaseChatModel | None:
+    """
+    Dependency injector for the chat model replying in coach conversations.
+
+    Returns:
+        BaseChatModel | None: Chat model bound to the coach deadline, `None`
+            while it is still loading.
+    """
+    return ws.app.state.models.coach_model
+
+def get_summary_model(ws: WebSocket) -> BaseChatModel | None:
+    """
+    Dependency injector for the chat model summarizing older coach turns.
+
+    Returns:
+        BaseChatModel | None: Chat model bound to the coach deadline, `None`
+            while it is still loading.
+    """
+    return ws.app.state.models.summary_model
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    session: Annotated[Session, Depends(get_db_session)]    
+    session: Annotated[AsyncSession, Depends(get_db_session)]    
 ) -> UserDto:
     """
     Dependency injector for the current user.
 
+    Users are served from the auth cache for a short time after they were loaded.
+
     Args:
         token: Bearer token from Authorization header.
         session: Database session.
@@ -77,8 +179,12 @@ async def get_current_user(
             detail="User is not authenticated."
         )
     
+    cached_user = auth_cache.get_user(token_data.sub)
+    if cached_user is not None:
+        return cached_user
+    
     query = select(User).where(User.id == token_data.sub)
-    user = session.scalars(query).first()
+    user = (await session.scalars(query)).first()
 
     if not user:
         raise HTTPException(
@@ -86,4 +192,51 @@ async def get_current_user(
             detail="User is not authenticated."
         )
     
-    return UserDto.model_validate(user)
+    user_dto = UserDto.model_validate(user)
+    auth_cache.set_user(user_dto)
+    return user_dto
+
+async def get_optional_ws_user_id(ws: WebSocket) -> str | None:
+    """
+    Dependency injector for the user of a websocket, when the client authenticates.
+
+    Browsers cannot set headers on websockets, so the access token is read
+    from the `token` query parameter.
+
+    Returns:
+        str | None: Id of the user, or None for anonymous or invalid tokens.
+    """
+    token = ws.query_params.get("token")
+    if not token:
+        return None
+
+    try:
+        token_data = await verify_token(token, TokenType.ACCESS)
+    except HTTPException:
+        return None
+
+    return token_data.sub if token_data else None
+
+async def get_scheduler_session(
+    ws: WebSocket,
+    user_id: Annotated[str | None, Depends(get_optional_ws_user_id)]
+) -> AsyncGenerator[SchedulerSession, None]:
+    """
+    Dependency injector for the scheduler session of a websocket.
+
+    Sessions of one user share that user's share of the scheduler, anonymous
+    sessions are each accounted separately with a reduced weight.
+
+    Yields:
+        SchedulerSession: Session registered for the lifetime of the websocket.
+    """
+    scheduler: FairScheduler = ws.app.state.scheduler
+    if user_id:
+        session = scheduler.open_session(user_id)
+    else:
+        session = scheduler.open_session(f"anonymous:{id(ws)}", settings.SCHEDULER_ANONYMOUS_WEIGHT)
+
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,125 @@
+import os
+import asyncio
+import asyncpg
+from time import time_ns
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from src.core.logging import logger
+
+InvalidationCallback = Callable[[], Awaitable[None]]
+
+class InvalidationBackend:
+    """
+    Broadcasts cache invalidations to every worker.
+
+    The base backend only reaches the current process, which is enough for
+    single worker deployments.
+    """
+
+    async def start(self, callback: InvalidationCallback) -> None:
+        """
+        Starts listening for invalidations published by other workers.
+
+        Args:
+            callback: Called whenever an invalidation is received.
+        """
+        self.callback = callback
+
+    async def publish(self) -> None:
+        """Notifies every worker, including this one, that the cached data changed."""
+        await self.callback()
+
+    async def stop(self) -> None:
+        """Stops listening."""
+
+class FileInvalidation(InvalidationBackend):
+    """
+    Shares invalidations through a version file polled by every worker.
+
+    Suited to several workers on one machine without extra infrastructure.
+    """
+
+    def __init__(self, path: str | Path, poll_interval_seconds: float = 2.0) -> None:
+        """
+        Args:
+            path: Version file, created if missing.
+            poll_interval_seconds: Time between checks of the file.
+        """
+        self.path = Path(path)
+        self.poll_interval = poll_interval_seconds
+        self._version: str | None = None
+        self._poller: asyncio.Task | None = None
+
+    def _read_version(self) -> str | None:
+        """Reads the current version, None when the file does not exist yet."""
+        try:
+            return self.path.read_text()
+        except FileNotFoundError:
+            return None
+
+    async def start(self, callback: InvalidationCallback) -> None:
+        await super().start(callback)
+        self._version = self._read_version()
+        self._poller = asyncio.create_task(self._poll())
+
+    async def _poll(self) -> None:
+        """Calls back whenever the version in the file changes."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            version = self._read_version()
+            if version != self._version:
+                self._version = version
+                await self.callback()
+
+    async def publish(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        version = f"{os.getpid()}-{time_ns()}"
+        temp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(version)
+        os.replace(temp_path, self.path)
+
+        self._version = version
+        await self.callback()
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+class PostgresInvalidation(InvalidationBackend):
+    """Shares invalidations through Postgres LISTEN/NOTIFY on a dedicated connection."""
+
+    def __init__(self, dsn: str, channel: str) -> None:
+        """
+        Args:
+            dsn: Postgres connection string understood by asyncpg.
+            channel: Notification channel.
+        """
+        self.dsn = dsn
+        self.channel = channel
+        self._connection: asyncpg.Connection | None = None
+
+    async def start(self, callback: InvalidationCallback) -> None:
+        await super().start(callback)
+        self._connection = await asyncpg.connect(self.dsn)
+        await self._connection.add_listener(self.channel, self._on_notification)
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        """Schedules the callback for a notification sent by any worker."""
+        asyncio.create_task(self.callback())
+
+    async def publish(self) -> None:
+        try:
+            await self._connection.execute("SELECT pg_notify($1, '')", self.channel)
+        except Exception as e:
+            logger.error(f"Error while publishing invalidation on {self.channel}: {e}")
+
+        # The notification reaches this worker asynchronously, invalidate now
+        # so its next read already sees the change.
+        await self.callback()
+
+    async def stop(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
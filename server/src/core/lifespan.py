@@ -1,10 +1,40 @@
+import asyncio
 from fastapi import FastAPI
-from faster_whisper import WhisperModel
+from sqlalchemy import make_url
 from contextlib import asynccontextmanager
-from langchain.chat_models import init_chat_model
 
 from src.core.logging import logger
 from src.core.config import settings
+from src.auth.cache import auth_cache
+from src.auth.hashing import PasswordHasher
+from src.core.database import engine, AsyncSessionLocal
+from src.assistant.cache import SuggestionCache
+from src.coach.persistence import MessageWriter
+from src.coach.catalog import ScenarioCatalog
+from src.core.invalidation import InvalidationBackend, FileInvalidation, PostgresInvalidation
+from src.coach.journal import MessageJournal, replay_journals_until_done
+from src.assistant.predictor import PredictorStore, DEFAULT_CORPUS_PATH
+from src.core.loader import ModelLoader
+from src.core.scheduler import FairScheduler
+
+def create_scenario_invalidation() -> InvalidationBackend:
+    """
+    Creates the invalidation backend of the scenario catalog selected in settings.
+
+    Returns:
+        InvalidationBackend: Backend reaching every worker of the deployment.
+    """
+    if settings.SCENARIO_CACHE_INVALIDATION == "file":
+        return FileInvalidation(
+            settings.SCENARIO_CACHE_VERSION_FILE,
+            settings.SCENARIO_CACHE_POLL_INTERVAL_SECONDS
+        )
+
+    if settings.SCENARIO_CACHE_INVALIDATION == "postgres":
+        dsn = make_url(settings.POSTGRES_URI).set(drivername="postgresql")
+        return PostgresInvalidation(dsn.render_as_string(hide_password=False), "scenario_catalog")
+
+    return InvalidationBackend()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -17,13 +47,58 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting FastAPI application...")
 
     try:
-        app.state.whisper_model = WhisperModel("base.en", compute_type="int8")
-        app.state.groq_model = init_chat_model(
-            settings.GROQ_MODEL_NAME, 
-            model_provider="groq", 
-            api_key=settings.GROQ_API_KEY
+        # Models load in the background so probes and light routes answer right away.
+        app.state.models = ModelLoader(settings.whisper_profile_names)
+        app.state.models.start()
+        app.state.scheduler = FairScheduler(
+            max_concurrency=settings.SCHEDULER_MAX_CONCURRENCY,
+            max_queue_size=settings.SCHEDULER_QUEUE_SIZE,
+            max_wait_ms=settings.SCHEDULER_MAX_WAIT_MS,
+            session_rate=settings.SCHEDULER_SESSION_RATE,
+            session_burst=settings.SCHEDULER_SESSION_BURST
+        )
+        app.state.suggestion_cache = SuggestionCache(
+            tail_tokens=settings.SUGGESTION_CACHE_TAIL_TOKENS,
+            ttl_seconds=settings.SUGGESTION_CACHE_TTL_SECONDS,
+            global_size=settings.SUGGESTION_CACHE_GLOBAL_SIZE,
+            user_size=settings.SUGGESTION_CACHE_USER_SIZE
         )
-        logger.info("Models loaded successfully.")
+        app.state.predictor_store = PredictorStore.from_corpus(
+            settings.SUGGESTION_CORPUS_PATH or DEFAULT_CORPUS_PATH,
+            AsyncSessionLocal
+        )
+        app.state.message_writer = None
+        app.state.journal_replay = None
+        if settings.COACH_WRITE_BEHIND:
+            journal = None
+            if settings.COACH_JOURNAL_DIR:
+                # Replayed in the background so a database outage does not hold up startup.
+                app.state.journal_replay = asyncio.create_task(
+                    replay_journals_until_done(settings.COACH_JOURNAL_DIR, AsyncSessionLocal)
+                )
+                journal = MessageJournal(
+                    settings.COACH_JOURNAL_DIR,
+                    settings.COACH_JOURNAL_SYNC_INTERVAL_MS,
+                    settings.COACH_JOURNAL_COMPACT_BYTES
+                )
+
+            app.state.message_writer = MessageWriter(
+                AsyncSessionLocal,
+                journal=journal,
+                max_queue_size=settings.COACH_WRITE_QUEUE_SIZE,
+                max_batch_size=settings.COACH_WRITE_BATCH_SIZE,
+                flush_interval_ms=settings.COACH_WRITE_FLUSH_INTERVAL_MS,
+                max_retries=settings.COACH_WRITE_MAX_RETRIES,
+                max_retry_delay_seconds=settings.COACH_WRITE_MAX_RETRY_DELAY_SECONDS
+            )
+            app.state.message_writer.start()
+        app.state.scenario_catalog = ScenarioCatalog(AsyncSessionLocal, create_scenario_invalidation())
+        await app.state.scenario_catalog.start()
+        app.state.password_hasher = PasswordHasher(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            max_queue_size=settings.PASSWORD_HASH_QUEUE_SIZE
+        )
+        logger.info("Application started, models are loading in the background.")
 
         yield
 
@@ -32,7 +107,27 @@ async def lifespan(app: FastAPI):
         raise e
 
     finally:
-        del app.state.whisper_model
-        del app.state.groq_model
+        await app.state.models.shutdown()
+        if app.state.journal_replay is not None:
+            app.state.journal_replay.cancel()
+        if app.state.message_writer is not None:
+            await app.state.message_writer.shutdown()
+        await app.state.scenario_catalog.stop()
+        app.state.password_hasher.shutdown()
+
+        del app.state.models
+
+        logger.info(f"Scheduler usage: {app.state.scheduler.stats()}")
+        del app.state.scheduler
+        del app.state.suggestion_cache
+        del app.state.predictor_store
+        del app.state.message_writer
+        del app.state.journal_replay
+        del app.state.scenario_catalog
+        del app.state.password_hasher
+
+        await engine.dispose()
+
+        logger.info(f"Auth cache usage: {auth_cache.stats()}")
 
         logger.info(f"Shutting down FastAPI application...")
\ No newline at end of file
@@ -0,0 +1,345 @@
+import json
+import time
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage, AIMessageChunk
+
+from src.core.logging import logger
+from src.core.metrics import LatencyTracker
+
+class LLMGateway:
+    """
+    Shared entry point for every call to the upstream chat model.
+
+    Calls are limited in concurrency and bounded by a deadline chosen by the
+    caller. Identical prompts in flight at the same time are sent once and
+    share the reply. When a call runs longer than the recent p95 latency of
+    its route, a duplicate is sent and whichever answers first wins.
+
+    Latency is kept per route, e.g. suggestions and coach replies, since
+    their replies differ by an order of magnitude in length.
+    """
+
+    def __init__(
+        self,
+        model: BaseChatModel,
+        max_concurrency: int = 32,
+        hedge_percentile: float = 95,
+        hedge_min_samples: int = 20
+    ) -> None:
+        """
+        Args:
+            model: Upstream chat model.
+            max_concurrency: Requests allowed in flight at once.
+            hedge_percentile: Latency percentile after which a hedged request is sent.
+            hedge_min_samples: Calls to observe before hedging starts.
+        """
+        self.model = model
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.max_concurrency = max_concurrency
+        self.latency: dict[str, LatencyTracker] = {}
+        self.coalesced = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: dict[str, asyncio.Task[BaseMessage]] = {}
+        self._sync_pool: ThreadPoolExecutor | None = None
+
+    def chat_model(self, route: str, deadline_seconds: float, hedge: bool = True) -> "GatewayChatModel":
+        """
+        Creates a chat model routing its calls through the gateway.
+
+        Args:
+            route: Name of the caller, calls of a route share latency statistics.
+            deadline_seconds: Time a call may take before it fails with TimeoutError.
+            hedge: Whether slow calls are hedged.
+
+        Returns:
+            GatewayChatModel: Drop-in chat model for chains and services.
+        """
+        return GatewayChatModel(gateway=self, route=route, deadline_seconds=deadline_seconds, hedge=hedge)
+
+    def _latency(self, route: str) -> LatencyTracker:
+        """
+        Gets the latency tracker of a route, creating it on first use.
+
+        Args:
+            route: Name of the route.
+
+        Returns:
+            LatencyTracker: Latency of the route's non-streamed calls.
+        """
+        if route not in self.latency:
+            self.latency[route] = LatencyTracker(f"llm:{route}")
+        return self.latency[route]
+
+    @staticmethod
+    def _prompt_key(messages: list[BaseMessage], kwargs: dict[str, Any]) -> str:
+        """
+        Identifies a prompt for coalescing.
+
+        Args:
+            messages: Prompt messages.
+            kwargs: Call options.
+
+        Returns:
+            str: Digest of the messages and options.
+        """
+        raw = json.dumps(
+            [[message.type, message.content] for message in messages] + [sorted(kwargs.items())],
+            default=str
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def _call(self, messages: list[BaseMessage], route: str, kwargs: dict[str, Any]) -> BaseMessage:
+        """
+        Sends one request upstream and records its latency.
+
+        Args:
+            messages: Prompt messages.
+            route: Route the latency is recorded for.
+            kwargs: Call options.
+
+        Returns:
+            BaseMessage: Reply of the model.
+        """
+        async with self._semaphore:
+            started = time.perf_counter()
+            reply = await self.model.ainvoke(messages, **kwargs)
+            self._latency(route).record(time.perf_counter() - started)
+            return reply
+
+    def _hedge_delay(self, route: str) -> float | None:
+        """Time after which a call of a route is hedged, None until enough of its calls were observed."""
+        latency = self._latency(route)
+        if latency.count < self.hedge_min_samples:
+            return None
+        return latency.percentile(self.hedge_percentile)
+
+    async def _call_hedged(self, messages: list[BaseMessage], route: str, kwargs: dict[str, Any]) -> BaseMessage:
+        """
+        Sends a request and a duplicate if it is slower than usual for its route.
+
+        Args:
+            messages: Prompt messages.
+            route: Route whose latency decides when to hedge.
+            kwargs: Call options.
+
+        Returns:
+            BaseMessage: First successful reply.
+        """
+        primary = asyncio.create_task(self._call(messages, route, kwargs))
+        delay = self._hedge_delay(route)
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.hedged += 1
+        logger.debug(f"LLM {route} call slower than p{self.hedge_percentile:g} ({delay * 1000:.0f} ms), hedging.")
+        hedge = asyncio.create_task(self._call(messages, route, kwargs))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+
+            return primary.result()
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _forget(self, key: str, task: asyncio.Task[BaseMessage]) -> None:
+        """
+        Removes a finished call from the calls in flight.
+
+        Its failure is marked as retrieved, since every caller may already have
+        given up on it.
+
+        Args:
+            key: Prompt key of the call.
+            task: Finished call.
+        """
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def invoke(
+        self,
+        messages: list[BaseMessage],
+        deadline_seconds: float,
+        route: str = "default",
+        hedge: bool = True,
+        **kwargs: Any
+    ) -> BaseMessage:
+        """
+        Gets a reply within a deadline, sharing it with identical calls in flight.
+
+        Args:
+            messages: Prompt messages.
+            deadline_seconds: Time the caller is willing to wait.
+            route: Name of the caller, for latency statistics and hedging.
+            hedge: Whether a slow call is hedged.
+            kwargs: Call options passed to the model.
+
+        Returns:
+            BaseMessage: Reply of the model.
+
+        Raises:
+            TimeoutError: When no reply arrives before the deadline.
+        """
+        key = self._prompt_key(messages, kwargs)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            call = self._call_hedged(messages, route, kwargs) if hedge else self._call(messages, route, kwargs)
+            task = asyncio.create_task(asyncio.wait_for(call, deadline_seconds))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # Shielded so one caller giving up does not cancel the call for the others.
+        async with asyncio.timeout(deadline_seconds):
+            return await asyncio.shield(task)
+
+    def invoke_sync(
+        self,
+        messages: list[BaseMessage],
+        deadline_seconds: float,
+        route: str = "default",
+        **kwargs: Any
+    ) -> BaseMessage:
+        """
+        Blocking counterpart of `invoke` for callers outside the event loop.
+
+        Coalescing and hedging live on the event loop, so sync calls skip them.
+        They go to the model from a pool of `max_concurrency` threads, and the
+        caller stops waiting at the deadline.
+
+        Args:
+            messages: Prompt messages.
+            deadline_seconds: Time the caller is willing to wait.
+            route: Name of the caller, for latency statistics.
+            kwargs: Call options passed to the model.
+
+        Returns:
+            BaseMessage: Reply of the model.
+
+        Raises:
+            TimeoutError: When no reply arrives before the deadline.
+        """
+        if self._sync_pool is None:
+            self._sync_pool = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="llm")
+
+        def call() -> BaseMessage:
+            started = time.perf_counter()
+            reply = self.model.invoke(messages, **kwargs)
+            self._latency(route).record(time.perf_counter() - started)
+            return reply
+
+        future = self._sync_pool.submit(call)
+        try:
+            return future.result(timeout=deadline_seconds)
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"LLM {route} call missed its {deadline_seconds:g} s deadline.") from None
+
+    async def stream(
+        self,
+        messages: list[BaseMessage],
+        deadline_seconds: float,
+        **kwargs: Any
+    ) -> AsyncIterator[AIMessageChunk]:
+        """
+        Streams a reply, failing if it does not complete within the deadline.
+
+        Streams are neither coalesced nor hedged, their consumers act on each
+        chunk as it arrives. Their duration includes the time the consumer
+        spends between chunks, so it is not recorded as latency.
+
+        Args:
+            messages: Prompt messages.
+            deadline_seconds: Time the whole stream may take.
+            kwargs: Call options passed to the model.
+
+        Yields:
+            AIMessageChunk: Chunks of the reply.
+
+        Raises:
+            TimeoutError: When the stream does not complete before the deadline.
+        """
+        deadline = asyncio.get_running_loop().time() + deadline_seconds
+        async with self._semaphore:
+            chunks = aiter(self.model.astream(messages, **kwargs))
+            while True:
+                # The timeout is only armed while waiting for the model, so it
+                # never fires inside the consumer's handling of a chunk.
+                async with asyncio.timeout_at(deadline):
+                    try:
+                        chunk = await anext(chunks)
+                    except StopAsyncIteration:
+                        break
+                yield chunk
+
+    def close(self) -> None:
+        """Stops the threads serving sync calls."""
+        if self._sync_pool is not None:
+            self._sync_pool.shutdown(wait=False, cancel_futures=True)
+            self._sync_pool = None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Reports latency and how often calls were coalesced or hedged.
+
+        Returns:
+            dict[str, Any]: Gateway counters and latency summary by route.
+        """
+        return {
+            "latency": {route: latency.summary() for route, latency in self.latency.items()},
+            "inflight": len(self._inflight),
+            "coalesced": self.coalesced,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins
+        }
+
+class GatewayChatModel(BaseChatModel):
+    """Chat model sending its calls through an `LLMGateway` with a fixed route and deadline."""
+
+    gateway: Any
+    route: str
+    deadline_seconds: float
+    hedge: bool = True
+
+    @property
+    def _llm_type(self) -> str:
+        return "gateway"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if stop is not None:
+            kwargs["stop"] = stop
+        reply = self.gateway.invoke_sync(messages, self.deadline_seconds, self.route, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if stop is not None:
+            kwargs["stop"] = stop
+        reply = await self.gateway.invoke(messages, self.deadline_seconds, self.route, self.hedge, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=reply)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        if stop is not None:
+            kwargs["stop"] = stop
+        async for chunk in self.gateway.stream(messages, self.deadline_seconds, **kwargs):
+            yield ChatGenerationChunk(message=chunk)
@@ -0,0 +1,158 @@
+import time
+import asyncio
+from typing import TYPE_CHECKING
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from src.core.logging import logger
+from src.core.config import settings
+from src.core.transcription import TranscriptionExecutor, create_transcription_executor
+from src.core.transcription_worker import RemoteTranscriptionExecutor
+
+if TYPE_CHECKING:
+    import httpx
+    from src.core.llm import LLMGateway
+
+def create_profile_executor(name: str) -> TranscriptionExecutor | RemoteTranscriptionExecutor:
+    """
+    Creates the transcription executor of a whisper profile.
+
+    Args:
+        name: Name of the profile in settings.
+
+    Returns:
+        TranscriptionExecutor | RemoteTranscriptionExecutor: Executor decoding in
+            process, or through the transcription worker tier when it is enabled.
+    """
+    profile = settings.WHISPER_PROFILES[name]
+    if settings.TRANSCRIPTION_BACKEND == "remote":
+        # The model lives in the transcription worker tier, see
+        # `src.core.transcription_worker`.
+        return RemoteTranscriptionExecutor(
+            settings.TRANSCRIPTION_WORKER_SOCKET_DIR,
+            name,
+            beam_size=profile.beam_size,
+            max_pending=settings.TRANSCRIPTION_REMOTE_MAX_PENDING,
+            request_timeout_seconds=settings.TRANSCRIPTION_REMOTE_TIMEOUT_SECONDS
+        )
+
+    logger.info(f"Loading whisper profile {name} ({profile.model_size}, {profile.compute_type}).")
+    return create_transcription_executor(profile)
+
+class ModelLoader:
+    """
+    Loads the LLM client and whisper models in the background.
+
+    The server starts answering as soon as the lifespan returns; routes that
+    need a model find `None` until it is loaded, and `ready()` turns true once
+    every model is loaded and warm.
+    """
+
+    def __init__(self, profile_names: list[str]) -> None:
+        """
+        Args:
+            profile_names: Whisper profiles to load, in order.
+        """
+        self.profile_names = profile_names
+        self.transcription_executors: dict[str, TranscriptionExecutor | RemoteTranscriptionExecutor] = {}
+        self.llm_client: "httpx.AsyncClient | None" = None
+        self.llm_gateway: "LLMGateway | None" = None
+        self.suggestion_model: BaseChatModel | None = None
+        self.coach_model: BaseChatModel | None = None
+        self.summary_model: BaseChatModel | None = None
+        self.loaded = False
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Starts loading the models without waiting for them."""
+        self._task = asyncio.create_task(self._load())
+
+    async def _load(self) -> None:
+        """Loads the LLM client first, as it is cheap, then each whisper profile."""
+        started = time.perf_counter()
+        try:
+            self._load_llm()
+            for name in self.profile_names:
+                # Reading the model from disk blocks, keep the event loop answering probes.
+                executor = await asyncio.to_thread(create_profile_executor, name)
+                executor.start()
+                self.transcription_executors[name] = executor
+        except Exception:
+            logger.exception("Loading models failed.")
+            return
+
+        self.loaded = True
+        logger.info(f"Models loaded in {time.perf_counter() - started:.2f} s.")
+        await self._warm_up()
+
+    def _load_llm(self) -> None:
+        """Creates the HTTP client and chat models going through the LLM gateway."""
+        # Imported here, langchain's provider registry alone costs about half a second at startup.
+        import httpx
+        from langchain.chat_models import init_chat_model
+        from src.core.llm import LLMGateway
+
+        self.llm_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        groq_model = init_chat_model(
+            settings.GROQ_MODEL_NAME,
+            model_provider="groq",
+            api_key=settings.GROQ_API_KEY,
+            http_async_client=self.llm_client,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+        self.llm_gateway = LLMGateway(
+            groq_model,
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+            hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES
+        )
+        self.suggestion_model = self.llm_gateway.chat_model("suggestion", settings.LLM_SUGGESTION_DEADLINE_MS / 1000)
+        self.coach_model = self.llm_gateway.chat_model("coach", settings.LLM_COACH_DEADLINE_MS / 1000)
+        self.summary_model = self.llm_gateway.chat_model("summary", settings.LLM_COACH_DEADLINE_MS / 1000)
+
+    async def _warm_up(self) -> None:
+        """Warms every transcription model, one after another so they do not compete for cores."""
+        for name, executor in self.transcription_executors.items():
+            started = time.perf_counter()
+            try:
+                await executor.warm_up()
+            except Exception as e:
+                logger.error(f"Warm-up of whisper profile {name} failed: {e}")
+                continue
+
+            logger.info(f"Whisper profile {name} warmed up in {time.perf_counter() - started:.2f} s.")
+
+    async def checks(self) -> dict[str, bool]:
+        """
+        Reports the readiness of each model.
+
+        Returns:
+            dict[str, bool]: Whether each model is loaded and warm, by check name.
+        """
+        checks = {"llm": self.llm_gateway is not None}
+        for name in self.profile_names:
+            executor = self.transcription_executors.get(name)
+            checks[f"transcription:{name}"] = executor is not None and await executor.ready()
+        return checks
+
+    async def ready(self) -> bool:
+        """Whether every model is loaded and warm."""
+        return self.loaded and all((await self.checks()).values())
+
+    async def shutdown(self) -> None:
+        """Stops loading, then releases whatever was loaded."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+        for executor in self.transcription_executors.values():
+            executor.shutdown()
+        if self.llm_gateway is not None:
+            self.llm_gateway.close()
+            logger.info(f"LLM gateway usage: {self.llm_gateway.stats()}")
+        if self.llm_client is not None:
+            await self.llm_client.aclose()
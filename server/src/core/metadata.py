@@ -5,6 +5,7 @@ class ApiTags(str, Enum):
     assistant = "assistant"
     auth = "auth"
     coach = "coach"
+    health = "health"
     user = "user"
 
 # metadata for the API
@@ -34,6 +35,10 @@ tags = [
         "name": ApiTags.coach,
         "description": "Handles logic for conversation coaching."
     },
+    {
+        "name": ApiTags.health,
+        "description": "Reports whether the server is ready to take traffic."
+    },
     {
         "name": ApiTags.user,
         "description": "Handles user operations such as profile management."
@@ -0,0 +1,55 @@
+from collections import deque
+
+class LatencyTracker:
+    """Keeps the most recent latency samples of an operation and reports percentiles."""
+
+    def __init__(self, name: str, window: int = 1000) -> None:
+        """
+        Args:
+            name: Name of the measured operation, used in logs.
+            window: Number of recent samples kept.
+        """
+        self.name = name
+        self.count = 0
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        """
+        Adds a sample.
+
+        Args:
+            seconds: Measured latency.
+        """
+        self.count += 1
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        """
+        Computes a percentile over the recent samples.
+
+        Args:
+            p: Percentile between 0 and 100.
+
+        Returns:
+            float | None: Latency in seconds, or None without samples.
+        """
+        if not self._samples:
+            return None
+
+        ordered = sorted(self._samples)
+        index = min(int(len(ordered) * p / 100), len(ordered) - 1)
+        return ordered[index]
+
+    def summary(self) -> dict[str, float | int | None]:
+        """
+        Summarises the recent samples.
+
+        Returns:
+            dict[str, float | int | None]: Sample count with p50, p95 and p99 latency in seconds.
+        """
+        return {
+            "count": self.count,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
@@ -0,0 +1,44 @@
+import json
+import base64
+import binascii
+from uuid import UUID
+from datetime import datetime
+from fastapi import HTTPException, status
+
+def encode_cursor(position: datetime, id: UUID) -> str:
+    """
+    Encodes a keyset position into an opaque cursor.
+
+    Args:
+        position: Timestamp the rows are ordered by.
+        id: Id of the row, breaking ties between equal timestamps.
+
+    Returns:
+        str: URL-safe cursor.
+    """
+    raw = json.dumps([position.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decodes a cursor created by `encode_cursor`.
+
+    Args:
+        cursor: Cursor received from a client.
+
+    Returns:
+        tuple[datetime, UUID]: Timestamp and id of the keyset position.
+
+    Raises:
+        HTTPException: When the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        position, id = json.loads(raw)
+        return datetime.fromisoformat(position), UUID(id)
+
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        ) from e
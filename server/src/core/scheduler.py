@@ -0,0 +1,301 @@
+import time
+import heapq
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, TypeVar
+
+from src.core.metrics import LatencyTracker
+
+R = TypeVar("R")
+
+class SchedulerBusy(Exception):
+    """Raised when work of a session is shed instead of being scheduled."""
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        """
+        Args:
+            message: Reason the work was shed.
+            retry_after: Seconds after which the session may try again.
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Rate limiter refilling at a constant rate up to a burst size."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """
+        Args:
+            rate: Tokens added per second.
+            burst: Most tokens the bucket holds.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self._updated_at = time.monotonic()
+
+    def take(self, cost: float = 1.0) -> float:
+        """
+        Takes tokens if enough are available.
+
+        Args:
+            cost: Tokens to take.
+
+        Returns:
+            float: 0 when the tokens were taken, otherwise seconds until they are available.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        return (cost - self.tokens) / self.rate
+
+@dataclass(order=True)
+class QueuedJob:
+    """Job waiting for a free slot, ordered by virtual finish time."""
+    finish: float
+    seq: int
+    enqueued_at: float = field(compare=False)
+    grant: asyncio.Future[None] = field(compare=False)
+
+class SchedulerSession:
+    """Handle of one websocket session on a `FairScheduler`."""
+
+    def __init__(self, scheduler: "FairScheduler", user_key: str, weight: float, bucket: TokenBucket) -> None:
+        """
+        Args:
+            scheduler: Scheduler the session belongs to.
+            user_key: User the session is accounted to.
+            weight: Share of the scheduler the user is entitled to, relative to others.
+            bucket: Rate limiter of the session.
+        """
+        self.scheduler = scheduler
+        self.user_key = user_key
+        self.weight = weight
+        self.bucket = bucket
+
+    def admit(self, cost: float = 1.0) -> None:
+        """
+        Charges the session for a unit of work.
+
+        Args:
+            cost: Tokens the work costs.
+
+        Raises:
+            SchedulerBusy: When the session is over its rate.
+        """
+        retry_after = self.bucket.take(cost)
+        if retry_after > 0:
+            self.scheduler.shed += 1
+            raise SchedulerBusy(f"Session of {self.user_key} is over its rate.", retry_after)
+
+    async def run(self, fn: Callable[[], Awaitable[R]], cost: float = 1.0) -> R:
+        """
+        Runs work of the session once it is admitted and given a slot.
+
+        Args:
+            fn: Coroutine function doing the work.
+            cost: Tokens and virtual time the work costs.
+
+        Returns:
+            R: Result of the work.
+
+        Raises:
+            SchedulerBusy: When the session is over its rate, the queue is
+                full or no slot frees up in time.
+        """
+        self.admit(cost)
+        return await self.scheduler._run(self, fn, cost)
+
+    def close(self) -> None:
+        """Unregisters the session, must be called when the websocket closes."""
+        self.scheduler._close(self)
+
+class FairScheduler:
+    """
+    Shares the transcription stage fairly between users.
+
+    Each websocket session draws from its own token bucket, so a client
+    streaming faster than real time is throttled on its own. Work admitted
+    past the bucket runs on a bounded number of slots; when they are all
+    taken it is queued by weighted fair queuing, so every user gets their
+    share in turn however much work another user has queued. Work that
+    cannot be queued, or waits longer than allowed, is shed with
+    `SchedulerBusy` and the session is told to back off.
+
+    Sessions await each job before submitting the next, so every session
+    holds at most one job in the queue and audio arriving meanwhile is
+    decoded together by the following job.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue_size: int = 32,
+        max_wait_ms: int = 1500,
+        session_rate: float = 3.0,
+        session_burst: float = 6
+    ) -> None:
+        """
+        Args:
+            max_concurrency: Jobs running at once.
+            max_queue_size: Jobs allowed to wait for a slot.
+            max_wait_ms: Time a job may wait for a slot before it is dropped as stale.
+            session_rate: Jobs per second a session may submit in the long run.
+            session_burst: Jobs a session may submit at once after being idle.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.max_wait = max_wait_ms / 1000
+        self.session_rate = session_rate
+        self.session_burst = session_burst
+        self.running = 0
+        self.shed = 0
+        self.virtual_time = 0.0
+        self.wait = LatencyTracker("scheduler_wait")
+        self._queue: list[QueuedJob] = []
+        self._seq = itertools.count()
+        self._sessions: dict[str, int] = {}
+        self._last_finish: dict[str, float] = {}
+
+    def open_session(self, user_key: str, weight: float = 1.0) -> SchedulerSession:
+        """
+        Registers a websocket session.
+
+        Args:
+            user_key: User the session is accounted to, sessions of one user share its share.
+            weight: Share of the scheduler the user is entitled to, relative to others.
+
+        Returns:
+            SchedulerSession: Handle used to submit work.
+        """
+        self._sessions[user_key] = self._sessions.get(user_key, 0) + 1
+        return SchedulerSession(self, user_key, weight, TokenBucket(self.session_rate, self.session_burst))
+
+    def _close(self, session: SchedulerSession) -> None:
+        """
+        Unregisters a session, forgetting its user once no session is left.
+
+        Args:
+            session: Session to unregister.
+        """
+        remaining = self._sessions.pop(session.user_key, 1) - 1
+        if remaining > 0:
+            self._sessions[session.user_key] = remaining
+        else:
+            self._last_finish.pop(session.user_key, None)
+
+    def _tag(self, session: SchedulerSession, cost: float) -> float:
+        """
+        Computes the virtual finish time of a job.
+
+        A user's jobs are spaced by their cost over the user's weight, starting
+        no earlier than the job currently served, so idle users do not bank
+        credit and busy users wait their turn.
+
+        Args:
+            session: Session submitting the job.
+            cost: Cost of the job.
+
+        Returns:
+            float: Virtual finish time ordering the job in the queue.
+        """
+        start = max(self.virtual_time, self._last_finish.get(session.user_key, 0.0))
+        finish = start + cost / session.weight
+        self._last_finish[session.user_key] = finish
+        return finish
+
+    @staticmethod
+    def _granted(job: QueuedJob) -> bool:
+        """Whether a slot was handed to the job."""
+        return job.grant.done() and not job.grant.cancelled()
+
+    async def _acquire(self, session: SchedulerSession, cost: float) -> None:
+        """
+        Waits for a slot.
+
+        Args:
+            session: Session submitting the job.
+            cost: Cost of the job.
+
+        Raises:
+            SchedulerBusy: When the queue is full or no slot frees up in time.
+        """
+        if self.running < self.max_concurrency and not self._queue:
+            self.virtual_time = self._tag(session, cost)
+            self.running += 1
+            self.wait.record(0.0)
+            return
+
+        if len(self._queue) >= self.max_queue_size:
+            self.shed += 1
+            raise SchedulerBusy(f"{len(self._queue)} jobs already queued.", self.max_wait)
+
+        loop = asyncio.get_running_loop()
+        job = QueuedJob(self._tag(session, cost), next(self._seq), loop.time(), loop.create_future())
+        heapq.heappush(self._queue, job)
+
+        try:
+            async with asyncio.timeout(self.max_wait):
+                await job.grant
+        except TimeoutError:
+            # The slot may have been handed over just as the wait timed out.
+            if not self._granted(job):
+                self.shed += 1
+                raise SchedulerBusy(f"Job waited {self.max_wait * 1000:.0f} ms for a slot, dropped as stale.", 0.0)
+        except asyncio.CancelledError:
+            if self._granted(job):
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Frees a slot and hands it to the queued job with the earliest virtual finish time."""
+        self.running -= 1
+        loop = asyncio.get_running_loop()
+
+        while self._queue and self.running < self.max_concurrency:
+            job = heapq.heappop(self._queue)
+            if job.grant.done():
+                continue
+
+            self.running += 1
+            self.virtual_time = job.finish
+            self.wait.record(loop.time() - job.enqueued_at)
+            job.grant.set_result(None)
+
+    async def _run(self, session: SchedulerSession, fn: Callable[[], Awaitable[R]], cost: float) -> R:
+        """
+        Runs work in a slot.
+
+        Args:
+            session: Session submitting the work.
+            fn: Coroutine function doing the work.
+            cost: Cost of the work.
+
+        Returns:
+            R: Result of the work.
+        """
+        await self._acquire(session, cost)
+        try:
+            return await fn()
+        finally:
+            self._release()
+
+    def stats(self) -> dict[str, object]:
+        """
+        Reports load of the scheduler.
+
+        Returns:
+            dict[str, object]: Running and queued jobs, shed jobs and queue wait latency.
+        """
+        return {
+            "running": self.running,
+            "queued": len(self._queue),
+            "sessions": sum(self._sessions.values()),
+            "shed": self.shed,
+            "wait": self.wait.summary()
+        }
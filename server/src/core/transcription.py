@@ -0,0 +1,325 @@
+import asyncio
+import numpy as np
+from io import BytesIO
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.logging import logger
+from src.core.config import settings, WhisperProfile
+from src.assistant.services import (
+    get_transcription,
+    get_word_transcription,
+    get_batch_transcription,
+    get_batch_word_transcription
+)
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+    from faster_whisper.transcribe import Word
+
+R = TypeVar("R")
+
+class TranscriptionQueueFull(Exception):
+    """Raised when the transcription executor cannot accept more work."""
+
+def load_whisper_model(profile: WhisperProfile) -> "WhisperModel":
+    """
+    Loads the whisper model of a profile.
+
+    Args:
+        profile: Model and decoding settings.
+
+    Returns:
+        WhisperModel: Loaded model.
+    """
+    # Imported here so the web tier only pays for faster_whisper once models load.
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(
+        profile.model_size,
+        compute_type=profile.compute_type,
+        cpu_threads=profile.cpu_threads,
+        num_workers=profile.num_workers
+    )
+
+@dataclass
+class PendingTranscription:
+    """Transcription request waiting to be picked up by the batch scheduler."""
+    audio: BytesIO | bytes | np.ndarray
+    beam_size: int
+    future: asyncio.Future
+    word_timestamps: bool = False
+    initial_prompt: str | None = None
+
+class TranscriptionExecutor:
+    """
+    Runs whisper transcription on a bounded thread pool, off the event loop.
+
+    CTranslate2 releases the GIL while decoding, so the worker threads share
+    a single model instance and still decode in parallel. When batching is
+    enabled, requests arriving within the batch window from any session are
+    decoded together in a single model call.
+    """
+
+    def __init__(
+        self,
+        model: "WhisperModel",
+        max_workers: int = 2,
+        max_queue_size: int = 8,
+        batch_window_ms: int = 0,
+        max_batch_size: int = 1,
+        beam_size: int = 1
+    ) -> None:
+        """
+        Args:
+            model: Model to be used for transcription.
+            max_workers: Number of threads decoding concurrently.
+            max_queue_size: Number of requests allowed to wait for a free worker.
+            batch_window_ms: Time to wait for more requests after the first one of a batch.
+            max_batch_size: Largest number of requests decoded together, 1 disables batching.
+            beam_size: Beam size used when a request does not set one.
+        """
+        self.model = model
+        self.max_workers = max_workers
+        self.beam_size = beam_size
+        self.warm = False
+        self.capacity = max_workers + max_queue_size
+        self.pending = 0
+        self.batch_window = batch_window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="whisper")
+        self._queue: asyncio.Queue[PendingTranscription] = asyncio.Queue()
+        self._scheduler: asyncio.Task | None = None
+
+    @property
+    def batching(self) -> bool:
+        """Whether requests are grouped into batches."""
+        return self.max_batch_size > 1
+
+    def start(self) -> None:
+        """Starts the batch scheduler, must be called from within the event loop."""
+        if self.batching and self._scheduler is None:
+            self._scheduler = asyncio.create_task(self._schedule_batches())
+
+    async def warm_up(self) -> None:
+        """
+        Runs throwaway inference on every worker so real requests do not pay
+        for the first allocations of the model.
+        """
+        silence = np.zeros(16000, dtype=np.float32)
+
+        await asyncio.gather(*(
+            self._run(get_word_transcription, silence, self.model, self.beam_size, None)
+            for _ in range(self.max_workers)
+        ))
+        await self._run(get_transcription, silence, self.model, self.beam_size)
+        if self.batching:
+            await self._run(get_batch_transcription, [silence, silence], self.model, self.beam_size)
+            await self._run(get_batch_word_transcription, [silence, silence], self.model, self.beam_size)
+
+        self.warm = True
+
+    async def ready(self) -> bool:
+        """Whether the model is warm and requests are served at full speed."""
+        return self.warm
+
+    @contextmanager
+    def _admission(self):
+        """
+        Holds a slot in the executor for the duration of a request.
+
+        Raises:
+            TranscriptionQueueFull: When all workers are busy and the queue is full.
+        """
+        if self.pending >= self.capacity:
+            raise TranscriptionQueueFull(f"{self.pending} transcriptions already pending.")
+
+        self.pending += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def _run(self, fn: Callable[..., R], *args: Any) -> R:
+        """
+        Runs a transcription function directly on the worker pool.
+
+        Args:
+            fn: Function to run.
+            args: Arguments for the function.
+
+        Returns:
+            R: Result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, *args)
+
+    async def transcribe_async(self, audio: BytesIO | bytes | np.ndarray, beam_size: int | None = None) -> str:
+        """
+        Transcribes audio on the worker pool.
+
+        Args:
+            audio: Audio in buffer format or as a 16kHz float32 waveform.
+            beam_size: Beam size to use for decoding, the executor's by default.
+
+        Returns:
+            str: Transcription.
+
+        Raises:
+            TranscriptionQueueFull: When all workers are busy and the queue is full.
+        """
+        beam_size = beam_size or self.beam_size
+        with self._admission():
+            if not self.batching:
+                return await self._run(get_transcription, audio, self.model, beam_size)
+
+            future = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait(PendingTranscription(audio, beam_size, future))
+            return await future
+
+    async def transcribe_words_async(
+        self,
+        audio: np.ndarray,
+        beam_size: int | None = None,
+        initial_prompt: str | None = None
+    ) -> list["Word"]:
+        """
+        Transcribes audio into timed words on the worker pool.
+
+        Args:
+            audio: 16kHz float32 waveform.
+            beam_size: Beam size to use for decoding, the executor's by default.
+            initial_prompt: Previously transcribed text used as decoding context.
+
+        Returns:
+            list[Word]: Transcribed words, timed relative to the start of the audio.
+
+        Raises:
+            TranscriptionQueueFull: When all workers are busy and the queue is full.
+        """
+        beam_size = beam_size or self.beam_size
+        with self._admission():
+            if not self.batching:
+                return await self._run(get_word_transcription, audio, self.model, beam_size, initial_prompt)
+
+            future = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait(PendingTranscription(audio, beam_size, future, True, initial_prompt))
+            return await future
+
+    async def _schedule_batches(self) -> None:
+        """Collects queued requests into batches and hands them to the worker pool."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            batch = [request for request in batch if not request.future.done()]
+            kinds = {(request.beam_size, request.word_timestamps) for request in batch}
+            for beam_size, word_timestamps in kinds:
+                group = [
+                    request for request in batch
+                    if request.beam_size == beam_size and request.word_timestamps == word_timestamps
+                ]
+                self._dispatch(group, beam_size, word_timestamps)
+
+    def _dispatch(self, group: list[PendingTranscription], beam_size: int, word_timestamps: bool) -> None:
+        """
+        Decodes a group of requests sharing a beam size and output and resolves their futures.
+
+        Args:
+            group: Requests to decode together.
+            beam_size: Beam size to use for decoding.
+            word_timestamps: Whether the requests want timed words rather than text.
+        """
+        loop = asyncio.get_running_loop()
+        audios = [request.audio for request in group]
+        prompts = [request.initial_prompt for request in group]
+
+        if len(group) == 1 and word_timestamps:
+            decoding = loop.run_in_executor(
+                self._pool,
+                get_word_transcription,
+                audios[0],
+                self.model,
+                beam_size,
+                prompts[0]
+            )
+        elif len(group) == 1:
+            decoding = loop.run_in_executor(
+                self._pool,
+                get_transcription,
+                audios[0],
+                self.model,
+                beam_size
+            )
+        elif word_timestamps:
+            logger.debug(f"Decoding batch of {len(group)} word transcriptions.")
+            decoding = loop.run_in_executor(
+                self._pool,
+                get_batch_word_transcription,
+                audios,
+                self.model,
+                beam_size,
+                prompts
+            )
+        else:
+            logger.debug(f"Decoding batch of {len(group)} transcriptions.")
+            decoding = loop.run_in_executor(
+                self._pool,
+                get_batch_transcription,
+                audios,
+                self.model,
+                beam_size
+            )
+
+        def resolve(done: asyncio.Future) -> None:
+            for i, request in enumerate(group):
+                if request.future.done():
+                    continue
+                if done.cancelled():
+                    request.future.cancel()
+                elif done.exception() is not None:
+                    request.future.set_exception(done.exception())
+                else:
+                    results = [done.result()] if len(group) == 1 else done.result()
+                    request.future.set_result(results[i])
+
+        decoding.add_done_callback(resolve)
+
+    def shutdown(self) -> None:
+        """Stops the scheduler and worker pool, dropping transcriptions that have not started yet."""
+        logger.info("Shutting down transcription executor...")
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+def create_transcription_executor(profile: WhisperProfile) -> TranscriptionExecutor:
+    """
+    Loads the model of a profile into an executor configured from settings.
+
+    Args:
+        profile: Model and decoding settings.
+
+    Returns:
+        TranscriptionExecutor: Executor decoding with the profile's beam size by default.
+    """
+    return TranscriptionExecutor(
+        load_whisper_model(profile),
+        max_workers=settings.TRANSCRIPTION_WORKERS,
+        max_queue_size=settings.TRANSCRIPTION_QUEUE_SIZE,
+        batch_window_ms=settings.TRANSCRIPTION_BATCH_WINDOW_MS,
+        max_batch_size=settings.TRANSCRIPTION_MAX_BATCH_SIZE,
+        beam_size=profile.beam_size
+    )
@@ -0,0 +1,602 @@
+"""
+Transcription worker tier, serving whisper to the web workers over Unix sockets.
+
+Each worker process loads and warms the model of every whisper profile
+in use, then listens on its own socket in TRANSCRIPTION_WORKER_SOCKET_DIR. Web workers started with
+TRANSCRIPTION_BACKEND=remote connect to every socket found there and
+spread their requests across them, so the web and inference tiers scale
+separately and the machine holds one model per profile and inference
+process.
+
+Usage:
+    uv run python -m src.core.transcription_worker --processes 2
+"""
+import sys
+import json
+import time
+import signal
+import struct
+import asyncio
+import argparse
+import itertools
+import numpy as np
+import multiprocessing
+import multiprocessing.connection
+from io import BytesIO
+from pathlib import Path
+from functools import partial
+from contextlib import contextmanager
+
+from typing import TYPE_CHECKING, Callable
+
+from src.core.logging import logger
+from src.core.config import settings
+from src.core.transcription import (
+    TranscriptionExecutor,
+    TranscriptionQueueFull,
+    create_transcription_executor
+)
+
+if TYPE_CHECKING:
+    from faster_whisper.transcribe import Word
+
+FRAME_HEADER = struct.Struct("!II")
+SOCKET_PATTERN = "transcription-*.sock"
+
+# A worker exiting sooner than this after starting is restarted after a growing delay.
+WORKER_STABLE_SECONDS = 60.0
+WORKER_RESTART_DELAY_SECONDS = 1.0
+WORKER_MAX_RESTART_DELAY_SECONDS = 60.0
+
+class TranscriptionUnavailable(TranscriptionQueueFull):
+    """Raised when no transcription worker can be reached."""
+
+class TranscriptionWorkerError(Exception):
+    """Raised when a transcription worker fails to transcribe a request."""
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[dict, bytes]:
+    """
+    Reads a message sent with `write_frame`.
+
+    Args:
+        reader: Stream to read from.
+
+    Returns:
+        tuple[dict, bytes]: JSON header and binary payload of the message.
+
+    Raises:
+        asyncio.IncompleteReadError: When the peer closes the connection.
+    """
+    header_size, payload_size = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    header = json.loads(await reader.readexactly(header_size))
+    payload = await reader.readexactly(payload_size)
+    return header, payload
+
+async def write_frame(writer: asyncio.StreamWriter, header: dict, payload: bytes = b"") -> None:
+    """
+    Sends a message made of a JSON header and a binary payload.
+
+    The frame is written in a single call, so frames of concurrent requests
+    sharing a connection never interleave.
+
+    Args:
+        writer: Stream to write to.
+        header: JSON serializable header.
+        payload: Binary payload, raw audio for requests.
+    """
+    encoded = json.dumps(header).encode()
+    writer.write(FRAME_HEADER.pack(len(encoded), len(payload)) + encoded + payload)
+    await writer.drain()
+
+def encode_audio(audio: BytesIO | bytes | np.ndarray) -> tuple[str, bytes]:
+    """
+    Serializes audio for a request.
+
+    Args:
+        audio: Audio in buffer format or as a 16kHz float32 waveform.
+
+    Returns:
+        tuple[str, bytes]: Encoding of the payload and the payload itself.
+    """
+    if isinstance(audio, np.ndarray):
+        return "f32", audio.astype(np.float32, copy=False).tobytes()
+    if isinstance(audio, BytesIO):
+        return "encoded", audio.getvalue()
+    return "encoded", bytes(audio)
+
+def decode_audio(encoding: str, payload: bytes) -> BytesIO | np.ndarray:
+    """
+    Restores audio serialized with `encode_audio`.
+
+    Args:
+        encoding: Encoding of the payload.
+        payload: Serialized audio.
+
+    Returns:
+        BytesIO | np.ndarray: Audio in the form the executor accepts.
+    """
+    if encoding == "f32":
+        return np.frombuffer(payload, dtype=np.float32)
+    return BytesIO(payload)
+
+async def handle_request(
+    executors: dict[str, TranscriptionExecutor],
+    writer: asyncio.StreamWriter,
+    header: dict,
+    payload: bytes
+) -> None:
+    """
+    Transcribes one request and sends back its result or error.
+
+    Args:
+        executors: Executors of this worker by profile.
+        writer: Connection of the requesting web worker.
+        header: Request header.
+        payload: Request audio.
+    """
+    response = {"id": header["id"]}
+    audio = decode_audio(header["encoding"], payload)
+
+    try:
+        executor = executors.get(header["profile"])
+        if executor is None:
+            raise ValueError(f"Whisper profile {header['profile']!r} is not served by this worker.")
+
+        if header["op"] == "words":
+            words = await executor.transcribe_words_async(
+                audio,
+                beam_size=header["beam_size"],
+                initial_prompt=header.get("initial_prompt")
+            )
+            response["words"] = [[word.start, word.end, word.word, word.probability] for word in words]
+        else:
+            response["text"] = await executor.transcribe_async(audio, beam_size=header["beam_size"])
+
+    except TranscriptionQueueFull as e:
+        response["error"] = "busy"
+        response["detail"] = str(e)
+
+    except Exception as e:
+        logger.exception("Transcription request failed.")
+        response["error"] = "failed"
+        response["detail"] = str(e)
+
+    await write_frame(writer, response)
+
+async def handle_connection(
+    executors: dict[str, TranscriptionExecutor],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter
+) -> None:
+    """
+    Serves the requests of one web worker, concurrently.
+
+    Args:
+        executors: Executors of this worker by profile.
+        reader: Incoming side of the connection.
+        writer: Outgoing side of the connection.
+    """
+    requests: set[asyncio.Task] = set()
+    try:
+        while True:
+            try:
+                header, payload = await read_frame(reader)
+            except asyncio.IncompleteReadError:
+                break
+
+            request = asyncio.create_task(handle_request(executors, writer, header, payload))
+            requests.add(request)
+            request.add_done_callback(requests.discard)
+
+    finally:
+        for request in requests:
+            request.cancel()
+        writer.close()
+
+async def serve(path: Path) -> None:
+    """
+    Loads and warms the models, then serves transcription requests on a Unix socket.
+
+    The socket only appears once every model is warm, so web workers never
+    reach a cold worker.
+
+    Args:
+        path: Socket path, replaced if left over from a previous run.
+    """
+    executors = {
+        name: create_transcription_executor(settings.WHISPER_PROFILES[name])
+        for name in settings.whisper_profile_names
+    }
+    for executor in executors.values():
+        executor.start()
+        await executor.warm_up()
+
+    # Terminated by the supervisor, the socket is removed on the way out.
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(partial(handle_connection, executors), path=str(path))
+    logger.info(f"Transcription worker listening on {path}.")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for executor in executors.values():
+            executor.shutdown()
+        path.unlink(missing_ok=True)
+
+def run_worker(path: Path) -> None:
+    """
+    Entry point of a worker process.
+
+    Args:
+        path: Socket path of the worker.
+    """
+    try:
+        asyncio.run(serve(path))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+class WorkerConnection:
+    """Connection to one transcription worker, shared by concurrent requests."""
+
+    def __init__(self, path: Path, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Args:
+            path: Socket path of the worker.
+            reader: Incoming side of the connection.
+            writer: Outgoing side of the connection.
+        """
+        self.path = path
+        self.pending: dict[int, asyncio.Future[dict]] = {}
+        self._writer = writer
+        self._reader = asyncio.create_task(self._read_responses(reader))
+
+    @property
+    def closed(self) -> bool:
+        """Whether the connection was lost."""
+        return self._reader.done()
+
+    async def _read_responses(self, reader: asyncio.StreamReader) -> None:
+        """Resolves pending requests as their responses arrive, failing them all when the connection drops."""
+        try:
+            while True:
+                header, _ = await read_frame(reader)
+                future = self.pending.pop(header["id"], None)
+                if future is not None and not future.done():
+                    future.set_result(header)
+
+        except (asyncio.IncompleteReadError, OSError) as e:
+            logger.warning(f"Lost connection to transcription worker {self.path}: {e!r}")
+
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(TranscriptionUnavailable(f"Transcription worker {self.path} disconnected."))
+            self.pending.clear()
+            self._writer.close()
+
+    async def request(self, request_id: int, header: dict, payload: bytes, timeout: float) -> dict:
+        """
+        Sends a request and waits for its response.
+
+        Args:
+            request_id: Id unique on this connection.
+            header: Request header.
+            payload: Request audio.
+            timeout: Seconds to wait for the response.
+
+        Returns:
+            dict: Response header.
+
+        Raises:
+            TranscriptionUnavailable: When the connection drops or the worker
+                does not answer in time.
+        """
+        if self.closed:
+            raise TranscriptionUnavailable(f"Transcription worker {self.path} disconnected.")
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            await write_frame(self._writer, {"id": request_id, **header}, payload)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # A late response finds no pending request and is dropped.
+            raise TranscriptionUnavailable(f"Transcription worker {self.path} did not answer within {timeout:g} s.")
+        except OSError as e:
+            raise TranscriptionUnavailable(f"Transcription worker {self.path} unreachable: {e}")
+        finally:
+            self.pending.pop(request_id, None)
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self._reader.cancel()
+
+class RemoteTranscriptionExecutor:
+    """
+    Sends transcription requests to the worker tier instead of decoding in process.
+
+    Offers the interface of `TranscriptionExecutor`. Workers are discovered
+    through their sockets, connected to lazily so the web tier can start
+    first, and rediscovered periodically so restarted workers are picked up.
+    Each request goes to the worker with the fewest requests pending.
+    """
+
+    def __init__(
+        self,
+        socket_dir: str | Path,
+        profile: str,
+        beam_size: int = 1,
+        max_pending: int = 32,
+        discovery_interval_seconds: float = 5.0,
+        request_timeout_seconds: float = 30.0
+    ) -> None:
+        """
+        Args:
+            socket_dir: Directory holding the sockets of the workers.
+            profile: Whisper profile the requests are decoded with.
+            beam_size: Beam size used when a request does not set one.
+            max_pending: Requests of this web worker allowed in flight at once.
+            discovery_interval_seconds: Time between checks for new workers.
+            request_timeout_seconds: Time a worker is given to answer a request.
+        """
+        self.socket_dir = Path(socket_dir)
+        self.profile = profile
+        self.beam_size = beam_size
+        self.capacity = max_pending
+        self.pending = 0
+        self.discovery_interval = discovery_interval_seconds
+        self.request_timeout = request_timeout_seconds
+        self._connections: dict[Path, WorkerConnection] = {}
+        self._discovered_at = float("-inf")
+        self._discovery = asyncio.Lock()
+        self._ids = itertools.count()
+
+    def start(self) -> None:
+        """Kept for parity with `TranscriptionExecutor`, workers are connected to on first use."""
+
+    async def warm_up(self) -> None:
+        """Connects to the workers already running, which only listen once their models are warm."""
+        await self.ready()
+
+    async def ready(self) -> bool:
+        """Whether a worker can be reached, looking for new ones when none is connected."""
+        try:
+            await self._connection()
+        except TranscriptionUnavailable:
+            return False
+        return True
+
+    @contextmanager
+    def _admission(self):
+        """
+        Holds a slot for the duration of a request.
+
+        Raises:
+            TranscriptionQueueFull: When too many requests are already in flight.
+        """
+        if self.pending >= self.capacity:
+            raise TranscriptionQueueFull(f"{self.pending} remote transcriptions already pending.")
+
+        self.pending += 1
+        try:
+            yield
+        finally:
+            self.pending -= 1
+
+    async def _discover(self) -> None:
+        """Connects to workers whose sockets appeared since the last discovery."""
+        async with self._discovery:
+            if time.monotonic() - self._discovered_at < self.discovery_interval and self._connections:
+                return
+
+            for path in sorted(self.socket_dir.glob(SOCKET_PATTERN)):
+                if path in self._connections:
+                    continue
+                try:
+                    reader, writer = await asyncio.open_unix_connection(str(path))
+                except OSError as e:
+                    logger.debug(f"Transcription worker {path} not reachable: {e!r}")
+                    continue
+
+                logger.info(f"Connected to transcription worker {path}.")
+                self._connections[path] = WorkerConnection(path, reader, writer)
+
+            self._discovered_at = time.monotonic()
+
+    async def _connection(self) -> WorkerConnection:
+        """
+        Picks the least loaded worker.
+
+        Returns:
+            WorkerConnection: Connection to the worker.
+
+        Raises:
+            TranscriptionUnavailable: When no worker can be reached.
+        """
+        for path, connection in list(self._connections.items()):
+            if connection.closed:
+                del self._connections[path]
+
+        if not self._connections or time.monotonic() - self._discovered_at >= self.discovery_interval:
+            await self._discover()
+
+        if not self._connections:
+            raise TranscriptionUnavailable(f"No transcription worker found in {self.socket_dir}.")
+
+        return min(self._connections.values(), key=lambda connection: len(connection.pending))
+
+    async def _request(self, header: dict, audio: BytesIO | bytes | np.ndarray) -> dict:
+        """
+        Runs a request on a worker.
+
+        Args:
+            header: Request header without the audio encoding.
+            audio: Audio to transcribe.
+
+        Returns:
+            dict: Response header.
+
+        Raises:
+            TranscriptionQueueFull: When this web worker or the chosen worker is saturated.
+            TranscriptionUnavailable: When no worker can be reached or answers in time.
+            TranscriptionWorkerError: When the worker fails to transcribe the audio.
+        """
+        with self._admission():
+            connection = await self._connection()
+            encoding, payload = encode_audio(audio)
+            response = await connection.request(
+                next(self._ids),
+                {**header, "profile": self.profile, "encoding": encoding},
+                payload,
+                self.request_timeout
+            )
+
+        if response.get("error") == "busy":
+            raise TranscriptionQueueFull(response["detail"])
+        if response.get("error"):
+            raise TranscriptionWorkerError(response["detail"])
+        return response
+
+    async def transcribe_async(self, audio: BytesIO | bytes | np.ndarray, beam_size: int | None = None) -> str:
+        """
+        Transcribes audio on the worker tier.
+
+        Args:
+            audio: Audio in buffer format or as a 16kHz float32 waveform.
+            beam_size: Beam size to use for decoding, the executor's by default.
+
+        Returns:
+            str: Transcription.
+
+        Raises:
+            TranscriptionQueueFull: When the request cannot be accepted.
+        """
+        response = await self._request({"op": "transcribe", "beam_size": beam_size or self.beam_size}, audio)
+        return response["text"]
+
+    async def transcribe_words_async(
+        self,
+        audio: np.ndarray,
+        beam_size: int | None = None,
+        initial_prompt: str | None = None
+    ) -> list["Word"]:
+        """
+        Transcribes audio into timed words on the worker tier.
+
+        Args:
+            audio: 16kHz float32 waveform.
+            beam_size: Beam size to use for decoding, the executor's by default.
+            initial_prompt: Previously transcribed text used as decoding context.
+
+        Returns:
+            list[Word]: Transcribed words, timed relative to the start of the audio.
+
+        Raises:
+            TranscriptionQueueFull: When the request cannot be accepted.
+        """
+        from faster_whisper.transcribe import Word
+
+        response = await self._request(
+            {"op": "words", "beam_size": beam_size or self.beam_size, "initial_prompt": initial_prompt},
+            audio
+        )
+        return [Word(*word) for word in response["words"]]
+
+    def shutdown(self) -> None:
+        """Closes the connections to the workers."""
+        logger.info("Closing connections to transcription workers...")
+        for connection in self._connections.values():
+            connection.close()
+        self._connections.clear()
+
+def supervise(start_worker: Callable[[int], multiprocessing.Process], count: int) -> None:
+    """
+    Keeps the worker processes running until the supervisor is stopped.
+
+    A worker that exits is started again on the same socket, where web
+    workers find it at their next discovery. A worker that keeps exiting
+    soon after it started, for instance because its model fails to load,
+    is restarted after a delay doubling with every such exit.
+
+    Args:
+        start_worker: Starts the worker process of the given index.
+        count: Number of worker processes.
+    """
+    processes = [start_worker(i) for i in range(count)]
+    started_at = [time.monotonic()] * count
+    failures = [0] * count
+    restart_at: list[float | None] = [None] * count
+
+    try:
+        while True:
+            multiprocessing.connection.wait(
+                [process.sentinel for process in processes if process.is_alive()],
+                timeout=WORKER_RESTART_DELAY_SECONDS
+            )
+            now = time.monotonic()
+
+            for i, process in enumerate(processes):
+                if process.is_alive():
+                    continue
+
+                if restart_at[i] is None:
+                    failures[i] = failures[i] + 1 if now - started_at[i] < WORKER_STABLE_SECONDS else 0
+                    delay = min(WORKER_RESTART_DELAY_SECONDS * 2 ** failures[i], WORKER_MAX_RESTART_DELAY_SECONDS)
+                    logger.error(
+                        f"Transcription worker {process.name} exited with code {process.exitcode}, "
+                        f"restarting it in {delay:.1f} s."
+                    )
+                    restart_at[i] = now + delay
+
+                if now >= restart_at[i]:
+                    processes[i] = start_worker(i)
+                    started_at[i] = now
+                    restart_at[i] = None
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runs the transcription worker tier.")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.TRANSCRIPTION_WORKER_PROCESSES,
+        help="Worker processes, each holding one model per whisper profile."
+    )
+    parser.add_argument(
+        "--socket-dir",
+        default=settings.TRANSCRIPTION_WORKER_SOCKET_DIR,
+        help="Directory where the workers create their sockets."
+    )
+    args = parser.parse_args()
+
+    socket_dir = Path(args.socket_dir)
+    socket_dir.mkdir(parents=True, exist_ok=True)
+
+    # Stops the workers when the supervisor is terminated.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    context = multiprocessing.get_context("spawn")
+
+    def start_worker(i: int) -> multiprocessing.Process:
+        process = context.Process(
+            target=run_worker,
+            args=(socket_dir / f"transcription-{i}.sock",),
+            name=f"transcription-{i}"
+        )
+        process.start()
+        return process
+
+    supervise(start_worker, args.processes)
+
+if __name__ == "__main__":
+    main()
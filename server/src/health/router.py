@@ -0,0 +1,87 @@
+from typing import Annotated
+from fastapi import status, APIRouter, Depends, Response
+
+from src.core.metadata import ApiTags
+from src.auth.cache import auth_cache
+from src.core.loader import ModelLoader
+from src.core.scheduler import FairScheduler
+from src.assistant.cache import SuggestionCache
+from src.core.dependencies import get_model_loader, get_scheduler, get_suggestion_cache
+from src.health.services import check_database
+from src.health.schemas import HealthResponse, ReadinessResponse, StatsResponse
+
+router = APIRouter(
+    tags=[ApiTags.health]
+)
+
+@router.get("/healthz", status_code=status.HTTP_200_OK, response_model=HealthResponse)
+async def liveness() -> HealthResponse:
+    """
+    Reports that the process is up and serving requests.
+
+    It answers as soon as the server starts, models may still be loading.
+
+    Returns:
+        HealthResponse: Constant `ok` status.
+    """
+    return HealthResponse()
+
+@router.get(
+    "/readyz",
+    status_code=status.HTTP_200_OK,
+    response_model=ReadinessResponse,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponse}}
+)
+async def readiness(
+    response: Response,
+    models: Annotated[ModelLoader, Depends(get_model_loader)]
+) -> ReadinessResponse:
+    """
+    Reports whether the server is ready to take traffic.
+
+    The server is ready once the LLM client and the model of every whisper
+    profile in use are loaded and warm, or reachable through the
+    transcription worker tier, and the database pool hands out connections.
+    Until then the endpoint answers 503 so load balancers hold traffic back.
+
+    Args:
+        response: Response whose status is set to 503 while not ready.
+        models: Background model loader.
+
+    Returns:
+        ReadinessResponse: Overall readiness and the result of each check.
+    """
+    checks = await models.checks()
+    checks["database"] = await check_database()
+    ready = models.loaded and all(checks.values())
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return ReadinessResponse(ready=ready, checks=checks)
+
+@router.get("/statsz", status_code=status.HTTP_200_OK, response_model=StatsResponse)
+async def runtime_stats(
+    models: Annotated[ModelLoader, Depends(get_model_loader)],
+    scheduler: Annotated[FairScheduler, Depends(get_scheduler)],
+    suggestion_cache: Annotated[SuggestionCache, Depends(get_suggestion_cache)]
+) -> StatsResponse:
+    """
+    Reports usage of the in-memory caches and of the queues in front of the models.
+
+    Counters are kept by each server worker, the answer covers the worker
+    that handled the request.
+
+    Args:
+        models: Background model loader holding the LLM gateway.
+        scheduler: Scheduler of model calls.
+        suggestion_cache: Cache of next word suggestions.
+
+    Returns:
+        StatsResponse: Usage counters, without the LLM gateway while it is loading.
+    """
+    return StatsResponse(
+        auth_cache=auth_cache.stats(),
+        suggestion_cache=suggestion_cache.stats(),
+        scheduler=scheduler.stats(),
+        llm_gateway=models.llm_gateway.stats() if models.llm_gateway is not None else None
+    )
@@ -0,0 +1,19 @@
+from typing import Any, Literal
+from pydantic import BaseModel
+
+class HealthResponse(BaseModel):
+    status: Literal["ok"] = "ok"
+
+class ReadinessResponse(BaseModel):
+    ready: bool
+    checks: dict[str, bool]
+
+class StatsResponse(BaseModel):
+    auth_cache: dict[str, dict[str, int | float]]
+    suggestion_cache: dict[str, dict[str, int | float]]
+    scheduler: dict[str, Any]
+    llm_gateway: dict[str, Any] | None = None
+
+class WarmingFrame(BaseModel):
+    type: Literal["warming"] = "warming"
+    retry_after_ms: int
@@ -0,0 +1,39 @@
+import asyncio
+from sqlalchemy import text
+from fastapi import WebSocket, status
+
+from src.core.logging import logger
+from src.core.database import engine
+from src.health.schemas import WarmingFrame
+
+async def check_database(timeout: float = 1.0) -> bool:
+    """
+    Checks that a connection can be taken from the pool and answers a query.
+
+    Args:
+        timeout: Seconds to wait for the database.
+
+    Returns:
+        bool: Whether the database answered in time.
+    """
+    async def ping() -> None:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    try:
+        await asyncio.wait_for(ping(), timeout)
+    except Exception as e:
+        logger.warning(f"Database readiness check failed: {e!r}")
+        return False
+    return True
+
+async def reject_while_warming(websocket: WebSocket, retry_after_ms: int = 1000) -> None:
+    """
+    Tells a client that connected before the models were loaded to come back later.
+
+    Args:
+        websocket: Accepted websocket.
+        retry_after_ms: Milliseconds after which the client should reconnect.
+    """
+    await websocket.send_text(WarmingFrame(retry_after_ms=retry_after_ms).model_dump_json())
+    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import Annotated
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import APIRouter, HTTPException, Depends, status
 
 from src.core.logging import logger
@@ -40,7 +40,7 @@ async def update_user_endpoint(
     user_id: UUID,
     update_data: UserUpdateDto,
     current_user: Annotated[UserDto, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db_session)]
+    session: Annotated[AsyncSession, Depends(get_db_session)]
 ) -> UserUpdateResponse:
     """
     Endpoint to update user.
@@ -54,7 +54,7 @@ async def update_user_endpoint(
         UserUpdateResponse: Response with updated user.
     """
     try:
-        updated_user = update_user(user_id, update_data, session, current_user)
+        updated_user = await update_user(user_id, update_data, session, current_user)
 
         return UserUpdateResponse(
             message="User updated successfully.",
@@ -72,7 +72,7 @@ async def update_user_endpoint(
 async def delete_user_endpoint(
     user_id: UUID,
     current_user: Annotated[UserDto, Depends(get_current_user)],
-    session: Annotated[Session, Depends(get_db_session)]
+    session: Annotated[AsyncSession, Depends(get_db_session)]
 ) -> UserDeleteResponse:
     """
     Endpoint to delete user.
@@ -84,7 +84,7 @@ async def delete_user_endpoint(
         UserDeleteResponse: Only a message and no data.
     """
     try:
-        delete_user(user_id, session, current_user)
+        await delete_user(user_id, session, current_user)
 
         return UserDeleteResponse(
             message="User deleted successfully.",
@@ -1,14 +1,15 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.user.models import User
+from src.auth.cache import auth_cache
 from src.user.schemas import UserUpdateDto, UserDto
 from src.core.database import get_by_id_or_404, assert_entity_identity_match
 
-def update_user(
+async def update_user(
     user_id: UUID, 
     update_data: UserUpdateDto, 
-    session: Session,
+    session: AsyncSession,
     current_user: UserDto
 ) -> UserDto:
     """
@@ -23,19 +24,20 @@ def update_user(
     Returns:
         UserDto: Updated user.
     """
-    user_to_update = get_by_id_or_404(User, user_id, session)
+    user_to_update = await get_by_id_or_404(User, user_id, session)
     assert_entity_identity_match(user_to_update, current_user)
         
     update_dict = update_data.model_dump(exclude_unset=True)
     for field, value in update_dict.items():
         setattr(user_to_update, field, value)
 
-    session.commit()
-    session.refresh(user_to_update)
+    await session.commit()
+    await session.refresh(user_to_update)
+    auth_cache.invalidate_user(str(user_id))
 
     return UserDto.model_validate(user_to_update)
 
-def delete_user(user_id: UUID, session: Session, current_user: UserDto) -> None:
+async def delete_user(user_id: UUID, session: AsyncSession, current_user: UserDto) -> None:
     """
     Service to delete an user from database.
 
@@ -47,8 +49,9 @@ def delete_user(user_id: UUID, session: Session, current_user: UserDto) -> None:
     Returns:
         None
     """
-    user_to_delete = get_by_id_or_404(User, user_id, session)
+    user_to_delete = await get_by_id_or_404(User, user_id, session)
     assert_entity_identity_match(user_to_delete, current_user)
 
-    session.delete(user_to_delete)
-    session.commit()
\ No newline at end of file
+    await session.delete(user_to_delete)
+    await session.commit()
+    auth_cache.invalidate_user(str(user_id))
\ No newline at end of file
@@ -0,0 +1,71 @@
+import pytest
+
+from src.core.audio_buffer import AudioBuffer, AudioBufferOverflow
+
+def test_appends_grow_past_the_initial_capacity():
+    buffer = AudioBuffer(max_size=1024, initial_capacity=4)
+
+    for i in range(10):
+        buffer.append(bytes([i]) * 10)
+
+    assert len(buffer) == 100
+    assert bytes(buffer.view()) == b"".join(bytes([i]) * 10 for i in range(10))
+
+def test_view_is_limited_to_the_buffered_bytes():
+    buffer = AudioBuffer(max_size=1024)
+    buffer.append(b"abcdef")
+
+    assert bytes(buffer.view(3)) == b"abc"
+    assert bytes(buffer.view(100)) == b"abcdef"
+
+def test_view_taken_before_growth_keeps_its_bytes():
+    buffer = AudioBuffer(max_size=1024, initial_capacity=4)
+    buffer.append(b"abcd")
+    view = buffer.view()
+
+    buffer.append(b"efgh")
+
+    assert bytes(view) == b"abcd"
+    assert bytes(buffer.view()) == b"abcdefgh"
+
+def test_consume_keeps_the_tail():
+    buffer = AudioBuffer(max_size=1024)
+    buffer.append(b"abcdef")
+
+    buffer.consume(4)
+    assert bytes(buffer.view()) == b"ef"
+
+    buffer.append(b"gh")
+    assert bytes(buffer.view()) == b"efgh"
+
+    buffer.consume(100)
+    assert len(buffer) == 0
+
+def test_clear_empties_the_buffer():
+    buffer = AudioBuffer(max_size=1024)
+    buffer.append(b"abc")
+
+    buffer.clear()
+    buffer.append(b"d")
+
+    assert bytes(buffer.view()) == b"d"
+
+def test_overflow_leaves_the_buffer_unchanged():
+    buffer = AudioBuffer(max_size=8, initial_capacity=4)
+    buffer.append(b"abcdef")
+
+    with pytest.raises(AudioBufferOverflow):
+        buffer.append(b"ghi")
+
+    assert bytes(buffer.view()) == b"abcdef"
+    buffer.append(b"gh")
+    assert bytes(buffer.view()) == b"abcdefgh"
+
+def test_consumed_bytes_free_room_under_the_limit():
+    buffer = AudioBuffer(max_size=8)
+    buffer.append(b"abcdefgh")
+
+    buffer.consume(4)
+    buffer.append(b"ijkl")
+
+    assert bytes(buffer.view()) == b"efghijkl"
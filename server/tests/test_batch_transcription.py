@@ -0,0 +1,95 @@
+"""
+Checks that batched whisper decoding returns what the unbatched path returns.
+
+Cuts clips of different lengths out of the speech recording, at least 12
+seconds long, at TEST_WHISPER_AUDIO, adds silence, and transcribes them
+with the model TEST_WHISPER_MODEL, once together and once one by one.
+Meant for a real model, such as `tiny.en`, skipped when either variable is
+not set.
+
+Usage:
+    TEST_WHISPER_MODEL=tiny.en TEST_WHISPER_AUDIO=speech.wav uv run pytest tests/test_batch_transcription.py
+"""
+import os
+import pytest
+import numpy as np
+
+from src.assistant import services
+
+TEST_WHISPER_MODEL = os.environ.get("TEST_WHISPER_MODEL")
+TEST_WHISPER_AUDIO = os.environ.get("TEST_WHISPER_AUDIO")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_WHISPER_MODEL or not TEST_WHISPER_AUDIO,
+    reason="TEST_WHISPER_MODEL or TEST_WHISPER_AUDIO is not set."
+)
+
+SAMPLING_RATE = 16000
+
+# Start and duration in seconds of each clip cut out of the recording.
+CLIPS = [(0.0, 2.0), (0.5, 4.0), (1.0, 7.5), (3.0, 1.0), (0.0, 11.0)]
+
+@pytest.fixture(scope="module")
+def model():
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(TEST_WHISPER_MODEL, device="cpu", compute_type="int8")
+
+@pytest.fixture(scope="module")
+def clips() -> list[np.ndarray]:
+    from faster_whisper.audio import decode_audio
+
+    recording = decode_audio(TEST_WHISPER_AUDIO, sampling_rate=SAMPLING_RATE)
+    clips = [
+        recording[int(start * SAMPLING_RATE):int((start + duration) * SAMPLING_RATE)]
+        for start, duration in CLIPS
+    ]
+    return clips + [np.zeros(2 * SAMPLING_RATE, dtype=np.float32)]
+
+@pytest.mark.parametrize("beam_size", [1, 5])
+def test_batch_matches_one_by_one(model, clips, beam_size):
+    one_by_one = [services.get_transcription(clip, model, beam_size) for clip in clips]
+    batched = services.decode_batch_segments(clips, model, beam_size)
+
+    # Clips left to the unbatched path may sample at a higher temperature,
+    # only the clips the batch settled can be compared.
+    assert any(segments is not None for segments in batched)
+    for segments, transcript in zip(batched, one_by_one):
+        if segments is not None:
+            assert " ".join(segment["text"] for segment in segments) == transcript
+
+def test_unsettled_clips_are_transcribed_one_by_one(model, clips, monkeypatch):
+    batched = services.decode_batch_segments(clips, model, 1)
+    monkeypatch.setattr(services, "get_transcription", lambda audio, model, beam_size: "one by one")
+
+    assert services.get_batch_transcription(clips, model, 1) == [
+        "one by one" if segments is None else " ".join(segment["text"] for segment in segments)
+        for segments in batched
+    ]
+
+# Committed text of a stream, longer than the prompt so every clip's prompt has the same length.
+PROMPT = (
+    "and so I told them that the meeting would have to move to Thursday, because "
+    "most of the team is travelling early in the week and nobody wants to dial in"
+)
+
+def test_batch_words_match_one_by_one(model, clips):
+    prompts = [PROMPT if i % 2 else None for i in range(len(clips))]
+    one_by_one = [services.get_word_transcription(clip, model, 1, prompt) for clip, prompt in zip(clips, prompts)]
+    with_prompt = [i for i, prompt in enumerate(prompts) if prompt]
+    batched = services.decode_batch_segments(
+        [clips[i] for i in with_prompt],
+        model,
+        1,
+        initial_prompts=[prompts[i] for i in with_prompt],
+        word_timestamps=True
+    )
+
+    assert any(segments is not None for segments in batched)
+    for i, segments in zip(with_prompt, batched):
+        if segments is None:
+            continue
+        words = [word for segment in segments for word in segment["words"]]
+        assert [(word["word"], word["start"], word["end"]) for word in words] == [
+            (word.word, word.start, word.end) for word in one_by_one[i]
+        ]
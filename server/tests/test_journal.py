@@ -0,0 +1,173 @@
+import os
+import asyncio
+import pytest
+from uuid import uuid4
+from datetime import datetime, timezone
+
+from src.coach import journal as journal_module, persistence
+from src.coach.models import MessageSource
+from src.coach.schemas import MessageCreateDto
+from src.coach.persistence import MessageWriter
+from src.coach.journal import MessageJournal, read_unsaved_messages, replay_journals
+
+class StubSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+def message(content: str) -> MessageCreateDto:
+    return MessageCreateDto(
+        id=uuid4(),
+        source=MessageSource.USER,
+        conversation_id=uuid4(),
+        content=content,
+        sent_at=datetime.now(timezone.utc)
+    )
+
+def append_all(journal: MessageJournal, contents: list[str]) -> list[int]:
+    async def run():
+        return [await journal.append(message(content)) for content in contents]
+
+    return asyncio.run(run())
+
+def crash(journal: MessageJournal) -> None:
+    """Drops the journal the way a dead worker does, releasing its lock without cleaning up."""
+    journal._file.close()
+
+@pytest.fixture
+def saved(monkeypatch) -> list[str]:
+    saved: list[str] = []
+
+    async def save_messages(messages, session):
+        saved.extend(message.content for message in messages)
+        return len(messages)
+
+    monkeypatch.setattr(journal_module, "save_messages", save_messages)
+    return saved
+
+def test_unacknowledged_messages_are_read_back(tmp_path):
+    journal = MessageJournal(tmp_path, sync_interval_ms=1)
+    seqs = append_all(journal, ["a", "b", "c"])
+
+    journal.acknowledge(seqs[:1])
+    crash(journal)
+
+    assert [m.content for m in read_unsaved_messages(journal.path)] == ["b", "c"]
+
+def test_out_of_order_acknowledgement_does_not_hide_earlier_messages(tmp_path):
+    journal = MessageJournal(tmp_path, sync_interval_ms=1)
+    seqs = append_all(journal, ["a", "b", "c"])
+
+    journal.acknowledge([seqs[2]])
+    crash(journal)
+
+    assert journal.acked_seq == 0
+    assert [m.content for m in read_unsaved_messages(journal.path)] == ["a", "b", "c"]
+
+def test_journal_is_emptied_once_everything_is_saved(tmp_path):
+    journal = MessageJournal(tmp_path, sync_interval_ms=1)
+    seqs = append_all(journal, ["a", "b"])
+
+    journal.acknowledge(seqs)
+    journal._file.flush()
+    assert os.path.getsize(journal.path) == 0
+
+    journal.close()
+    assert list(tmp_path.iterdir()) == []
+
+def test_saved_part_is_compacted_away(tmp_path):
+    journal = MessageJournal(tmp_path, sync_interval_ms=1, compact_bytes=2000)
+    seqs = append_all(journal, [f"message {i}" for i in range(40)])
+    first_path = journal.path
+    journal._file.flush()
+    written = os.path.getsize(first_path)
+
+    # The first message stays unsaved, so the journal is never emptied.
+    for i in range(1, 40, 5):
+        journal.acknowledge(seqs[i:i + 5])
+
+    assert journal.compactions >= 1
+    assert not first_path.exists()
+    assert list(tmp_path.iterdir()) == [journal.path]
+    assert os.path.getsize(journal.path) < written / 2
+
+    crash(journal)
+    unsaved = [m.content for m in read_unsaved_messages(journal.path)]
+    assert unsaved[0] == "message 0"
+    assert len(unsaved) < 40
+
+def test_replay_saves_journals_of_dead_workers(tmp_path, saved):
+    dead = MessageJournal(tmp_path, sync_interval_ms=1)
+    seqs = append_all(dead, ["a", "b", "c"])
+    dead.acknowledge(seqs[:1])
+    crash(dead)
+
+    alive = MessageJournal(tmp_path, sync_interval_ms=1)
+    append_all(alive, ["d"])
+
+    replayed = asyncio.run(replay_journals(tmp_path, StubSession))
+
+    assert replayed == 2
+    assert saved == ["b", "c"]
+    assert not dead.path.exists()
+    assert alive.path.exists()
+    alive.close()
+
+def test_replay_keeps_journals_during_an_outage(tmp_path, monkeypatch):
+    async def save_messages(messages, session):
+        raise OSError("database unreachable")
+
+    monkeypatch.setattr(journal_module, "save_messages", save_messages)
+    dead = MessageJournal(tmp_path, sync_interval_ms=1)
+    append_all(dead, ["a"])
+    crash(dead)
+
+    with pytest.raises(OSError):
+        asyncio.run(replay_journals(tmp_path, StubSession))
+
+    assert dead.path.exists()
+
+def test_failed_sync_is_not_waited_for(tmp_path, monkeypatch):
+    journal = MessageJournal(tmp_path, sync_interval_ms=1)
+
+    def failing_fsync(fd):
+        raise OSError("disk failure")
+
+    monkeypatch.setattr(journal_module.os, "fsync", failing_fsync)
+    with pytest.raises(OSError):
+        append_all(journal, ["a"])
+
+    assert journal.acked_seq == journal.last_seq
+    journal.close()
+    assert list(tmp_path.iterdir()) == []
+
+def test_writer_keeps_messages_the_journal_fails_to_write(tmp_path, monkeypatch):
+    saved: list[str] = []
+
+    async def save_messages(messages, session):
+        saved.extend(message.content for message in messages)
+        return len(messages)
+
+    def failing_fsync(fd):
+        raise OSError("disk failure")
+
+    monkeypatch.setattr(persistence, "save_messages", save_messages)
+    journal = MessageJournal(tmp_path, sync_interval_ms=1)
+    writer = MessageWriter(StubSession, journal=journal, flush_interval_ms=1)
+
+    async def run():
+        writer.start()
+        with monkeypatch.context() as failing:
+            failing.setattr(journal_module.os, "fsync", failing_fsync)
+            await writer.submit(message("a"))
+        await writer.submit(message("b"))
+        await writer.flush()
+        await writer.shutdown()
+
+    asyncio.run(run())
+
+    assert saved == ["a", "b"]
+    assert writer.unjournaled == 1
+    assert list(tmp_path.iterdir()) == []
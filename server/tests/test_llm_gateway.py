@@ -0,0 +1,137 @@
+import time
+import asyncio
+import pytest
+from typing import Any
+from langchain_core.outputs import ChatResult, ChatGeneration, ChatGenerationChunk
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+from src.core.llm import LLMGateway
+
+class StubChatModel(BaseChatModel):
+    """Chat model answering after a scripted delay, counting its calls."""
+
+    delays: list[float] = []
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _next_delay(self) -> float:
+        self.calls += 1
+        return self.delays.pop(0) if self.delays else 0.0
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        call = self.calls + 1
+        time.sleep(self._next_delay())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"reply {call}"))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        call = self.calls + 1
+        await asyncio.sleep(self._next_delay())
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"reply {call}"))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs: Any):
+        self.calls += 1
+        for word in ("hello", "world"):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+def prompt(text: str = "hi") -> list[HumanMessage]:
+    return [HumanMessage(content=text)]
+
+def test_identical_calls_in_flight_are_coalesced():
+    model = StubChatModel(delays=[0.05])
+    gateway = LLMGateway(model)
+
+    async def run():
+        return await asyncio.gather(*(gateway.invoke(prompt(), 1.0) for _ in range(3)))
+
+    replies = asyncio.run(run())
+
+    assert model.calls == 1
+    assert [reply.content for reply in replies] == ["reply 1"] * 3
+    assert gateway.coalesced == 2
+    assert gateway.stats()["inflight"] == 0
+
+def test_different_prompts_are_not_coalesced():
+    model = StubChatModel()
+    gateway = LLMGateway(model)
+
+    async def run():
+        return await asyncio.gather(gateway.invoke(prompt("a"), 1.0), gateway.invoke(prompt("b"), 1.0))
+
+    asyncio.run(run())
+
+    assert model.calls == 2
+    assert gateway.coalesced == 0
+
+def test_call_fails_at_its_deadline():
+    model = StubChatModel(delays=[1.0])
+    gateway = LLMGateway(model)
+
+    async def run():
+        started = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            await gateway.invoke(prompt(), 0.05)
+        return time.perf_counter() - started
+
+    assert asyncio.run(run()) < 0.5
+    assert gateway.stats()["inflight"] == 0
+
+def test_slow_call_is_hedged_and_hedge_wins():
+    model = StubChatModel(delays=[0.01, 0.01, 0.01, 1.0, 0.01])
+    gateway = LLMGateway(model, hedge_min_samples=3)
+
+    async def run():
+        for i in range(3):
+            await gateway.invoke(prompt(f"warm {i}"), 1.0, route="coach")
+        return await gateway.invoke(prompt("slow"), 0.5, route="coach")
+
+    reply = asyncio.run(run())
+
+    assert reply.content == "reply 5"
+    assert gateway.hedged == 1
+    assert gateway.hedge_wins == 1
+
+def test_routes_hedge_against_their_own_latency():
+    model = StubChatModel(delays=[0.01] * 3)
+    gateway = LLMGateway(model, hedge_min_samples=3)
+
+    async def run():
+        for i in range(3):
+            await gateway.invoke(prompt(f"suggest {i}"), 1.0, route="suggestion")
+
+    asyncio.run(run())
+
+    assert gateway._hedge_delay("suggestion") is not None
+    assert gateway._hedge_delay("coach") is None
+    assert set(gateway.stats()["latency"]) == {"suggestion", "coach"}
+
+def test_streams_are_not_recorded_as_latency():
+    model = StubChatModel()
+    gateway = LLMGateway(model)
+
+    async def run():
+        return [chunk.content async for chunk in gateway.stream(prompt(), 1.0)]
+
+    assert asyncio.run(run()) == ["hello", "world"]
+    assert gateway.latency == {}
+
+def test_sync_invoke_goes_through_the_gateway():
+    model = StubChatModel()
+    gateway = LLMGateway(model)
+    chat_model = gateway.chat_model("coach", deadline_seconds=1.0)
+
+    assert chat_model.invoke(prompt()).content == "reply 1"
+    assert gateway.latency["coach"].count == 1
+    gateway.close()
+
+def test_sync_invoke_fails_at_its_deadline():
+    model = StubChatModel(delays=[0.5])
+    gateway = LLMGateway(model)
+    chat_model = gateway.chat_model("coach", deadline_seconds=0.05)
+
+    with pytest.raises(TimeoutError):
+        chat_model.invoke(prompt())
+    gateway.close()
@@ -0,0 +1,118 @@
+import asyncio
+import pytest
+
+from src.core.scheduler import FairScheduler, SchedulerBusy, SchedulerSession
+
+async def noop() -> None:
+    pass
+
+def scheduler(**kwargs) -> FairScheduler:
+    options = {"max_concurrency": 1, "max_queue_size": 64, "max_wait_ms": 5000, "session_rate": 100.0, "session_burst": 100}
+    return FairScheduler(**{**options, **kwargs})
+
+async def run_behind_a_busy_slot(scheduler: FairScheduler, jobs: list[tuple[SchedulerSession, str]]) -> list[str]:
+    """Queues the jobs in order while a first job holds the only slot, then returns the order they ran in."""
+    order: list[str] = []
+    gate = asyncio.Event()
+    blocker = asyncio.create_task(scheduler.open_session("blocker").run(gate.wait))
+    await asyncio.sleep(0)
+
+    tasks = []
+    for session, name in jobs:
+        async def work(name=name):
+            order.append(name)
+        tasks.append(asyncio.create_task(session.run(work)))
+        await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(blocker, *tasks)
+    return order
+
+def test_users_are_served_in_proportion_to_their_weight():
+    fair = scheduler()
+
+    async def run():
+        heavy = fair.open_session("heavy", weight=2.0)
+        light = fair.open_session("light", weight=1.0)
+        jobs = [job for _ in range(6) for job in ((heavy, "heavy"), (light, "light"))]
+        return await run_behind_a_busy_slot(fair, jobs)
+
+    order = asyncio.run(run())
+
+    # Both users stay backlogged over the first nine jobs.
+    assert order[:9].count("heavy") == 6
+    assert order[:9].count("light") == 3
+    assert len(order) == 12
+
+def test_sessions_of_a_user_share_its_share():
+    fair = scheduler()
+
+    async def run():
+        tabs = [fair.open_session("many tabs") for _ in range(3)]
+        single = fair.open_session("one tab")
+        jobs = [job for i in range(3) for job in ((tabs[i], "many tabs"), (single, "one tab"))]
+        return await run_behind_a_busy_slot(fair, jobs)
+
+    assert asyncio.run(run()) == ["many tabs", "one tab"] * 3
+
+def test_new_user_does_not_wait_behind_a_backlog():
+    fair = scheduler()
+
+    async def run():
+        busy = fair.open_session("busy")
+        newcomer = fair.open_session("newcomer")
+        jobs = [(busy, "busy")] * 4 + [(newcomer, "newcomer")]
+        return await run_behind_a_busy_slot(fair, jobs)
+
+    assert asyncio.run(run()) == ["busy", "newcomer", "busy", "busy", "busy"]
+
+def test_idle_user_does_not_bank_credit():
+    fair = scheduler()
+
+    async def run():
+        idle = fair.open_session("idle")
+        busy = fair.open_session("busy")
+        for _ in range(5):
+            await busy.run(noop)
+        return await run_behind_a_busy_slot(fair, [(idle, "idle")] * 3 + [(busy, "busy")])
+
+    # With credit for the time it was idle, all three jobs would run first.
+    assert asyncio.run(run()) == ["idle", "busy", "idle", "idle"]
+
+def test_session_over_its_rate_is_shed():
+    fair = scheduler(session_rate=1.0, session_burst=2)
+
+    async def run():
+        session = fair.open_session("fast")
+        for _ in range(2):
+            await session.run(noop)
+        with pytest.raises(SchedulerBusy) as busy:
+            await session.run(noop)
+        return busy.value
+
+    assert asyncio.run(run()).retry_after > 0
+    assert fair.shed == 1
+
+def test_full_queue_and_stale_jobs_are_shed():
+    fair = scheduler(max_queue_size=1, max_wait_ms=50)
+
+    async def run():
+        gate = asyncio.Event()
+        blocker = asyncio.create_task(fair.open_session("blocker").run(gate.wait))
+        await asyncio.sleep(0)
+
+        queued = asyncio.create_task(fair.open_session("queued").run(noop))
+        await asyncio.sleep(0)
+        with pytest.raises(SchedulerBusy):
+            await fair.open_session("rejected").run(noop)
+        with pytest.raises(SchedulerBusy):
+            await queued
+
+        gate.set()
+        await blocker
+
+    asyncio.run(run())
+
+    assert fair.shed == 2
+    assert fair.running == 0
+    assert fair.stats()["queued"] == 0
@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from pydub import silence
+
+from src.assistant.utils import SAMPLING_RATE, waveform_to_segment
+from src.assistant.silence import SilenceDetector, detect_silence
+from scripts.benchmark_silence import MIN_SILENCE_LEN, SILENCE_THRESHOLD, synthetic_speech
+
+def stream(waveform: np.ndarray, chunk_samples: int) -> list[list[int]]:
+    """Feeds the detector chunk by chunk, keeping the last end reported for each silence."""
+    detector = SilenceDetector(SILENCE_THRESHOLD, MIN_SILENCE_LEN)
+    ranges: dict[int, int] = {}
+    for start in range(0, len(waveform), chunk_samples):
+        for range_start, range_end in detector.feed(waveform[start:start + chunk_samples]):
+            ranges[range_start] = range_end
+    return [[start, end] for start, end in ranges.items()]
+
+def speech_then_silence(speech_ms: int, silence_ms: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    speech = rng.normal(0, 0.2, speech_ms * SAMPLING_RATE // 1000)
+    return np.concatenate((speech, np.zeros(silence_ms * SAMPLING_RATE // 1000))).astype(np.float32)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_detect_silence_matches_pydub(seed):
+    waveform = synthetic_speech(10, seed)
+
+    expected = silence.detect_silence(waveform_to_segment(waveform), MIN_SILENCE_LEN, SILENCE_THRESHOLD)
+
+    assert expected
+    assert detect_silence(waveform, SILENCE_THRESHOLD, MIN_SILENCE_LEN) == expected
+
+@pytest.mark.parametrize("chunk_samples", [SAMPLING_RATE, SAMPLING_RATE // 4, 1234])
+def test_streamed_silences_match_one_pass(chunk_samples):
+    waveform = synthetic_speech(10)
+
+    assert stream(waveform, chunk_samples) == detect_silence(waveform, SILENCE_THRESHOLD, MIN_SILENCE_LEN)
+
+def test_silence_across_chunks_keeps_its_start():
+    detector = SilenceDetector(SILENCE_THRESHOLD, MIN_SILENCE_LEN)
+    waveform = speech_then_silence(500, 1000)
+
+    first = detector.feed(waveform[:SAMPLING_RATE])
+    second = detector.feed(waveform[SAMPLING_RATE:])
+
+    assert first == [[500, 1000]]
+    assert second == [[500, 1500]]
+
+def test_short_chunks_are_carried_over():
+    detector = SilenceDetector(SILENCE_THRESHOLD, MIN_SILENCE_LEN)
+    chunk = np.zeros(100 * SAMPLING_RATE // 1000, dtype=np.float32)
+
+    assert detector.feed(chunk) == []
+    assert detector.feed(chunk) == []
+    assert detector.feed(chunk) == [[0, 300]]
+    assert detector.offset_ms == 1
+    assert len(detector.carry) == (MIN_SILENCE_LEN - 1) * SAMPLING_RATE // 1000
+
+def test_speech_ends_an_open_silence():
+    detector = SilenceDetector(SILENCE_THRESHOLD, MIN_SILENCE_LEN)
+    waveform = np.concatenate((np.zeros(SAMPLING_RATE, dtype=np.float32), speech_then_silence(1000, 400)))
+
+    first = detector.feed(waveform[:SAMPLING_RATE])
+    second = detector.feed(waveform[SAMPLING_RATE:])
+
+    assert first == [[0, 1000]]
+    assert len(second) == 1
+    assert second[0][0] > 1900
+    assert second[0][1] == 2400
@@ -0,0 +1,127 @@
+import asyncio
+import numpy as np
+from collections import namedtuple
+
+from src.assistant.utils import SAMPLING_RATE
+from src.assistant.streaming import StreamingTranscriber
+
+Word = namedtuple("Word", ["start", "end", "word"])
+
+class ScriptedExecutor:
+    """Executor answering each decode with the next scripted hypothesis, timed from the window start."""
+
+    def __init__(self, decodes: list[list[tuple[float, float, str]]]) -> None:
+        self.decodes = list(decodes)
+        self.prompts: list[str | None] = []
+
+    async def transcribe_words_async(self, audio, beam_size=None, initial_prompt=None):
+        self.prompts.append(initial_prompt)
+        return [Word(start, end, f" {text}") for start, end, text in self.decodes.pop(0)]
+
+def seconds(duration: float) -> np.ndarray:
+    return np.zeros(int(duration * SAMPLING_RATE), dtype=np.float32)
+
+def texts(words) -> list[str]:
+    return [word.text for word in words]
+
+def test_words_are_committed_once_two_hypotheses_agree():
+    executor = ScriptedExecutor([
+        [(0.0, 0.5, "hello"), (0.6, 0.9, "word")],
+        [(0.0, 0.5, "hello"), (0.6, 1.0, "world"), (1.2, 1.5, "how")],
+        [(0.0, 0.5, "hello"), (0.6, 1.0, "world"), (1.2, 1.5, "how"), (1.6, 1.9, "are")]
+    ])
+    transcriber = StreamingTranscriber(executor)
+
+    async def run():
+        committed = []
+        for _ in executor.decodes[:]:
+            transcriber.insert_audio(seconds(1.0))
+            committed.append(texts(await transcriber.process()))
+        return committed
+
+    assert asyncio.run(run()) == [[], ["hello"], ["world", "how"]]
+    assert texts(transcriber.hypothesis) == ["are"]
+    assert executor.prompts == [None, None, "hello"]
+
+def test_agreement_ignores_case_and_punctuation():
+    executor = ScriptedExecutor([
+        [(0.0, 0.5, "Hello,")],
+        [(0.0, 0.5, "hello")]
+    ])
+    transcriber = StreamingTranscriber(executor)
+
+    async def run():
+        transcriber.insert_audio(seconds(1.0))
+        await transcriber.process()
+        return await transcriber.process()
+
+    assert texts(asyncio.run(run())) == ["hello"]
+
+def test_window_is_trimmed_to_the_overlap_after_a_commit():
+    executor = ScriptedExecutor([
+        [(0.0, 0.5, "one"), (2.0, 2.5, "two")],
+        [(0.0, 0.5, "one"), (2.0, 2.5, "two"), (2.6, 2.9, "three")]
+    ])
+    transcriber = StreamingTranscriber(executor, overlap_seconds=1.0)
+
+    async def run():
+        transcriber.insert_audio(seconds(3.0))
+        await transcriber.process()
+        return await transcriber.process()
+
+    assert texts(asyncio.run(run())) == ["one", "two"]
+    assert transcriber.offset == 1.5
+    assert transcriber.window_seconds == 1.5
+
+def test_full_window_is_committed_without_agreement():
+    executor = ScriptedExecutor([[(0.0, 1.0, "never"), (1.5, 2.5, "stable")]])
+    transcriber = StreamingTranscriber(executor, max_window_seconds=2.0, overlap_seconds=1.0)
+
+    async def run():
+        transcriber.insert_audio(seconds(3.0))
+        return await transcriber.process()
+
+    assert texts(asyncio.run(run())) == ["never", "stable"]
+    assert transcriber.hypothesis == []
+    assert transcriber.offset == 2.0
+    assert transcriber.window_seconds == 1.0
+
+def test_overlap_words_decoded_again_are_not_committed_twice():
+    executor = ScriptedExecutor([
+        [(0.0, 1.0, "see"), (1.5, 2.5, "you")],
+        # The window now starts at 2.0, its overlap repeats the last committed word.
+        [(0.45, 0.7, "you"), (0.8, 0.9, "soon")],
+        [(0.45, 0.7, "you"), (0.8, 0.9, "soon"), (0.9, 1.0, "then")]
+    ])
+    transcriber = StreamingTranscriber(executor, max_window_seconds=2.0, overlap_seconds=1.0)
+
+    async def run():
+        transcriber.insert_audio(seconds(3.0))
+        committed = [texts(await transcriber.process())]
+        for _ in range(2):
+            committed.append(texts(await transcriber.process()))
+        return committed
+
+    assert asyncio.run(run()) == [["see", "you"], [], ["soon"]]
+    assert texts(transcriber.hypothesis) == ["then"]
+    assert transcriber.committed[-1].start == 2.8
+
+def test_skipped_audio_flushes_the_tail_and_moves_the_clock():
+    executor = ScriptedExecutor([
+        [(0.0, 0.4, "Done."), (0.5, 0.9, "next")],
+        [(0.2, 0.6, "again")]
+    ])
+    transcriber = StreamingTranscriber(executor)
+
+    async def run():
+        transcriber.insert_audio(seconds(1.0))
+        await transcriber.process()
+        flushed = transcriber.skip_audio(seconds(2.0))
+        transcriber.insert_audio(seconds(1.0))
+        await transcriber.process()
+        return flushed
+
+    assert texts(asyncio.run(run())) == ["Done.", "next"]
+    assert transcriber.offset == 3.0
+    assert transcriber.hypothesis[0].start == 3.2
+    assert transcriber.context == "next again"